@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""Latency, throughput and allocation benchmarks for the lc_prompts chains.
+
+Every chain is driven by a deterministic fake LLM so the numbers measure our
+own layers: prompt loading, template rendering, parsing, validation, tool
+dispatch and retry logging.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import Runnable, RunnableLambda
+
+from langchain.lc_prompts import (
+    planner_executor_chain,
+    rag_ready_chain,
+    simple_chain,
+    tool_aware_chain,
+    with_history_chain,
+)
+from src.reliability import RetryConfig, run_with_retries, validate_json
+from src.schemas import ToolRoute
+from src.telemetry import percentile
+from src.tools.mini_search import mini_search
+
+DEFAULT_CONCURRENCY = (1, 4, 16)
+DEFAULT_REQUESTS = 200
+DEFAULT_TOLERANCE = 0.25
+
+_RESPONSES = {
+    "PROMPT TITLE: Tool router": '{"tool":"calculator","tool_input":"15% of 240"}',
+    "PROMPT TITLE: Tool-aware": (
+        '{"answer":"36","tool_used":"calculator","tool_results":{"result":36.0},"citations":[]}'
+    ),
+}
+
+
+def fake_llm(latency: float = 0.0) -> Runnable:
+    def respond(prompt: Any) -> str:
+        text = prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+        for prefix, response in _RESPONSES.items():
+            if prefix in text[:200]:
+                return response
+        return "ok"
+
+    def invoke(prompt: Any) -> str:
+        if latency:
+            time.sleep(latency)
+        return respond(prompt)
+
+    async def ainvoke(prompt: Any) -> str:
+        if latency:
+            await asyncio.sleep(latency)
+        return respond(prompt)
+
+    return RunnableLambda(invoke, afunc=ainvoke, name="fake_llm")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    run: Callable[[int], Any]
+    is_async: bool = True
+
+
+def build_scenarios(llm: Runnable, log_dir: str) -> list[Scenario]:
+    simple = simple_chain("zero_shot", llm)
+    history = with_history_chain("zero_shot", llm)
+    planner = planner_executor_chain("cot", "zero_shot", llm)
+    retriever = RunnableLambda(
+        lambda question: "\n".join(item["snippet"] for item in mini_search(question, k=3))
+    )
+    rag = rag_ready_chain("zero_shot", llm, retriever)
+    tools = tool_aware_chain("router", "tool_answer", llm)
+    history_messages = [HumanMessage("What is RAG?"), AIMessage("Retrieval-augmented generation.")]
+    retry_config = RetryConfig(max_retries=1, log_dir=log_dir)
+
+    def retry_logging(idx: int) -> Any:
+        return run_with_retries(
+            invoke=lambda inputs: llm.invoke(f"PROMPT TITLE: Tool router\n{inputs['input']}"),
+            inputs={"input": f"question {idx}"},
+            validator=lambda text: validate_json(text, ToolRoute),
+            config=retry_config,
+            log_context={"prompt": "router", "prompt_version": "v1"},
+        )
+
+    return [
+        Scenario("simple_chain", lambda idx: simple.ainvoke({"input": f"Question {idx}"})),
+        Scenario(
+            "with_history_chain",
+            lambda idx: history.ainvoke({"history": history_messages, "input": f"Question {idx}"}),
+        ),
+        Scenario("planner_executor_chain", lambda idx: planner.ainvoke({"input": f"Question {idx}"})),
+        Scenario("rag_ready_chain", lambda idx: rag.ainvoke(f"llm healthcare {idx}")),
+        Scenario("tool_aware_chain", lambda idx: tools.ainvoke({"input": f"Question {idx}"})),
+        Scenario("retry_logging", retry_logging, is_async=False),
+    ]
+
+
+async def _drive(scenario: Scenario, requests: int, concurrency: int) -> tuple[list[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(idx: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            if scenario.is_async:
+                await scenario.run(idx)
+            else:
+                await asyncio.to_thread(scenario.run, idx)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(idx) for idx in range(requests)))
+    return latencies, time.perf_counter() - start
+
+
+def _allocations(scenario: Scenario, requests: int, concurrency: int) -> dict[str, float]:
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        asyncio.run(_drive(scenario, requests, concurrency))
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_kb": round((peak - before) / 1024, 1),
+        "alloc_retained_kb": round((after - before) / 1024, 1),
+    }
+
+
+def run_suite(
+    *,
+    requests: int = DEFAULT_REQUESTS,
+    concurrency: tuple[int, ...] = DEFAULT_CONCURRENCY,
+    latency: float = 0.0,
+    only: set[str] | None = None,
+) -> dict[str, Any]:
+    results = []
+    with tempfile.TemporaryDirectory() as log_dir:
+        scenarios = build_scenarios(fake_llm(latency), log_dir)
+        for scenario in scenarios:
+            if only and scenario.name not in only:
+                continue
+            asyncio.run(_drive(scenario, min(requests, 10), 1))
+            for level in concurrency:
+                latencies, elapsed = asyncio.run(_drive(scenario, requests, level))
+                # A separate traced pass per level: tracemalloc would skew the timed run above.
+                allocations = _allocations(scenario, min(requests, 50), level)
+                results.append(
+                    {
+                        "scenario": scenario.name,
+                        "concurrency": level,
+                        "requests": requests,
+                        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+                        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+                        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+                        "throughput_rps": round(requests / elapsed, 1),
+                        **allocations,
+                    }
+                )
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fake_llm_latency": latency,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    previous = {(row["scenario"], row["concurrency"]): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = previous.get((row["scenario"], row["concurrency"]))
+        if old is None:
+            continue
+        label = f"{row['scenario']} @ {row['concurrency']}"
+        if row["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {old['p95_ms']:.3f} -> {row['p95_ms']:.3f} ms")
+        if row["throughput_rps"] < old["throughput_rps"] / (1 + tolerance):
+            regressions.append(
+                f"{label}: throughput {old['throughput_rps']:.1f} -> {row['throughput_rps']:.1f} rps"
+            )
+    return regressions
+
+
+def format_table(report: dict[str, Any]) -> str:
+    lines = [
+        f"{'scenario':<24}{'conc':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>10}{'peak KB':>10}"
+    ]
+    for row in report["results"]:
+        lines.append(
+            f"{row['scenario']:<24}{row['concurrency']:>5}{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}"
+            f"{row['p99_ms']:>10.3f}{row['throughput_rps']:>10.1f}{row['alloc_peak_kb']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark lc_prompts chains with a fake LLM.")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY))
+    parser.add_argument("--latency", type=float, default=0.0, help="fake LLM latency in seconds")
+    parser.add_argument("--only", nargs="+", help="scenario names to run")
+    parser.add_argument("--output", default="results/benchmarks/chains.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run_suite(
+        requests=args.requests,
+        concurrency=tuple(args.concurrency),
+        latency=args.latency,
+        only=set(args.only) if args.only else None,
+    )
+    print(format_table(report))
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nSaved results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            regressions = compare(report, json.load(handle), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Import-time budget check for one-shot CLI entry points.
+
+Runs each target in a fresh interpreter with ``python -X importtime`` and
+compares the import cost of repo-triggered modules against a budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@dataclass(frozen=True)
+class StartupTarget:
+    name: str
+    args: tuple[str, ...]
+    budget_ms: float
+    forbidden: tuple[str, ...] = ("langchain_core",)
+
+
+TARGETS = (
+    StartupTarget("runner", ("-c", "import runner"), 60.0),
+    StartupTarget("get_prompt", ("-c", "from langchain.lc_prompts import get_prompt; get_prompt('zero_shot')"), 40.0),
+    StartupTarget("tool_registry", ("-c", "from src.tools import tool_specs"), 30.0),
+    StartupTarget("langchain_runner_usage", ("scripts/langchain_runner.py",), 80.0),
+)
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    modules: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        if name.startswith("  "):
+            continue
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def _run(args: tuple[str, ...]) -> tuple[dict[str, int], set[str], float]:
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    imported = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    return parse_importtime(completed.stderr), imported, elapsed
+
+
+def measure(target: StartupTarget, repeats: int) -> dict[str, object]:
+    baseline, _, _ = _run(("-c", "pass"))
+    import_ms: list[float] = []
+    wall_ms: list[float] = []
+    imported: set[str] = set()
+    for _ in range(repeats):
+        modules, imported, elapsed = _run(target.args)
+        own = sum(value for name, value in modules.items() if name not in baseline)
+        import_ms.append(own / 1000)
+        wall_ms.append(elapsed * 1000)
+    leaked = sorted(
+        prefix for prefix in target.forbidden
+        if any(name == prefix or name.startswith(prefix + ".") for name in imported)
+    )
+    median_import = statistics.median(import_ms)
+    return {
+        **asdict(target),
+        "import_ms": round(median_import, 2),
+        "wall_ms": round(statistics.median(wall_ms), 2),
+        "forbidden_imported": leaked,
+        "ok": median_import <= target.budget_ms and not leaked,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check CLI import-time budgets.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget-scale", type=float, default=1.0)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+
+    results = []
+    for target in TARGETS:
+        scaled = StartupTarget(
+            target.name, target.args, target.budget_ms * args.budget_scale, target.forbidden
+        )
+        result = measure(scaled, args.repeats)
+        results.append(result)
+        status = "ok" if result["ok"] else "OVER"
+        print(
+            f"{target.name:<24} import {result['import_ms']:>7.1f} ms"
+            f" (budget {scaled.budget_ms:.0f})  wall {result['wall_ms']:>7.1f} ms  {status}"
+        )
+        if result["forbidden_imported"]:
+            print(f"  imported forbidden modules: {', '.join(result['forbidden_imported'])}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
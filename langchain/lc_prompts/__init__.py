@@ -1,42 +1,89 @@
-from .loaders import PromptMetadata, PromptRecord, load_all_prompts, load_prompt_by_id
-from .output_parsers import (
-    FORMAT_INSTRUCTIONS_VAR,
-    format_instructions,
-    json_output_parser,
-    pydantic_output_parser,
-)
-from .chains import (
-    HISTORY_VAR,
-    planner_executor_chain,
-    rag_ready_chain,
-    simple_chain,
-    tool_aware_chain,
-    with_history_chain,
-)
-from .mappings import PROMPT_CATEGORIES, PROMPT_MAPPERS, map_prompt
-from .registry import PromptRegistry, build_registry, get_prompt, list_prompt_ids, validate_prompt_id
-
-__all__ = [
-    "PromptMetadata",
-    "PromptRecord",
-    "load_all_prompts",
-    "load_prompt_by_id",
-    "FORMAT_INSTRUCTIONS_VAR",
-    "format_instructions",
-    "json_output_parser",
-    "pydantic_output_parser",
-    "HISTORY_VAR",
-    "simple_chain",
-    "with_history_chain",
-    "planner_executor_chain",
-    "rag_ready_chain",
-    "tool_aware_chain",
-    "PROMPT_CATEGORIES",
-    "PROMPT_MAPPERS",
-    "map_prompt",
-    "PromptRegistry",
-    "build_registry",
-    "get_prompt",
-    "list_prompt_ids",
-    "validate_prompt_id",
-]
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .caching import cached_llm
+    from .chains import (
+        HISTORY_VAR,
+        planner_executor_chain,
+        rag_ready_chain,
+        simple_chain,
+        tool_aware_chain,
+        with_history_chain,
+    )
+    from .llms import gemini_llm, streaming_gemini_llm
+    from .loaders import PromptMetadata, PromptRecord, load_all_prompts, load_prompt_by_id
+    from .mappings import (
+        PROMPT_CATEGORIES,
+        PROMPT_MAPPERS,
+        cached_chain,
+        clear_chain_cache,
+        map_prompt,
+        warm_chains,
+    )
+    from .output_parsers import (
+        FORMAT_INSTRUCTIONS_VAR,
+        format_instructions,
+        json_output_parser,
+        pydantic_output_parser,
+    )
+    from .registry import (
+        PromptRegistry,
+        build_registry,
+        get_prompt,
+        get_registry,
+        list_prompt_ids,
+        validate_prompt_id,
+    )
+    from .templates import CompiledTemplate, compile_template
+
+_LAZY_ATTRS: dict[str, str] = {
+    "PromptMetadata": ".loaders",
+    "PromptRecord": ".loaders",
+    "load_all_prompts": ".loaders",
+    "load_prompt_by_id": ".loaders",
+    "FORMAT_INSTRUCTIONS_VAR": ".output_parsers",
+    "format_instructions": ".output_parsers",
+    "json_output_parser": ".output_parsers",
+    "pydantic_output_parser": ".output_parsers",
+    "HISTORY_VAR": ".chains",
+    "simple_chain": ".chains",
+    "with_history_chain": ".chains",
+    "planner_executor_chain": ".chains",
+    "rag_ready_chain": ".chains",
+    "tool_aware_chain": ".chains",
+    "cached_llm": ".caching",
+    "gemini_llm": ".llms",
+    "streaming_gemini_llm": ".llms",
+    "CompiledTemplate": ".templates",
+    "compile_template": ".templates",
+    "PROMPT_CATEGORIES": ".mappings",
+    "PROMPT_MAPPERS": ".mappings",
+    "map_prompt": ".mappings",
+    "cached_chain": ".mappings",
+    "warm_chains": ".mappings",
+    "clear_chain_cache": ".mappings",
+    "PromptRegistry": ".registry",
+    "build_registry": ".registry",
+    "get_prompt": ".registry",
+    "get_registry": ".registry",
+    "list_prompt_ids": ".registry",
+    "validate_prompt_id": ".registry",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.runnables import Runnable, RunnableLambda
+
+from src.llm.cache import ResponseCache, cache_key
+
+
+def llm_model_name(llm: Runnable) -> str:
+    for attr in ("model", "model_name"):
+        value = getattr(llm, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    raise ValueError(
+        f"Cannot tell which model {type(llm).__name__} calls; pass model= to cached_llm"
+    )
+
+
+def llm_temperature(llm: Runnable) -> float | None:
+    value = getattr(llm, "temperature", None)
+    return value if isinstance(value, (int, float)) else None
+
+
+def prompt_text(prompt: Any) -> str:
+    if hasattr(prompt, "to_string"):
+        return prompt.to_string()
+    return str(prompt)
+
+
+def _encode_output(output: Any) -> str | None:
+    if isinstance(output, str):
+        return json.dumps({"type": "text", "value": output}, ensure_ascii=True)
+    if isinstance(output, BaseMessage):
+        return json.dumps(
+            {"type": "message", "value": message_to_dict(output)}, ensure_ascii=True
+        )
+    return None
+
+
+def _decode_output(payload: str) -> Any:
+    data = json.loads(payload)
+    if data["type"] == "message":
+        return messages_from_dict([data["value"]])[0]
+    return data["value"]
+
+
+def cached_llm(
+    llm: Runnable,
+    cache: ResponseCache,
+    *,
+    model: str | None = None,
+    temperature: float | None = None,
+    prompt_version: str | None = None,
+    accept: Callable[[Any], bool] | None = None,
+) -> Runnable:
+    model_name = model or llm_model_name(llm)
+    if temperature is None:
+        temperature = llm_temperature(llm)
+
+    def key_for(prompt: Any) -> str:
+        return cache_key(
+            model_name,
+            prompt_text(prompt),
+            temperature=temperature,
+            prompt_version=prompt_version,
+        )
+
+    def lookup(key: str) -> Any | None:
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        output = _decode_output(cached)
+        # Entries written before an accept check existed may be invalid; treat them as misses.
+        return output if accept is None or accept(output) else None
+
+    def store(key: str, output: Any) -> None:
+        encoded = _encode_output(output)
+        if encoded is not None and (accept is None or accept(output)):
+            cache.set(key, encoded)
+
+    def invoke(prompt: Any) -> Any:
+        key = key_for(prompt)
+        output = lookup(key)
+        if output is None:
+            output = llm.invoke(prompt)
+            store(key, output)
+        return output
+
+    async def ainvoke(prompt: Any) -> Any:
+        key = key_for(prompt)
+        output = lookup(key)
+        if output is None:
+            output = await llm.ainvoke(prompt)
+            store(key, output)
+        return output
+
+    return RunnableLambda(invoke, afunc=ainvoke)
@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Callable
 import json
 from typing import Any
+import weakref
 
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder, PromptTemplate
 from langchain_core.runnables import Runnable, RunnableLambda, RunnablePassthrough
 
-from .loaders import load_prompt_by_id
+from .caching import cached_llm
+from .loaders import PromptRecord
 from .output_parsers import (
     FORMAT_INSTRUCTIONS_VAR,
     format_instructions,
     json_output_parser,
 )
-from src.tools import calculator, mini_search
+from .registry import get_registry
+from .templates import CompiledTemplate, template_runnable
+from src import telemetry
+from src.llm.cache import ResponseCache
+from src.tools.executor import ToolExecutor, get_tool_executor
+from src.tools.fast_router import FastRouter
+from src.tools.registry import get_tool_registry
 
 
 HISTORY_VAR = "history"
-_TOOL_NAMES = {"calculator", "search", "none"}
 
 
 def _format_instructions_text(parser: Any | None) -> str | None:
@@ -40,17 +48,31 @@ def _apply_format_instructions(
     return prompt.partial(**{FORMAT_INSTRUCTIONS_VAR: instructions})
 
 
+def _compiled_prompt(template: CompiledTemplate, parser: Any | None, prompt_id: str) -> Runnable:
+    instructions = _format_instructions_text(parser)
+    if instructions and FORMAT_INSTRUCTIONS_VAR in template.fields:
+        template = template.partial(**{FORMAT_INSTRUCTIONS_VAR: instructions})
+    return template_runnable(template, name=f"{prompt_id}_prompt")
+
+
+def _chain_llm(llm: Runnable, record: PromptRecord, cache: ResponseCache | None) -> Runnable:
+    if cache is None:
+        return llm
+    return cached_llm(llm, cache, prompt_version=record.metadata.version)
+
+
 def simple_chain(
     prompt_id: str,
     llm: Runnable,
     *,
     parser: Any | None = None,
     prompts_dir: str | None = None,
+    cache: ResponseCache | None = None,
 ) -> Runnable:
-    record = load_prompt_by_id(prompt_id, prompts_dir)
-    prompt = PromptTemplate.from_template(record.text)
-    prompt = _apply_format_instructions(prompt, record.text, parser)
-    chain: Runnable = prompt | llm
+    registry = get_registry(prompts_dir)
+    record = registry.load(prompt_id)
+    prompt = _compiled_prompt(registry.compiled_template(prompt_id), parser, prompt_id)
+    chain: Runnable = prompt | _chain_llm(llm, record, cache)
     if parser is not None:
         chain = chain | parser
     return chain
@@ -62,8 +84,9 @@ def with_history_chain(
     *,
     parser: Any | None = None,
     prompts_dir: str | None = None,
+    cache: ResponseCache | None = None,
 ) -> Runnable:
-    record = load_prompt_by_id(prompt_id, prompts_dir)
+    record = get_registry(prompts_dir).load(prompt_id)
     prompt = ChatPromptTemplate.from_messages(
         [
             MessagesPlaceholder(HISTORY_VAR),
@@ -71,7 +94,7 @@ def with_history_chain(
         ]
     )
     prompt = _apply_format_instructions(prompt, record.text, parser)
-    chain: Runnable = prompt | llm
+    chain: Runnable = prompt | _chain_llm(llm, record, cache)
     if parser is not None:
         chain = chain | parser
     return chain
@@ -87,18 +110,21 @@ def planner_executor_chain(
     prompts_dir: str | None = None,
     executor_input_key: str = "input",
     map_planner_output: Callable[[Any], Any] | None = None,
+    cache: ResponseCache | None = None,
 ) -> Runnable:
     planner = simple_chain(
         planner_id,
         llm,
         parser=planner_parser,
         prompts_dir=prompts_dir,
+        cache=cache,
     )
     executor = simple_chain(
         executor_id,
         llm,
         parser=executor_parser,
         prompts_dir=prompts_dir,
+        cache=cache,
     )
 
     def default_mapper(output: Any) -> dict[str, Any]:
@@ -117,15 +143,16 @@ def rag_ready_chain(
     prompts_dir: str | None = None,
     context_key: str = "context",
     question_key: str = "input",
+    cache: ResponseCache | None = None,
 ) -> Runnable:
-    record = load_prompt_by_id(prompt_id, prompts_dir)
-    prompt = PromptTemplate.from_template(record.text)
-    prompt = _apply_format_instructions(prompt, record.text, parser)
+    registry = get_registry(prompts_dir)
+    record = registry.load(prompt_id)
+    prompt = _compiled_prompt(registry.compiled_template(prompt_id), parser, prompt_id)
     inputs = {
         context_key: retriever,
         question_key: RunnablePassthrough(),
     }
-    chain: Runnable = inputs | prompt | llm
+    chain: Runnable = inputs | prompt | _chain_llm(llm, record, cache)
     if parser is not None:
         chain = chain | parser
     return chain
@@ -135,7 +162,7 @@ def _normalize_router_output(route: Any) -> dict[str, str]:
     if not isinstance(route, dict):
         return {"tool": "none", "tool_input": ""}
     tool = str(route.get("tool", "none")).strip().lower()
-    if tool not in _TOOL_NAMES:
+    if tool != "none" and tool not in get_tool_registry():
         tool = "none"
     tool_input = route.get("tool_input", "")
     if not isinstance(tool_input, str):
@@ -145,28 +172,34 @@ def _normalize_router_output(route: Any) -> dict[str, str]:
     return {"tool": tool, "tool_input": tool_input}
 
 
+def _normalize_routes(route_output: Any) -> list[dict[str, str]]:
+    if isinstance(route_output, dict) and isinstance(route_output.get("tools"), list):
+        route_output = route_output["tools"]
+    if not isinstance(route_output, list):
+        return [_normalize_router_output(route_output)]
+    routes = [_normalize_router_output(item) for item in route_output]
+    used = [route for route in routes if route["tool"] != "none"]
+    return used or [{"tool": "none", "tool_input": ""}]
+
+
 def _run_tool(route: dict[str, str]) -> dict[str, Any]:
-    tool = route["tool"]
-    tool_input = route["tool_input"]
-    if tool == "calculator":
-        try:
-            result = calculator.calculate(tool_input)
-            tool_results: dict[str, Any] = {"result": result}
-        except ValueError as exc:
-            tool_results = {"error": str(exc)}
-        return {"tool_used": tool, "tool_results": tool_results, "citations": []}
-    if tool == "search":
-        results = mini_search.mini_search(tool_input)
-        citations = [
-            {"source": item["source"], "snippet": item["snippet"]}
-            for item in results
-        ]
-        return {
-            "tool_used": tool,
-            "tool_results": {"results": results},
-            "citations": citations,
+    return get_tool_executor().run([route])
+
+
+def _answer_inputs(inputs: dict[str, Any], tool_payload: dict[str, Any]) -> dict[str, Any]:
+    answer_inputs = dict(inputs)
+    answer_inputs.update(
+        {
+            "tool_used": tool_payload["tool_used"],
+            "tool_results": json.dumps(
+                tool_payload["tool_results"], ensure_ascii=True
+            ),
+            "citations": json.dumps(
+                tool_payload["citations"], ensure_ascii=True
+            ),
         }
-    return {"tool_used": "none", "tool_results": None, "citations": []}
+    )
+    return answer_inputs
 
 
 def tool_aware_chain(
@@ -177,38 +210,83 @@ def tool_aware_chain(
     router_parser: Any | None = None,
     answer_parser: Any | None = None,
     prompts_dir: str | None = None,
+    cache: ResponseCache | None = None,
+    max_concurrency: int | None = None,
+    tool_executor: ToolExecutor | None = None,
+    pre_router: FastRouter | None = None,
+    router_llm: Runnable | None = None,
 ) -> Runnable:
     chosen_router_parser = router_parser or json_output_parser()
     chosen_answer_parser = answer_parser or json_output_parser()
     router = simple_chain(
         router_id,
-        llm,
+        router_llm or llm,
         parser=chosen_router_parser,
         prompts_dir=prompts_dir,
+        cache=cache,
     )
     answer = simple_chain(
         answer_id,
         llm,
         parser=chosen_answer_parser,
         prompts_dir=prompts_dir,
+        cache=cache,
     )
 
+    semaphores: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, asyncio.Semaphore
+    ] = weakref.WeakKeyDictionary()
+
+    def run_tools(route_output: Any) -> dict[str, Any]:
+        with telemetry.span("tool_aware.normalize"):
+            routes = _normalize_routes(route_output)
+        executor = tool_executor or get_tool_executor()
+        with telemetry.span("tool_aware.tools", tools=[route["tool"] for route in routes]):
+            return executor.run(routes)
+
+    def pre_route(inputs: dict[str, Any]) -> dict[str, str] | None:
+        question = inputs.get("input")
+        if pre_router is None or not isinstance(question, str):
+            return None
+        with telemetry.span("tool_aware.pre_router") as span:
+            route = pre_router.route(question)
+            span.set(hit=route is not None)
+        return route.model_dump() if route is not None else None
+
+    def answer_inputs(inputs: dict[str, Any], tool_payload: dict[str, Any]) -> dict[str, Any]:
+        with telemetry.span("tool_aware.answer_inputs"):
+            return _answer_inputs(inputs, tool_payload)
+
     def run_with_tools(inputs: dict[str, Any]) -> Any:
-        route_output = router.invoke(inputs)
-        route = _normalize_router_output(route_output)
-        tool_payload = _run_tool(route)
-        answer_inputs = dict(inputs)
-        answer_inputs.update(
-            {
-                "tool_used": tool_payload["tool_used"],
-                "tool_results": json.dumps(
-                    tool_payload["tool_results"], ensure_ascii=True
-                ),
-                "citations": json.dumps(
-                    tool_payload["citations"], ensure_ascii=True
-                ),
-            }
-        )
-        return answer.invoke(answer_inputs)
-
-    return RunnableLambda(run_with_tools)
+        with telemetry.span("tool_aware_chain"):
+            route_output = pre_route(inputs)
+            if route_output is None:
+                with telemetry.span("tool_aware.router"):
+                    route_output = router.invoke(inputs)
+            tool_payload = run_tools(route_output)
+            answer_payload = answer_inputs(inputs, tool_payload)
+            with telemetry.span("tool_aware.answer"):
+                return answer.invoke(answer_payload)
+
+    async def arun_steps(inputs: dict[str, Any]) -> Any:
+        with telemetry.span("tool_aware_chain"):
+            route_output = pre_route(inputs)
+            if route_output is None:
+                with telemetry.span("tool_aware.router"):
+                    route_output = await router.ainvoke(inputs)
+            tool_payload = await asyncio.to_thread(run_tools, route_output)
+            answer_payload = answer_inputs(inputs, tool_payload)
+            with telemetry.span("tool_aware.answer"):
+                return await answer.ainvoke(answer_payload)
+
+    async def arun_with_tools(inputs: dict[str, Any]) -> Any:
+        if max_concurrency is None:
+            return await arun_steps(inputs)
+        loop = asyncio.get_running_loop()
+        semaphore = semaphores.get(loop)
+        if semaphore is None:
+            semaphore = semaphores.setdefault(loop, asyncio.Semaphore(max_concurrency))
+        async with semaphore:
+            return await arun_steps(inputs)
+
+    return RunnableLambda(run_with_tools, afunc=arun_with_tools)
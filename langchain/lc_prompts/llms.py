@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from langchain_core.runnables import Runnable, RunnableGenerator, RunnableLambda
+
+from .caching import prompt_text
+from src.llm.client import get_client_provider
+
+
+def _describe(runnable: Runnable, model: str, options: dict[str, Any]) -> Runnable:
+    # cached_llm keys on these, so a model switch never replays another model's answers.
+    runnable.model = model
+    runnable.temperature = options.get("temperature")
+    return runnable
+
+
+def gemini_llm(*, model: str | None = None, **options: Any) -> Runnable:
+    model_name = get_client_provider().model_name(model)
+
+    def invoke(prompt: Any) -> str:
+        response = get_client_provider().generate(prompt_text(prompt), model=model_name, **options)
+        return response.text or str(response)
+
+    return _describe(RunnableLambda(invoke, name="gemini_llm"), model_name, options)
+
+
+def streaming_gemini_llm(*, model: str | None = None, **options: Any) -> Runnable:
+    model_name = get_client_provider().model_name(model)
+
+    def transform(prompts: Iterator[Any]) -> Iterator[str]:
+        provider = get_client_provider()
+        for prompt in prompts:
+            for chunk in provider.generate_stream(prompt_text(prompt), model=model_name, **options):
+                if chunk.text:
+                    yield chunk.text
+
+    async def atransform(prompts: AsyncIterator[Any]) -> AsyncIterator[str]:
+        provider = get_client_provider()
+        async for prompt in prompts:
+            stream = provider.agenerate_stream(prompt_text(prompt), model=model_name, **options)
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+
+    runnable = RunnableGenerator(transform, atransform, name="streaming_gemini_llm")
+    return _describe(runnable, model_name, options)
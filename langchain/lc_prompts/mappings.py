@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from typing import Any
+from collections import OrderedDict
+import threading
+from typing import Any, Iterable
 
 from langchain_core.runnables import Runnable
 
 from .chains import simple_chain
+from .loaders import PromptRecord
 from .output_parsers import json_output_parser
+from .registry import PromptRegistry, get_registry
 
 
 PROMPT_CATEGORIES: dict[str, str] = {
@@ -118,7 +122,16 @@ PROMPT_MAPPERS: dict[str, Any] = {
 }
 
 
-def map_prompt(
+_PARSER_PROMPTS = frozenset({"structured_output", "router", "tool_answer"})
+CHAIN_CACHE_SIZE = 256
+
+ChainKey = tuple[str, int, Any, str | None, str, Any]
+
+_CHAINS: OrderedDict[ChainKey, tuple[Runnable, Runnable, PromptRecord]] = OrderedDict()
+_CHAINS_LOCK = threading.Lock()
+
+
+def _build_chain(
     prompt_id: str,
     llm: Runnable,
     *,
@@ -128,6 +141,92 @@ def map_prompt(
     if prompt_id not in PROMPT_MAPPERS:
         raise KeyError(f"Unknown prompt id: {prompt_id}")
     mapper = PROMPT_MAPPERS[prompt_id]
-    if prompt_id in {"structured_output", "router", "tool_answer"}:
+    if prompt_id in _PARSER_PROMPTS:
         return mapper(llm, prompts_dir=prompts_dir, parser=parser)
     return mapper(llm, prompts_dir=prompts_dir)
+
+
+def _parser_key(prompt_id: str, parser: Any | None) -> Any:
+    if prompt_id not in _PARSER_PROMPTS:
+        return None
+    if parser is None:
+        return "json"
+    return (type(parser), getattr(parser, "pydantic_object", None))
+
+
+def _current_record(prompt_id: str, registry: PromptRegistry) -> PromptRecord:
+    # get() re-stats the prompt file, so an edited prompt invalidates its cached chains.
+    try:
+        return registry.get(prompt_id)
+    except KeyError:
+        return registry.load(prompt_id)
+
+
+def cached_chain(
+    prompt_id: str,
+    llm: Runnable,
+    *,
+    prompts_dir: str | None = None,
+    parser: Any | None = None,
+) -> Runnable:
+    if prompt_id not in PROMPT_MAPPERS:
+        raise KeyError(f"Unknown prompt id: {prompt_id}")
+    registry = get_registry(prompts_dir)
+    record = _current_record(prompt_id, registry)
+    key = (
+        prompt_id,
+        id(llm),
+        _parser_key(prompt_id, parser),
+        prompts_dir,
+        record.metadata.version,
+        registry.stamp(prompt_id),
+    )
+    with _CHAINS_LOCK:
+        entry = _CHAINS.get(key)
+        if entry is not None and entry[2] is record:
+            _CHAINS.move_to_end(key)
+            return entry[0]
+    chain = _build_chain(prompt_id, llm, prompts_dir=prompts_dir, parser=parser)
+    with _CHAINS_LOCK:
+        # Keep a strong reference to the llm so its id() stays unique while cached.
+        _CHAINS[key] = (chain, llm, record)
+        while len(_CHAINS) > CHAIN_CACHE_SIZE:
+            _CHAINS.popitem(last=False)
+    return chain
+
+
+def warm_chains(
+    llm: Runnable,
+    *,
+    prompt_ids: Iterable[str] | None = None,
+    prompts_dir: str | None = None,
+    parsers: dict[str, Any] | None = None,
+) -> dict[str, Runnable]:
+    chosen_parsers = parsers or {}
+    return {
+        prompt_id: cached_chain(
+            prompt_id,
+            llm,
+            prompts_dir=prompts_dir,
+            parser=chosen_parsers.get(prompt_id),
+        )
+        for prompt_id in (prompt_ids or PROMPT_CATEGORIES)
+    }
+
+
+def clear_chain_cache() -> None:
+    with _CHAINS_LOCK:
+        _CHAINS.clear()
+
+
+def map_prompt(
+    prompt_id: str,
+    llm: Runnable,
+    *,
+    prompts_dir: str | None = None,
+    parser: Any | None = None,
+    cached: bool = True,
+) -> Runnable:
+    if cached:
+        return cached_chain(prompt_id, llm, prompts_dir=prompts_dir, parser=parser)
+    return _build_chain(prompt_id, llm, prompts_dir=prompts_dir, parser=parser)
@@ -1,40 +1,156 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+import threading
+from typing import Any
 
-from .loaders import PromptRecord, load_all_prompts, load_prompt_by_id
+from .loaders import PromptRecord, default_prompts_dir, load_all_prompts, load_prompt_file
+from .templates import CompiledTemplate, compile_template
+
+
+def _stat_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
 
 
 @dataclass
 class PromptRegistry:
-    records: dict[str, PromptRecord]
+    records: dict[str, PromptRecord] = field(default_factory=dict)
+    prompts_dir: Path | None = None
+    _ids: set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _dir_stamp: tuple[int, int] | None = field(default=None, init=False, repr=False, compare=False)
+    _file_stamps: dict[str, tuple[int, int]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _templates: dict[str, tuple[PromptRecord, Any]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._ids = set(self.records)
+
+    def _refresh_index(self) -> None:
+        if self.prompts_dir is None:
+            return
+        stamp = _stat_stamp(self.prompts_dir)
+        if stamp == self._dir_stamp:
+            return
+        with self._lock:
+            ids = {path.stem for path in self.prompts_dir.glob("*.txt")}
+            for stale_id in set(self.records) - ids:
+                self.records.pop(stale_id, None)
+                self._file_stamps.pop(stale_id, None)
+                self._templates.pop(stale_id, None)
+            self._ids = ids
+            self._dir_stamp = stamp
+
+    def _load_current(self, prompt_id: str) -> PromptRecord | None:
+        if self.prompts_dir is None:
+            return self.records.get(prompt_id)
+        path = self.prompts_dir / f"{prompt_id}.txt"
+        stamp = _stat_stamp(path)
+        if stamp is None:
+            return None
+        record = self.records.get(prompt_id)
+        if record is not None and self._file_stamps.get(prompt_id) == stamp:
+            return record
+        with self._lock:
+            record = load_prompt_file(path)
+            self.records[prompt_id] = record
+            self._file_stamps[prompt_id] = stamp
+            self._ids.add(prompt_id)
+        return record
 
     def get(self, prompt_id: str) -> PromptRecord:
-        if prompt_id not in self.records:
+        self._refresh_index()
+        record = self._load_current(prompt_id) if prompt_id in self._ids else None
+        if record is None:
             raise KeyError(f"Unknown prompt id: {prompt_id}")
-        return self.records[prompt_id]
+        return record
+
+    def load(self, prompt_id: str) -> PromptRecord:
+        try:
+            return self.get(prompt_id)
+        except KeyError:
+            directory = self.prompts_dir or Path(".")
+            raise FileNotFoundError(
+                f"Prompt file not found: {directory / f'{prompt_id}.txt'}"
+            ) from None
+
+    def stamp(self, prompt_id: str) -> tuple[int, int] | None:
+        return self._file_stamps.get(prompt_id)
+
+    def prompt_template(self, prompt_id: str) -> Any:
+        from langchain_core.prompts import PromptTemplate
+
+        record = self.load(prompt_id)
+        cached = self._templates.get(prompt_id)
+        if cached is not None and cached[0] is record:
+            return cached[1]
+        template = PromptTemplate.from_template(record.text)
+        with self._lock:
+            self._templates[prompt_id] = (record, template)
+        return template
+
+    def compiled_template(self, prompt_id: str) -> CompiledTemplate:
+        return compile_template(self.load(prompt_id).text)
 
     def list_ids(self) -> list[str]:
-        return sorted(self.records.keys())
+        self._refresh_index()
+        return sorted(self._ids)
 
     def validate_id(self, prompt_id: str) -> bool:
-        return prompt_id in self.records
+        self._refresh_index()
+        return prompt_id in self._ids
+
+
+_REGISTRIES: dict[Path, PromptRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def _resolve_dir(prompts_dir: Path | str | None) -> Path:
+    if prompts_dir is None:
+        return default_prompts_dir()
+    return Path(prompts_dir).resolve()
+
+
+def build_registry(prompts_dir: Path | str | None = None) -> PromptRegistry:
+    resolved = _resolve_dir(prompts_dir)
+    registry = PromptRegistry(prompts_dir=resolved)
+    for record in load_all_prompts(resolved):
+        registry.records[record.id] = record
+        registry._file_stamps[record.id] = _stat_stamp(resolved / f"{record.id}.txt")
+    return registry
+
+
+def get_registry(prompts_dir: Path | str | None = None) -> PromptRegistry:
+    resolved = _resolve_dir(prompts_dir)
+    registry = _REGISTRIES.get(resolved)
+    if registry is None:
+        with _REGISTRIES_LOCK:
+            registry = _REGISTRIES.setdefault(resolved, PromptRegistry(prompts_dir=resolved))
+    return registry
 
 
-def build_registry(prompts_dir: Path | None = None) -> PromptRegistry:
-    records = {record.id: record for record in load_all_prompts(prompts_dir)}
-    return PromptRegistry(records=records)
+def clear_registries() -> None:
+    with _REGISTRIES_LOCK:
+        _REGISTRIES.clear()
 
 
-def get_prompt(prompt_id: str, prompts_dir: Path | None = None) -> PromptRecord:
-    return load_prompt_by_id(prompt_id, prompts_dir)
+def get_prompt(prompt_id: str, prompts_dir: Path | str | None = None) -> PromptRecord:
+    return get_registry(prompts_dir).load(prompt_id)
 
 
-def list_prompt_ids(prompts_dir: Path | None = None) -> list[str]:
-    return build_registry(prompts_dir).list_ids()
+def list_prompt_ids(prompts_dir: Path | str | None = None) -> list[str]:
+    return get_registry(prompts_dir).list_ids()
 
 
-def validate_prompt_id(prompt_id: str, prompts_dir: Path | None = None) -> bool:
-    return build_registry(prompts_dir).validate_id(prompt_id)
+def validate_prompt_id(prompt_id: str, prompts_dir: Path | str | None = None) -> bool:
+    return get_registry(prompts_dir).validate_id(prompt_id)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from .loaders import TEMPLATE_VAR_RE
+
+
+def _unescape(text: str) -> str:
+    return text.replace("{{", "{").replace("}}", "}")
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    literals: tuple[str, ...]
+    fields: tuple[str, ...]
+    placeholders: tuple[str, ...]
+
+    @classmethod
+    def compile(cls, text: str) -> CompiledTemplate:
+        literals: list[str] = []
+        fields: list[str] = []
+        placeholders: list[str] = []
+        position = 0
+        for match in TEMPLATE_VAR_RE.finditer(text):
+            literals.append(_unescape(text[position:match.start()]))
+            fields.append(match.group(1))
+            placeholders.append(match.group(0))
+            position = match.end()
+        literals.append(_unescape(text[position:]))
+        return cls(tuple(literals), tuple(fields), tuple(placeholders))
+
+    @property
+    def input_variables(self) -> list[str]:
+        return list(dict.fromkeys(self.fields))
+
+    def render(self, values: Mapping[str, Any], *, strict: bool = True) -> str:
+        parts: list[str] = [self.literals[0]]
+        for name, placeholder, literal in zip(self.fields, self.placeholders, self.literals[1:]):
+            if name in values:
+                parts.append(str(values[name]))
+            elif strict:
+                raise KeyError(f"Missing template variable: {name}")
+            else:
+                parts.append(placeholder)
+            parts.append(literal)
+        return "".join(parts)
+
+    def render_many(
+        self, rows: Iterable[Mapping[str, Any]], *, strict: bool = True
+    ) -> list[str]:
+        return [self.render(row, strict=strict) for row in rows]
+
+    def partial(self, **values: Any) -> CompiledTemplate:
+        literals: list[str] = [self.literals[0]]
+        fields: list[str] = []
+        placeholders: list[str] = []
+        for name, placeholder, literal in zip(self.fields, self.placeholders, self.literals[1:]):
+            if name in values:
+                literals[-1] += str(values[name]) + literal
+                continue
+            fields.append(name)
+            placeholders.append(placeholder)
+            literals.append(literal)
+        return CompiledTemplate(tuple(literals), tuple(fields), tuple(placeholders))
+
+
+@lru_cache(maxsize=256)
+def compile_template(text: str) -> CompiledTemplate:
+    return CompiledTemplate.compile(text)
+
+
+def template_runnable(template: CompiledTemplate, *, name: str | None = None) -> Any:
+    from langchain_core.prompt_values import StringPromptValue
+    from langchain_core.runnables import RunnableLambda
+
+    variables = template.input_variables
+
+    def render(inputs: Any) -> StringPromptValue:
+        if not isinstance(inputs, Mapping):
+            if len(variables) != 1:
+                raise TypeError(
+                    f"Expected a mapping with keys {variables}, got {type(inputs).__name__}"
+                )
+            inputs = {variables[0]: inputs}
+        return StringPromptValue(text=template.render(inputs))
+
+    return RunnableLambda(render, name=name or "CompiledTemplate")
@@ -1,7 +1,25 @@
 #!/usr/bin/env python3
+import argparse
+import json
 import os
 import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from langchain.lc_prompts.loaders import PromptRecord, load_prompt_file
+from langchain.lc_prompts.templates import compile_template
+from src import telemetry
+from src.llm import ResponseCache, SQLiteCacheBackend, cache_key, get_client_provider
+from src.jobs import DEFAULT_FLUSH_EVERY, Job, JobProgress
+from src.reliability.policy import RetryPolicy, TokenBucket, call_with_policy
+from src.storage import ResultStore, get_result_store, new_record
 
 
 def load_prompt(path: str) -> str:
@@ -10,8 +28,8 @@ def load_prompt(path: str) -> str:
 
 
 def build_prompt(template: str, user_input: str, format_instructions: str = "") -> str:
-    prompt = template.replace("{input}", user_input.strip())
-    return prompt.replace("{format_instructions}", format_instructions.strip())
+    values = {"input": user_input.strip(), "format_instructions": format_instructions.strip()}
+    return compile_template(template).render(values, strict=False)
 
 
 def load_env_file(path: str = ".env") -> None:
@@ -30,59 +48,321 @@ def load_env_file(path: str = ".env") -> None:
                 os.environ[key] = value
 
 
-def call_model(prompt: str) -> str:
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise RuntimeError("GEMINI_API_KEY is not set")
+def call_model(
+    prompt: str,
+    *,
+    cache: ResponseCache | None = None,
+    prompt_version: str | None = None,
+    policy: RetryPolicy | None = None,
+    rate_limiter: TokenBucket | None = None,
+) -> str:
+    provider = get_client_provider()
+    if cache is not None:
+        key = cache_key(provider.model_name(), prompt, prompt_version=prompt_version)
+        with telemetry.span("runner.cached_call", prompt_version=prompt_version):
+            # Retries and rate limiting only apply to misses, so warm reruns stay fast.
+            return cache.get_or_call(
+                key, lambda: call_model(prompt, policy=policy, rate_limiter=rate_limiter)
+            )
 
-    try:
-        from google import genai
-    except ImportError as exc:
-        raise RuntimeError("google-genai package is required") from exc
-
-    model_name = os.getenv("GEMINI_MODEL", "models/gemini-2.0-flash-001")
-    client = genai.Client(api_key=api_key)
-    response = client.models.generate_content(
-        model=model_name,
-        contents=prompt,
-    )
+    with telemetry.span("runner.call_model", prompt_chars=len(prompt)):
+        if policy is None and rate_limiter is None:
+            response = provider.generate(prompt)
+        else:
+            response = call_with_policy(
+                provider.generate,
+                prompt,
+                policy=policy or RetryPolicy(max_attempts=1),
+                rate_limiter=rate_limiter,
+                timeout_kwarg="timeout",
+            )
     if response.text:
         return response.text
     return str(response)
 
 
-def save_output(prompt: str, text: str, output_dir: str) -> str:
-    os.makedirs(output_dir, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    path = os.path.join(output_dir, f"output-{timestamp}.txt")
-    with open(path, "w", encoding="utf-8") as f:
-        f.write("PROMPT\n")
-        f.write(prompt)
-        if not prompt.endswith("\n"):
-            f.write("\n")
-        f.write("\nOUTPUT\n")
-        f.write(text)
-        if not text.endswith("\n"):
-            f.write("\n")
-    return path
+def stream_model(prompt: str) -> Iterator[str]:
+    for chunk in get_client_provider().generate_stream(prompt):
+        if chunk.text:
+            yield chunk.text
+
+
+@dataclass(frozen=True)
+class StreamStats:
+    first_chunk_seconds: float | None
+    total_seconds: float
+    chunks: int
+
+
+def save_output(
+    prompt: str,
+    text: str,
+    store: ResultStore | None = None,
+    *,
+    prompt_id: str | None = None,
+    model: str | None = None,
+    metadata: dict[str, Any] | None = None,
+) -> str:
+    record = new_record(prompt, text, prompt_id=prompt_id, model=model, metadata=metadata)
+    return (store or get_result_store()).add(record)
+
+
+STREAM_SPOOL_DIR = "results/output/partial"
+
+
+def _open_spool(spool_dir: str, prompt: str) -> Any:
+    os.makedirs(spool_dir, exist_ok=True)
+    name = f"output-{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}.txt"
+    # Same layout as the legacy output files, so `query_results.py --import-dir` can recover it.
+    spool = open(os.path.join(spool_dir, name), "w", encoding="utf-8")
+    spool.write("PROMPT\n" + prompt + ("" if prompt.endswith("\n") else "\n") + "\nOUTPUT\n")
+    spool.flush()
+    return spool
+
+
+def save_stream(
+    prompt: str,
+    chunks: Iterable[str],
+    store: ResultStore | None = None,
+    *,
+    on_chunk: Callable[[str], None] | None = None,
+    prompt_id: str | None = None,
+    model: str | None = None,
+    spool_dir: str | None = None,
+) -> tuple[str, str, StreamStats]:
+    parts: list[str] = []
+    first_chunk_seconds: float | None = None
+    start = time.perf_counter()
+    complete = False
+    spool = _open_spool(spool_dir, prompt) if spool_dir else None
+    try:
+        for chunk in chunks:
+            if first_chunk_seconds is None:
+                first_chunk_seconds = time.perf_counter() - start
+            parts.append(chunk)
+            if spool is not None:
+                spool.write(chunk)
+                spool.flush()
+            if on_chunk is not None:
+                on_chunk(chunk)
+        complete = True
+    finally:
+        stats = StreamStats(first_chunk_seconds, time.perf_counter() - start, len(parts))
+        metadata: dict[str, Any] = {"stream": asdict(stats)}
+        if not complete:
+            # An exception still reaches here, so the chunks that arrived are stored and flagged.
+            metadata["incomplete"] = True
+        record_id = save_output(
+            prompt, "".join(parts), store, prompt_id=prompt_id, model=model, metadata=metadata
+        )
+        if spool is not None:
+            # The spool only matters if the process dies before the record is stored.
+            spool.close()
+            os.remove(spool.name)
+    return record_id, "".join(parts), stats
+
+
+def print_chunk(chunk: str) -> None:
+    print(chunk, end="", flush=True)
+
+
+def format_stream_stats(stats: StreamStats) -> str:
+    if stats.first_chunk_seconds is None:
+        first = "n/a"
+    else:
+        first = f"{stats.first_chunk_seconds * 1000:.0f} ms"
+    return (
+        f"Time to first token: {first}; total: {stats.total_seconds * 1000:.0f} ms "
+        f"({stats.chunks} chunks)"
+    )
+
+
+def load_batch_rows(path: str) -> Iterator[dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for index, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if not isinstance(row, dict) or "input" not in row:
+                raise ValueError(f"Batch row {index} must be an object with an 'input' key")
+            row.setdefault("id", index)
+            yield row
+
+
+def load_prompt_record(path: str) -> PromptRecord:
+    return load_prompt_file(Path(path))
+
+
+def _run_batch_row(
+    row: dict[str, Any],
+    prompt_path: str,
+    load_record: Callable[[str], PromptRecord],
+    call: Callable[..., str],
+) -> str:
+    record = load_record(prompt_path)
+    prompt = build_prompt(record.text, str(row["input"]))
+    return call(prompt, prompt_version=record.metadata.version)
+
+
+def _batch_result(row: dict[str, Any], prompt_path: str, future: Future) -> dict[str, Any]:
+    result: dict[str, Any] = {"id": row["id"], "prompt": prompt_path, "input": row["input"]}
+    try:
+        result["output"] = future.result()
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def iter_batch_results(
+    rows: Iterable[dict[str, Any]],
+    *,
+    default_prompt: str | None = None,
+    concurrency: int = 4,
+    call: Callable[..., str] = call_model,
+) -> Iterator[dict[str, Any]]:
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    load_record = lru_cache(maxsize=None)(load_prompt_record)
+    window = concurrency * 2
+    pending: deque[tuple[dict[str, Any], str, Future]] = deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for row in rows:
+            prompt_path = row.get("prompt") or default_prompt
+            if not prompt_path:
+                raise ValueError(f"Batch row {row['id']} has no prompt and no default prompt is set")
+            future = pool.submit(_run_batch_row, row, prompt_path, load_record, call)
+            pending.append((row, prompt_path, future))
+            if len(pending) >= window:
+                yield _batch_result(*pending.popleft())
+        while pending:
+            yield _batch_result(*pending.popleft())
+
+
+def count_batch_rows(path: str) -> int:
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def _batch_key(row: dict[str, Any], prompt_path: str | None) -> list[Any]:
+    # Keyed on content, not just the line index, so a different input file never matches old rows.
+    return [row["id"], prompt_path, row["input"]]
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    *,
+    default_prompt: str | None = None,
+    concurrency: int = 4,
+    call: Callable[..., str] = call_model,
+    checkpoint_path: str | None = None,
+    flush_every: int = DEFAULT_FLUSH_EVERY,
+    on_progress: Callable[[JobProgress], None] | None = None,
+) -> int:
+    with Job(
+        output_path,
+        checkpoint_path=checkpoint_path,
+        total=count_batch_rows(input_path),
+        flush_every=flush_every,
+        on_progress=on_progress,
+    ) as job:
+        results = iter_batch_results(
+            job.pending(
+                load_batch_rows(input_path),
+                key=lambda row: _batch_key(row, row.get("prompt") or default_prompt),
+            ),
+            default_prompt=default_prompt,
+            concurrency=concurrency,
+            call=call,
+        )
+        for result in results:
+            job.record(_batch_key(result, result["prompt"]), result, completed="error" not in result)
+        return job.progress().done
+
+
+def print_progress(progress: JobProgress) -> None:
+    print(f"\r{progress.format()}", end="", file=sys.stderr, flush=True)
+
+
+def batch_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="runner.py --batch")
+    parser.add_argument("input_path", help="JSONL file with {id, prompt, input} rows")
+    parser.add_argument("--prompt", help="prompt file for rows without a 'prompt' key")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--output", default="results/batch/results.jsonl")
+    parser.add_argument("--cache", help="SQLite response cache path (opt-in)")
+    parser.add_argument("--max-attempts", type=int, default=4, help="attempts per row on transient API errors")
+    parser.add_argument("--rate", type=float, help="max requests per second across workers")
+    parser.add_argument("--timeout", type=float, help="per-call timeout in seconds")
+    parser.add_argument("--checkpoint", help="completed-row checkpoint (default: <output>.checkpoint)")
+    parser.add_argument("--flush-every", type=int, default=DEFAULT_FLUSH_EVERY, help="rows per durable flush")
+    args = parser.parse_args(argv)
+
+    load_env_file()
+    telemetry.configure_from_env()
+    cache = ResponseCache(SQLiteCacheBackend(args.cache)) if args.cache else None
+    policy = RetryPolicy(max_attempts=args.max_attempts, call_timeout=args.timeout)
+    rate_limiter = TokenBucket(args.rate) if args.rate else None
+    call = partial(call_model, cache=cache, policy=policy, rate_limiter=rate_limiter)
+    count = run_batch(
+        args.input_path,
+        args.output,
+        default_prompt=args.prompt,
+        concurrency=args.concurrency,
+        call=call,
+        checkpoint_path=args.checkpoint,
+        flush_every=args.flush_every,
+        on_progress=print_progress,
+    )
+    print(file=sys.stderr)
+    print(f"Wrote {count} results to {args.output}")
+    if cache is not None:
+        print(f"Cache stats: {cache.stats()}")
+    return 0
 
 
 def main() -> int:
-    if len(sys.argv) < 3:
-        print("Usage: runner.py <prompt_file> <question>")
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        return batch_main(sys.argv[2:])
+
+    args = sys.argv[1:]
+    stream = bool(args) and args[0] == "--stream"
+    if stream:
+        args = args[1:]
+
+    if len(args) < 2:
+        print("Usage: runner.py [--stream] <prompt_file> <question>")
+        print("       runner.py --batch <requests.jsonl> [--prompt FILE] [--concurrency N] [--output FILE]")
         return 1
 
     load_env_file()
-    prompt_path = sys.argv[1]
-    user_question = " ".join(sys.argv[2:])
+    telemetry.configure_from_env()
+    prompt_path = args[0]
+    user_question = " ".join(args[1:])
 
     template = load_prompt(prompt_path)
     prompt = build_prompt(template, user_question)
+    prompt_id = os.path.splitext(os.path.basename(prompt_path))[0]
+    model = get_client_provider().model_name()
+    if stream:
+        record_id, _, stats = save_stream(
+            prompt,
+            stream_model(prompt),
+            on_chunk=print_chunk,
+            prompt_id=prompt_id,
+            model=model,
+            spool_dir=STREAM_SPOOL_DIR,
+        )
+        print(f"\n\n{format_stream_stats(stats)}")
+        print(f"Saved output {record_id} to {get_result_store().location}")
+        return 0
+
     output = call_model(prompt)
     print(output)
 
-    saved_path = save_output(prompt, output, "results/output")
-    print(f"\nSaved output to {saved_path}")
+    record_id = save_output(prompt, output, prompt_id=prompt_id, model=model)
+    print(f"\nSaved output {record_id} to {get_result_store().location}")
     return 0
 
 
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from src.tools.search_index import SearchIndex, build_index, iter_corpus
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build or extend the mini_search index.")
+    parser.add_argument("corpus", help="JSONL file or directory of .jsonl/.txt documents")
+    parser.add_argument("output", help="index file to write")
+    parser.add_argument("--append", action="store_true", help="add documents to an existing index")
+    args = parser.parse_args()
+
+    if args.append and os.path.exists(args.output):
+        index = SearchIndex.load(args.output)
+        added = index.add_documents(iter_corpus(args.corpus))
+    else:
+        index = build_index(args.corpus)
+        added = len(index)
+    index.save(args.output)
+    print(f"Indexed {added} documents ({len(index)} total) into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
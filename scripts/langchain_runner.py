@@ -7,34 +7,71 @@ REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
-from langchain_core.runnables import RunnableLambda
-
-from langchain.lc_prompts import simple_chain
-from langchain.lc_prompts.loaders import load_prompt_by_id
-from runner import build_prompt, call_model, load_env_file, save_output
+from langchain.lc_prompts.registry import get_prompt
+from src import telemetry
+from src.storage import get_result_store
+from runner import (
+    build_prompt,
+    call_model,
+    format_stream_stats,
+    load_env_file,
+    print_chunk,
+    save_output,
+    save_stream,
+)
 
 
 def _invoke_model(prompt: Any) -> str:
-    return call_model(str(prompt))
+    from langchain.lc_prompts.caching import prompt_text
+
+    return call_model(prompt_text(prompt))
 
 
 def main() -> int:
-    if len(sys.argv) < 3:
-        print("Usage: langchain_runner.py <prompt_id> <question>")
+    args = sys.argv[1:]
+    stream = bool(args) and args[0] == "--stream"
+    if stream:
+        args = args[1:]
+
+    if len(args) < 2:
+        print("Usage: langchain_runner.py [--stream] <prompt_id> <question>")
         return 1
 
     load_env_file()
-    prompt_id = sys.argv[1]
-    user_question = " ".join(sys.argv[2:])
+    telemetry.configure_from_env()
+    prompt_id = args[0]
+    user_question = " ".join(args[1:])
+    record = get_prompt(prompt_id)
+    prompt_text_value = build_prompt(record.text, user_question)
+
+    # Chain construction pulls in langchain_core; keep it off the usage/error paths.
+    from langchain_core.runnables import RunnableLambda
+
+    from langchain.lc_prompts.chains import simple_chain
+    from langchain.lc_prompts.llms import streaming_gemini_llm
+    from src.llm import get_client_provider
+
+    model = get_client_provider().model_name()
+
+    if stream:
+        chain = simple_chain(prompt_id, streaming_gemini_llm())
+        record_id, _, stats = save_stream(
+            prompt_text_value,
+            chain.stream({"input": user_question}),
+            on_chunk=print_chunk,
+            prompt_id=prompt_id,
+            model=model,
+        )
+        print(f"\n\n{format_stream_stats(stats)}")
+        print(f"Saved output {record_id} to {get_result_store().location}")
+        return 0
 
     llm = RunnableLambda(_invoke_model)
     chain = simple_chain(prompt_id, llm)
     output = chain.invoke({"input": user_question})
     print(output)
-    record = load_prompt_by_id(prompt_id)
-    prompt_text = build_prompt(record.text, user_question)
-    saved_path = save_output(prompt_text, str(output), "results/output")
-    print(f"\nSaved output to {saved_path}")
+    record_id = save_output(prompt_text_value, str(output), prompt_id=prompt_id, model=model)
+    print(f"\nSaved output {record_id} to {get_result_store().location}")
     return 0
 
 
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from src.daemon import DEFAULT_SOCKET, send_request
+
+
+def _address(args: argparse.Namespace) -> dict:
+    if args.port is not None:
+        return {"host": args.host, "port": args.port}
+    return {"socket_path": args.socket}
+
+
+def serve(args: argparse.Namespace) -> int:
+    from runner import load_env_file
+    from src import telemetry
+    from src.daemon import PlaygroundDaemon, chain_handler
+
+    load_env_file()
+    telemetry.configure_from_env()
+    daemon = PlaygroundDaemon(
+        chain_handler(prompts_dir=args.prompts_dir),
+        max_concurrency=args.concurrency,
+        max_queue=args.max_queue,
+    )
+    where = f"{args.host}:{args.port}" if args.port is not None else args.socket
+    print(f"Serving prompt playground on {where}", flush=True)
+    try:
+        asyncio.run(daemon.serve_forever(**_address(args)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def call(args: argparse.Namespace) -> int:
+    if args.command == "run":
+        payload = {"prompt_id": args.prompt_id, "input": " ".join(args.input)}
+    else:
+        payload = {"op": args.command}
+    response = send_request(payload, timeout=args.timeout, **_address(args))
+    if "error" in response:
+        print(response["error"], file=sys.stderr)
+        return 1
+    if args.command == "run":
+        output = response["output"]
+        print(output if isinstance(output, str) else json.dumps(output, indent=2))
+    else:
+        print(json.dumps(response.get("stats", response), indent=2))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Long-running prompt playground server and client.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="listen/connect on TCP instead of the Unix socket")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="start the daemon")
+    serve_parser.add_argument("--concurrency", type=int, default=4)
+    serve_parser.add_argument("--max-queue", type=int, default=64)
+    serve_parser.add_argument("--prompts-dir")
+    serve_parser.set_defaults(func=serve)
+
+    run_parser = commands.add_parser("run", help="send {prompt_id, input} to the daemon")
+    run_parser.add_argument("prompt_id")
+    run_parser.add_argument("input", nargs="+")
+    run_parser.add_argument("--timeout", type=float, default=300.0)
+    run_parser.set_defaults(func=call)
+
+    for name in ("ping", "stats"):
+        op_parser = commands.add_parser(name)
+        op_parser.add_argument("--timeout", type=float, default=10.0)
+        op_parser.set_defaults(func=call)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
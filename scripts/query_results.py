@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from src.storage import DEFAULT_STORE, STORE_ENV_VAR, import_output_files, open_result_store
+
+
+def _timestamp(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Query stored runner outputs as JSON lines.")
+    parser.add_argument("--store", default=os.getenv(STORE_ENV_VAR, DEFAULT_STORE))
+    parser.add_argument("--prompt-id")
+    parser.add_argument("--model")
+    parser.add_argument("--since", type=_timestamp, help="ISO date/time, inclusive")
+    parser.add_argument("--until", type=_timestamp, help="ISO date/time, exclusive")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--id", dest="record_id", help="fetch one record by id")
+    parser.add_argument("--import-dir", help="load legacy output-*.txt files into the store")
+    args = parser.parse_args(argv)
+
+    store = open_result_store(args.store)
+    try:
+        if args.import_dir:
+            count = import_output_files(args.import_dir, store)
+            print(f"Imported {count} files into {store.location}")
+            return 0
+        if args.record_id:
+            record = store.get(args.record_id)
+            if record is None:
+                print(f"No record {args.record_id}", file=sys.stderr)
+                return 1
+            records = [record]
+        else:
+            records = store.query(
+                prompt_id=args.prompt_id,
+                model=args.model,
+                since=args.since,
+                until=args.until,
+                limit=args.limit,
+            )
+        for record in records:
+            print(json.dumps(record, ensure_ascii=True))
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
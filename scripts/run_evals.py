@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from langchain.lc_prompts.caching import cached_llm
+from langchain.lc_prompts.chains import tool_aware_chain
+from langchain.lc_prompts.llms import gemini_llm
+from langchain.lc_prompts.mappings import PROMPT_CATEGORIES, map_prompt
+from langchain.lc_prompts.output_parsers import json_output_parser
+from langchain.lc_prompts.registry import get_prompt
+from runner import load_batch_rows, load_env_file, print_progress
+from src import telemetry
+from src.evals import CATEGORY_SCHEMAS, check_output, render_report, run_evals, summarize
+from src.llm import ResponseCache, SQLiteCacheBackend, get_client_provider
+
+DEFAULT_PROMPTS = ["zero_shot", "few_shot", "cot", "structured_output"]
+TOOL_PROMPTS = {"tool_answer": "router"}
+
+
+def valid_llm_output(category: str):
+    parser = json_output_parser() if category in CATEGORY_SCHEMAS else None
+
+    def accept(output) -> bool:
+        try:
+            check_output(category, parser.invoke(output) if parser is not None else output)
+        except Exception:
+            return False
+        return True
+
+    return accept
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a prompt x input eval matrix.")
+    parser.add_argument("--dataset", default="datasets/eval_inputs.jsonl", help="JSONL rows with 'input'")
+    parser.add_argument("--prompts", nargs="+", default=DEFAULT_PROMPTS, help="ids from PROMPT_CATEGORIES or 'all'")
+    parser.add_argument("--output-dir", default="results/evals")
+    parser.add_argument("--report", help="report path (default: <output-dir>/comparisons.md)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-attempts", type=int, default=2)
+    parser.add_argument("--no-cache", action="store_true", help="skip the SQLite response cache")
+    args = parser.parse_args(argv)
+
+    load_env_file()
+    telemetry.configure_from_env()
+    prompt_ids = list(PROMPT_CATEGORIES) if args.prompts == ["all"] else args.prompts
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    prompt_versions = {prompt_id: get_prompt(prompt_id).metadata.version for prompt_id in prompt_ids}
+    llm = gemini_llm()
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(SQLiteCacheBackend(os.path.join(args.output_dir, "cache.sqlite")))
+        model = get_client_provider().model_name()
+
+    def llm_for(prompt_id: str):
+        if cache is None:
+            return llm
+        # Only outputs that pass the eval check are cached, so reruns never replay an invalid answer.
+        return cached_llm(
+            llm,
+            cache,
+            model=model,
+            temperature=llm.temperature,
+            prompt_version=get_prompt(prompt_id).metadata.version,
+            accept=valid_llm_output(PROMPT_CATEGORIES[prompt_id]),
+        )
+
+    llms = {prompt_id: llm_for(prompt_id) for prompt_id in {*prompt_ids, *TOOL_PROMPTS.values()}}
+    # The answer prompt needs the router's tool results, so it runs as the full tool-aware chain.
+    tool_chains = {
+        answer_id: tool_aware_chain(router_id, answer_id, llms[answer_id], router_llm=llms[router_id])
+        for answer_id, router_id in TOOL_PROMPTS.items()
+        if answer_id in prompt_ids
+    }
+
+    def chain_for(prompt_id: str, attempt: int):
+        return tool_chains.get(prompt_id) or map_prompt(prompt_id, llms[prompt_id])
+
+    results = run_evals(
+        prompt_ids,
+        load_batch_rows(args.dataset),
+        chain_for,
+        os.path.join(args.output_dir, "results.jsonl"),
+        categories=PROMPT_CATEGORIES,
+        concurrency=args.concurrency,
+        max_attempts=args.max_attempts,
+        prompt_versions=prompt_versions,
+        on_progress=print_progress,
+    )
+    print(file=sys.stderr)
+    report_path = args.report or os.path.join(args.output_dir, "comparisons.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(render_report(results))
+
+    for prompt_id, stats in summarize(results).items():
+        print(
+            f"{prompt_id:<24} valid {stats['validity_rate']:>5.0%}  retries {stats['retries']:>3}"
+            f"  mean {stats['mean_latency_seconds']:.2f}s"
+        )
+    print(f"Wrote {len(results)} results to {args.output_dir}; report at {report_path}")
+    if cache is not None:
+        print(f"Cache stats: {cache.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+DEFAULT_SOCKET = "results/daemon.sock"
+MAX_LINE_BYTES = 1 << 20
+
+Handler = Callable[[str, str], Any]
+
+
+def chain_handler(llm: Any | None = None, *, prompts_dir: str | None = None) -> Handler:
+    from langchain.lc_prompts.llms import gemini_llm
+    from langchain.lc_prompts.mappings import map_prompt, warm_chains
+
+    chosen_llm = llm or gemini_llm()
+    warm_chains(chosen_llm, prompts_dir=prompts_dir)
+
+    def handle(prompt_id: str, user_input: str) -> Any:
+        chain = map_prompt(prompt_id, chosen_llm, prompts_dir=prompts_dir)
+        return chain.invoke({"input": user_input})
+
+    return handle
+
+
+def _remove_stale_socket(path: str) -> None:
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise RuntimeError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(1.0)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        # Nothing is listening: left behind by a daemon that did not shut down cleanly.
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"Another daemon is already listening on {path}")
+
+
+class PlaygroundDaemon:
+    def __init__(self, handler: Handler, *, max_concurrency: int = 4, max_queue: int = 64) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="daemon")
+        self._semaphore: asyncio.Semaphore | None = None
+        self._pending = 0
+        self._running = 0
+        self._counts = {"requests": 0, "errors": 0, "rejected": 0}
+        self._total_seconds = 0.0
+        self._server: asyncio.AbstractServer | None = None
+
+    def stats(self) -> dict[str, Any]:
+        completed = self._counts["requests"] - self._counts["rejected"]
+        return {
+            **self._counts,
+            "in_flight": self._running,
+            "queued": self._pending - self._running,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "mean_seconds": self._total_seconds / completed if completed else 0.0,
+        }
+
+    async def handle_request(self, request: Any) -> dict[str, Any]:
+        if not isinstance(request, dict):
+            return {"error": "Request must be a JSON object"}
+        response: dict[str, Any] = {"id": request.get("id")}
+        op = request.get("op", "run")
+        if op == "ping":
+            return {**response, "ok": True}
+        if op == "stats":
+            return {**response, "stats": self.stats()}
+        if op != "run":
+            return {**response, "error": f"Unknown op: {op}"}
+        prompt_id = request.get("prompt_id")
+        user_input = request.get("input")
+        if not isinstance(prompt_id, str) or not isinstance(user_input, str):
+            return {**response, "error": "Requests need string 'prompt_id' and 'input' fields"}
+
+        self._counts["requests"] += 1
+        if self._pending >= self.max_concurrency + self.max_queue:
+            self._counts["rejected"] += 1
+            return {**response, "error": "Server busy: request queue is full"}
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._pending += 1
+        start = time.perf_counter()
+        try:
+            async with self._semaphore:
+                self._running += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    output = await loop.run_in_executor(self._pool, self.handler, prompt_id, user_input)
+                finally:
+                    self._running -= 1
+            response["output"] = output
+        except Exception as exc:
+            self._counts["errors"] += 1
+            response["error"] = f"{type(exc).__name__}: {exc}"
+        finally:
+            self._pending -= 1
+            self._total_seconds += time.perf_counter() - start
+        return response
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        try:
+            response = await self.handle_request(json.loads(line))
+        except json.JSONDecodeError as exc:
+            response = {"error": f"Invalid JSON: {exc}"}
+        data = json.dumps(response, ensure_ascii=True, default=str).encode("utf-8") + b"\n"
+        async with lock:
+            writer.write(data)
+            await writer.drain()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+        tasks: set[asyncio.Task] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(
+        self, *, socket_path: str | None = None, host: str | None = None, port: int | None = None
+    ) -> asyncio.AbstractServer:
+        if host is not None:
+            self._server = await asyncio.start_server(
+                self._handle_connection, host, port or 0, limit=MAX_LINE_BYTES
+            )
+        else:
+            path = socket_path or DEFAULT_SOCKET
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            _remove_stale_socket(path)
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path, limit=MAX_LINE_BYTES
+            )
+        return self._server
+
+    async def serve_forever(self, **address: Any) -> None:
+        server = await self.start(**address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def send_request(
+    payload: dict[str, Any],
+    *,
+    socket_path: str = DEFAULT_SOCKET,
+    host: str | None = None,
+    port: int | None = None,
+    timeout: float | None = 300.0,
+) -> dict[str, Any]:
+    if host is not None:
+        conn = socket.create_connection((host, port or 0), timeout=timeout)
+    else:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(timeout)
+        conn.connect(socket_path)
+    with conn, conn.makefile("rb") as reader:
+        conn.sendall(json.dumps(payload, ensure_ascii=True).encode("utf-8") + b"\n")
+        line = reader.readline()
+    if not line:
+        raise ConnectionError("Daemon closed the connection without a response")
+    return json.loads(line)
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+from pydantic import BaseModel
+
+from src.jobs import DEFAULT_FLUSH_EVERY, Job, JobProgress
+from src.schemas import StructuredAnswer, ToolAnswer, ToolRoute
+from src.telemetry import percentile
+
+CATEGORY_SCHEMAS: dict[str, type[BaseModel]] = {
+    "structured_json": StructuredAnswer,
+    "router_json": ToolRoute,
+    "tool_aware_json": ToolAnswer,
+}
+COMPARISON_PAIRS = (
+    ("zero_shot", "few_shot"),
+    ("cot", "zero_shot"),
+    ("structured_output", "zero_shot"),
+    ("role_based", "zero_shot"),
+    ("constraints", "zero_shot"),
+    ("calibration", "zero_shot"),
+)
+
+ChainFactory = Callable[[str, int], Any]
+
+
+@dataclass(frozen=True)
+class EvalCell:
+    prompt_id: str
+    row_id: Any
+    input: str
+    prompt_version: str = ""
+
+    @property
+    def key(self) -> str:
+        # An edited input or a new prompt version is a new cell, not a reuse of the old result.
+        return "\x1f".join((self.prompt_id, self.prompt_version, str(self.row_id), self.input))
+
+    @classmethod
+    def from_result(cls, result: dict[str, Any]) -> EvalCell:
+        return cls(result["prompt_id"], result["row_id"], result["input"], result.get("prompt_version", ""))
+
+
+def check_output(category: str, output: Any) -> None:
+    schema = CATEGORY_SCHEMAS.get(category)
+    if schema is not None:
+        schema.model_validate(output)
+        return
+    if not isinstance(output, str) or not output.strip():
+        raise ValueError("Expected a non-empty text response")
+
+
+def run_cell(
+    cell: EvalCell,
+    chain_for: ChainFactory,
+    categories: dict[str, str],
+    *,
+    max_attempts: int = 2,
+) -> dict[str, Any]:
+    category = categories[cell.prompt_id]
+    result: dict[str, Any] = {
+        "prompt_id": cell.prompt_id,
+        "category": category,
+        "row_id": cell.row_id,
+        "input": cell.input,
+        "prompt_version": cell.prompt_version,
+    }
+    errors: list[str] = []
+    output: Any = None
+    valid = False
+    attempts = 0
+    start = time.perf_counter()
+    while attempts < max_attempts and not valid:
+        attempts += 1
+        output = None
+        try:
+            output = chain_for(cell.prompt_id, attempts).invoke({"input": cell.input})
+            check_output(category, output)
+            valid = True
+        except Exception as exc:
+            errors.append(f"{type(exc).__name__}: {exc}")
+    result.update(output=output, valid=valid, attempts=attempts, retries=attempts - 1)
+    result["latency_seconds"] = round(time.perf_counter() - start, 6)
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+def build_matrix(
+    prompt_ids: Iterable[str],
+    rows: Iterable[dict[str, Any]],
+    prompt_versions: dict[str, str] | None = None,
+) -> list[EvalCell]:
+    rows = list(rows)
+    versions = prompt_versions or {}
+    return [
+        EvalCell(prompt_id, row["id"], str(row["input"]), versions.get(prompt_id, ""))
+        for prompt_id in prompt_ids
+        for row in rows
+    ]
+
+
+def load_results(path: str) -> dict[str, dict[str, Any]]:
+    results: dict[str, dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line has no checkpoint entry, so that cell reruns.
+                continue
+            results[EvalCell.from_result(record).key] = record
+    return results
+
+
+def iter_eval_results(
+    cells: Iterable[EvalCell],
+    chain_for: ChainFactory,
+    categories: dict[str, str],
+    *,
+    concurrency: int = 4,
+    max_attempts: int = 2,
+) -> Iterator[dict[str, Any]]:
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    window = concurrency * 2
+    pending: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for cell in cells:
+            pending.append(
+                pool.submit(run_cell, cell, chain_for, categories, max_attempts=max_attempts)
+            )
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_evals(
+    prompt_ids: list[str],
+    rows: Iterable[dict[str, Any]],
+    chain_for: ChainFactory,
+    results_path: str,
+    *,
+    categories: dict[str, str],
+    concurrency: int = 4,
+    max_attempts: int = 2,
+    prompt_versions: dict[str, str] | None = None,
+    flush_every: int = DEFAULT_FLUSH_EVERY,
+    on_progress: Callable[[JobProgress], None] | None = None,
+) -> list[dict[str, Any]]:
+    unknown = [prompt_id for prompt_id in prompt_ids if prompt_id not in categories]
+    if unknown:
+        raise KeyError(f"Unknown prompt ids: {', '.join(unknown)}")
+    cells = build_matrix(prompt_ids, rows, prompt_versions)
+    with Job(results_path, total=len(cells), flush_every=flush_every, on_progress=on_progress) as job:
+        results = iter_eval_results(
+            job.pending(cells, key=lambda cell: cell.key),
+            chain_for,
+            categories,
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+        )
+        for result in results:
+            job.record(EvalCell.from_result(result).key, result)
+    done = load_results(results_path)
+    return [done[cell.key] for cell in cells if cell.key in done]
+
+
+def summarize(results: Iterable[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    grouped: dict[str, list[dict[str, Any]]] = {}
+    for result in results:
+        grouped.setdefault(result["prompt_id"], []).append(result)
+    summary = {}
+    for prompt_id, items in grouped.items():
+        latencies = [item["latency_seconds"] for item in items]
+        summary[prompt_id] = {
+            "cells": len(items),
+            "validity_rate": sum(item["valid"] for item in items) / len(items),
+            "retries": sum(item["retries"] for item in items),
+            "mean_latency_seconds": sum(latencies) / len(latencies),
+            "p95_latency_seconds": percentile(latencies, 95),
+        }
+    return summary
+
+
+def _excerpt(output: Any, limit: int = 400) -> str:
+    text = output if isinstance(output, str) else json.dumps(output, ensure_ascii=True)
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _winner(left: str, right: str, summary: dict[str, dict[str, Any]]) -> str:
+    a, b = summary[left], summary[right]
+    if a["validity_rate"] != b["validity_rate"]:
+        best = left if a["validity_rate"] > b["validity_rate"] else right
+        return f"{best} (higher validity rate)"
+    best = left if a["mean_latency_seconds"] <= b["mean_latency_seconds"] else right
+    return f"{best} (same validity, lower mean latency); review outputs for quality"
+
+
+def render_report(results: list[dict[str, Any]]) -> str:
+    summary = summarize(results)
+    lines = [
+        "Prompt Comparisons",
+        "",
+        "Purpose",
+        "Generated by the eval harness from the results matrix. Metrics are measured;",
+        "qualitative notes (structure, clarity, reasoning, specificity) are left for review.",
+        "",
+        "Summary",
+        "",
+        "| Prompt | Cells | Validity | Retries | Mean latency (s) | p95 latency (s) |",
+        "| --- | --- | --- | --- | --- | --- |",
+    ]
+    for prompt_id, stats in sorted(summary.items()):
+        lines.append(
+            f"| {prompt_id} | {stats['cells']} | {stats['validity_rate']:.0%} | {stats['retries']} "
+            f"| {stats['mean_latency_seconds']:.3f} | {stats['p95_latency_seconds']:.3f} |"
+        )
+    by_cell = {(result["prompt_id"], result["row_id"]): result for result in results}
+    rows: dict[Any, str] = {}
+    for result in results:
+        rows.setdefault(result["row_id"], result["input"])
+    number = 0
+    for left, right in COMPARISON_PAIRS:
+        if left not in summary or right not in summary:
+            continue
+        number += 1
+        lines += ["", "---", "", f"Comparison {number}", f"Prompt Pair: {left} vs {right}", ""]
+        for row_id, user_input in rows.items():
+            lines += [f"Input ({row_id}): {user_input}", ""]
+            for prompt_id in (left, right):
+                cell = by_cell.get((prompt_id, row_id))
+                if cell is None:
+                    continue
+                status = "valid" if cell["valid"] else "invalid"
+                lines.append(
+                    f"- {prompt_id} [{status}, {cell['latency_seconds']:.2f}s, "
+                    f"{cell['retries']} retries]: {_excerpt(cell['output'])}"
+                )
+            lines.append("")
+        failures = [
+            error
+            for prompt_id in (left, right)
+            for result in results
+            if result["prompt_id"] == prompt_id and not result["valid"]
+            for error in result.get("errors", [])[-1:]
+        ]
+        lines.append("Failure Modes:")
+        lines.append("")
+        lines += [f"- {error}" for error in failures] or ["- none observed"]
+        lines += ["", "Winner + Why:", "", f"- {_winner(left, right, summary)}"]
+    return "\n".join(lines) + "\n"
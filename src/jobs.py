@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+ItemT = TypeVar("ItemT")
+
+DEFAULT_FLUSH_EVERY = 50
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+
+def checkpoint_path_for(output_path: str) -> str:
+    return f"{output_path}.checkpoint"
+
+
+def _key(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=True, sort_keys=True)
+
+
+def terminate_last_line(path: str) -> None:
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def _sync(handle: Any) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+@dataclass(frozen=True)
+class JobProgress:
+    total: int | None
+    resumed: int
+    done: int
+    elapsed_seconds: float
+    failed: int = 0
+
+    @property
+    def remaining(self) -> int | None:
+        if self.total is None:
+            return None
+        return max(0, self.total - self.resumed - self.done)
+
+    @property
+    def rate(self) -> float:
+        return self.done / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> float | None:
+        if self.remaining is None or not self.rate:
+            return None
+        return self.remaining / self.rate
+
+    def format(self) -> str:
+        finished = self.resumed + self.done
+        total = "?" if self.total is None else str(self.total)
+        eta = "n/a" if self.eta_seconds is None else f"{self.eta_seconds:.0f}s"
+        failed = f", {self.failed} failed" if self.failed else ""
+        return f"{finished}/{total} done ({self.resumed} resumed{failed}), {self.rate:.2f}/s, ETA {eta}"
+
+
+def load_checkpoint(path: str) -> set[str]:
+    completed: set[str] = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                completed.add(line)
+    return completed
+
+
+class Job:
+    def __init__(
+        self,
+        output_path: str,
+        *,
+        checkpoint_path: str | None = None,
+        total: int | None = None,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        on_progress: Callable[[JobProgress], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or checkpoint_path_for(output_path)
+        self.total = total
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.on_progress = on_progress
+        self._clock = clock
+        self._completed = load_checkpoint(self.checkpoint_path)
+        # Counted as pending() skips items, so keys left over from another input don't count as resumed.
+        self._resumed = 0
+        self._done = 0
+        self._failed = 0
+        self._buffer: list[tuple[str | None, dict[str, Any]]] = []
+        self._started = clock()
+        self._last_flush = self._started
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        terminate_last_line(self.output_path)
+        terminate_last_line(self.checkpoint_path)
+        self._results = open(self.output_path, "a", encoding="utf-8")
+        self._checkpoint = open(self.checkpoint_path, "a", encoding="utf-8")
+
+    def __enter__(self) -> Job:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def is_completed(self, key: Any) -> bool:
+        return _key(key) in self._completed
+
+    def pending(self, items: Iterable[ItemT], key: Callable[[ItemT], Any]) -> Iterator[ItemT]:
+        for item in items:
+            if self.is_completed(key(item)):
+                self._resumed += 1
+            else:
+                yield item
+
+    def record(self, key: Any, result: dict[str, Any], *, completed: bool = True) -> None:
+        # Failed items are written out but left off the checkpoint so the next run retries them.
+        self._buffer.append((_key(key) if completed else None, result))
+        self._done += 1
+        self._failed += not completed
+        if len(self._buffer) >= self.flush_every or self._clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+        if self.on_progress is not None:
+            self.on_progress(self.progress())
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        # Results are synced before the checkpoint, so a crash in between repeats rows instead of losing them.
+        self._results.write(
+            "".join(json.dumps(result, ensure_ascii=True, default=str) + "\n" for _, result in batch)
+        )
+        _sync(self._results)
+        keys = [key for key, _ in batch if key is not None]
+        self._checkpoint.write("".join(key + "\n" for key in keys))
+        _sync(self._checkpoint)
+        self._completed.update(keys)
+        self._last_flush = self._clock()
+
+    def progress(self) -> JobProgress:
+        return JobProgress(self.total, self._resumed, self._done, self._clock() - self._started, self._failed)
+
+    def close(self) -> None:
+        if self._results.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._results.close()
+            self._checkpoint.close()
@@ -0,0 +1,15 @@
+"""Model client helpers shared by the runners and chains."""
+
+from .cache import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend, cache_key
+from .client import ClientProvider, get_client_provider, set_client_provider, shutdown_client_provider
+
+__all__ = [
+    "MemoryCacheBackend",
+    "ResponseCache",
+    "SQLiteCacheBackend",
+    "cache_key",
+    "ClientProvider",
+    "get_client_provider",
+    "set_client_provider",
+    "shutdown_client_provider",
+]
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from src import telemetry
+
+DEFAULT_MODEL = "models/gemini-2.0-flash-001"
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+ClientFactory = Callable[[str], Any]
+ConfigFactory = Callable[..., Any]
+
+
+def genai_client_factory(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+) -> ClientFactory:
+    def build(api_key: str) -> Any:
+        try:
+            import httpx
+            from google import genai
+            from google.genai import types
+        except ImportError as exc:
+            raise RuntimeError("google-genai package is required") from exc
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        http_options = types.HttpOptions(client_args={"limits": limits})
+        return genai.Client(api_key=api_key, http_options=http_options)
+
+    return build
+
+
+def genai_config_factory(**options: Any) -> Any:
+    try:
+        from google.genai import types
+    except ImportError as exc:
+        raise RuntimeError("google-genai package is required") from exc
+    return types.GenerateContentConfig(**options)
+
+
+class ClientProvider:
+    def __init__(
+        self,
+        *,
+        factory: ClientFactory | None = None,
+        config_factory: ConfigFactory | None = None,
+        api_key: str | None = None,
+    ) -> None:
+        self._factory = factory or genai_client_factory()
+        self._config_factory = config_factory or genai_config_factory
+        self._api_key = api_key
+        self._lock = threading.Lock()
+        self._client: Any | None = None
+        self._client_key: str | None = None
+        self._configs: dict[tuple[str, tuple[tuple[str, Any], ...]], Any] = {}
+
+    def _resolve_api_key(self) -> str:
+        api_key = self._api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise RuntimeError("GEMINI_API_KEY is not set")
+        return api_key
+
+    def model_name(self, model: str | None = None) -> str:
+        return model or os.getenv("GEMINI_MODEL", DEFAULT_MODEL)
+
+    def client(self) -> Any:
+        api_key = self._resolve_api_key()
+        with self._lock:
+            if self._client is None or self._client_key != api_key:
+                self._close_locked()
+                self._client = self._factory(api_key)
+                self._client_key = api_key
+            return self._client
+
+    def config(self, model: str, **options: Any) -> Any | None:
+        if not options:
+            return None
+        key = (model, tuple(sorted(options.items())))
+        with self._lock:
+            if key not in self._configs:
+                self._configs[key] = self._config_factory(**options)
+            return self._configs[key]
+
+    def _request(
+        self, prompt: str, model: str | None, options: dict[str, Any], timeout: float | None = None
+    ) -> dict[str, Any]:
+        model_name = self.model_name(model)
+        kwargs: dict[str, Any] = {"model": model_name, "contents": prompt}
+        if timeout is not None:
+            # Per-attempt budgets vary, so these configs are not cached.
+            config = self._config_factory(
+                **options, http_options={"timeout": max(1, int(timeout * 1000))}
+            )
+        else:
+            config = self.config(model_name, **options)
+        if config is not None:
+            kwargs["config"] = config
+        return kwargs
+
+    def generate(
+        self, prompt: str, *, model: str | None = None, timeout: float | None = None, **options: Any
+    ) -> Any:
+        kwargs = self._request(prompt, model, options, timeout)
+        with telemetry.span("llm.generate", model=kwargs["model"]) as span:
+            response = self.client().models.generate_content(**kwargs)
+            span.set(**telemetry.usage_tokens(response))
+        return response
+
+    def generate_stream(
+        self, prompt: str, *, model: str | None = None, **options: Any
+    ) -> Iterator[Any]:
+        kwargs = self._request(prompt, model, options)
+        stream = self.client().models.generate_content_stream(**kwargs)
+        if not telemetry.enabled():
+            return stream
+        return telemetry.instrument_stream(stream, "llm.generate_stream", model=kwargs["model"])
+
+    async def agenerate_stream(
+        self, prompt: str, *, model: str | None = None, **options: Any
+    ) -> AsyncIterator[Any]:
+        kwargs = self._request(prompt, model, options)
+        stream = await self.client().aio.models.generate_content_stream(**kwargs)
+        async for chunk in telemetry.ainstrument_stream(
+            stream, "llm.agenerate_stream", model=kwargs["model"]
+        ):
+            yield chunk
+
+    def _close_locked(self) -> None:
+        client = self._client
+        self._client = None
+        self._client_key = None
+        if client is not None and hasattr(client, "close"):
+            client.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+            self._configs.clear()
+
+
+_PROVIDER: ClientProvider | None = None
+_PROVIDER_LOCK = threading.Lock()
+
+
+def get_client_provider() -> ClientProvider:
+    global _PROVIDER
+    with _PROVIDER_LOCK:
+        if _PROVIDER is None:
+            _PROVIDER = ClientProvider()
+        return _PROVIDER
+
+
+def set_client_provider(provider: ClientProvider | None) -> ClientProvider | None:
+    global _PROVIDER
+    with _PROVIDER_LOCK:
+        previous = _PROVIDER
+        _PROVIDER = provider
+        return previous
+
+
+def shutdown_client_provider() -> None:
+    global _PROVIDER
+    with _PROVIDER_LOCK:
+        provider = _PROVIDER
+        _PROVIDER = None
+    if provider is not None:
+        provider.close()
+
+
+atexit.register(shutdown_client_provider)
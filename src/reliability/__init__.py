@@ -1,12 +1,51 @@
 """Reliability helpers for structured outputs."""
 
-from .retry import RetryConfig, run_with_retries
-from .validate import parse_json, validate_json, validate_with_model
-
-__all__ = [
-    "RetryConfig",
-    "run_with_retries",
-    "parse_json",
-    "validate_json",
-    "validate_with_model",
-]
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .policy import (
+        CallTimeoutError,
+        DeadlineExceededError,
+        RetryPolicy,
+        TokenBucket,
+        call_with_policy,
+        is_retryable,
+    )
+    from .retry import RetryConfig, run_with_retries
+    from .stream_validate import IncrementalJSONValidator, StreamAbortedError, consume_stream
+    from .validate import parse_json, validate_json, validate_with_model
+
+_LAZY_ATTRS: dict[str, str] = {
+    "RetryConfig": ".retry",
+    "run_with_retries": ".retry",
+    "CallTimeoutError": ".policy",
+    "DeadlineExceededError": ".policy",
+    "RetryPolicy": ".policy",
+    "TokenBucket": ".policy",
+    "call_with_policy": ".policy",
+    "is_retryable": ".policy",
+    "IncrementalJSONValidator": ".stream_validate",
+    "StreamAbortedError": ".stream_validate",
+    "consume_stream": ".stream_validate",
+    "parse_json": ".validate",
+    "validate_json": ".validate",
+    "validate_with_model": ".validate",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
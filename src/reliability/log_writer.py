@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+from typing import Any
+
+LOG_FILENAME = "retry.jsonl"
+_STOP = object()
+
+
+class RetryLogWriter:
+    def __init__(
+        self,
+        log_dir: str,
+        *,
+        filename: str = LOG_FILENAME,
+        max_queue: int = 10_000,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        batch_size: int = 256,
+    ) -> None:
+        os.makedirs(log_dir, exist_ok=True)
+        self.path = os.path.join(log_dir, filename)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue)
+        self._handle = open(self.path, "a", encoding="utf-8")
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name=f"retry-log-writer:{log_dir}", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, payload: dict[str, Any]) -> None:
+        # Serialize on the caller's thread so a bad record fails here, not in the writer thread.
+        line = json.dumps(payload, ensure_ascii=True, separators=(",", ":"), default=str)
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError(f"Log writer for {self.path} is closed")
+            self._queue.put(line)
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            records = [item for item in batch if item is not _STOP]
+            try:
+                self._write_batch(records)
+            except Exception as exc:
+                sys.stderr.write(f"Failed to write {len(records)} log records to {self.path}: {exc}\n")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                self._handle.close()
+                return
+
+    def _write_batch(self, lines: list[str]) -> None:
+        if not lines:
+            return
+        data = "\n".join(lines) + "\n"
+        if self._handle.tell() and self._handle.tell() + len(data) > self.max_bytes:
+            self._rotate()
+        self._handle.write(data)
+        self._handle.flush()
+
+    def _rotate(self) -> None:
+        self._handle.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._handle = open(self.path, "a", encoding="utf-8")
+
+
+_WRITERS: dict[str, RetryLogWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def get_log_writer(log_dir: str) -> RetryLogWriter:
+    key = os.path.abspath(log_dir)
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(key)
+        if writer is None or writer._closed:
+            writer = RetryLogWriter(log_dir)
+            _WRITERS[key] = writer
+        return writer
+
+
+def close_log_writers() -> None:
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS.values())
+        _WRITERS.clear()
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(close_log_writers)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+ResultT = TypeVar("ResultT")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+_RETRYABLE_ERROR_NAMES = frozenset(
+    {
+        "ServerError",
+        "TimeoutException",
+        "TransportError",
+        "NetworkError",
+        "RemoteProtocolError",
+        "ServiceUnavailable",
+        "TooManyRequests",
+        "ResourceExhausted",
+        "DeadlineExceeded",
+    }
+)
+
+
+class CallTimeoutError(TimeoutError):
+    pass
+
+
+class DeadlineExceededError(TimeoutError):
+    pass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    jitter: float = 0.5
+    call_timeout: float | None = None
+    deadline: float | None = None
+
+    def backoff(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        delay = min(self.max_delay, self.base_delay * (2**attempt))
+        return delay * (1 - self.jitter) + delay * self.jitter * rng()
+
+
+def _status_code(exc: BaseException) -> int | None:
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, DeadlineExceededError):
+        return False
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return any(cls.__name__ in _RETRYABLE_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: float | None = None) -> None:
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return
+            if timeout is not None and waited + wait > timeout:
+                raise DeadlineExceededError("Rate limiter wait exceeds the remaining deadline")
+            self._sleep(wait)
+            waited += wait
+
+
+def call_with_policy(
+    fn: Callable[..., ResultT],
+    *args: Any,
+    policy: RetryPolicy,
+    rate_limiter: TokenBucket | None = None,
+    classify: Callable[[BaseException], bool] = is_retryable,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+    timeout_kwarg: str | None = None,
+    **kwargs: Any,
+) -> ResultT:
+    # Timeouts are enforced by the callee (e.g. the SDK's HTTP timeout) through
+    # timeout_kwarg; running the call on a helper thread would leave it running after we give up.
+    if policy.call_timeout is not None and timeout_kwarg is None:
+        raise ValueError("call_timeout needs a callee that accepts a timeout; pass timeout_kwarg")
+    start = clock()
+
+    def remaining() -> float | None:
+        if policy.deadline is None:
+            return None
+        return policy.deadline - (clock() - start)
+
+    for attempt in range(policy.max_attempts):
+        left = remaining()
+        if left is not None and left <= 0:
+            raise DeadlineExceededError(f"Deadline of {policy.deadline}s exceeded")
+        if rate_limiter is not None:
+            rate_limiter.acquire(timeout=left)
+        timeout = policy.call_timeout
+        left = remaining()
+        if left is not None:
+            timeout = left if timeout is None else min(timeout, left)
+        if timeout_kwarg is not None:
+            kwargs[timeout_kwarg] = timeout
+        try:
+            return fn(*args, **kwargs)
+        except Exception as exc:
+            if attempt + 1 >= policy.max_attempts or not classify(exc):
+                raise
+            delay = policy.backoff(attempt)
+            left = remaining()
+            if left is not None and delay >= left:
+                raise DeadlineExceededError(
+                    f"Deadline of {policy.deadline}s exceeded after {attempt + 1} attempts"
+                ) from exc
+            sleep(delay)
+    raise RuntimeError("Retry policy loop exceeded without returning")
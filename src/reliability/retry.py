@@ -1,44 +1,87 @@
 from __future__ import annotations
 
-import json
-import os
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
+
+from pydantic import BaseModel
+
+from .log_writer import get_log_writer
+from .policy import RetryPolicy, TokenBucket, call_with_policy
+from .stream_validate import StreamAbortedError, consume_stream
 
 
 @dataclass(frozen=True)
 class RetryConfig:
     max_retries: int = 2
     log_dir: str = "results/logs"
+    policy: RetryPolicy | None = None
+    rate_limiter: TokenBucket | None = None
+    timeout_kwarg: str | None = None
+
+
+def _guarded(
+    fn: Callable[[dict[str, Any]], Any], config: RetryConfig
+) -> Callable[[dict[str, Any]], Any]:
+    if config.policy is None and config.rate_limiter is None:
+        return fn
+    policy = config.policy or RetryPolicy(max_attempts=1)
+
+    def call(inputs: dict[str, Any]) -> Any:
+        # A returned stream is only guarded while it is opened, not while it is consumed.
+        return call_with_policy(
+            fn,
+            inputs,
+            policy=policy,
+            rate_limiter=config.rate_limiter,
+            timeout_kwarg=config.timeout_kwarg,
+        )
+
+    return call
 
 
 def _write_log(payload: dict[str, Any], log_dir: str) -> str:
-    os.makedirs(log_dir, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    path = os.path.join(log_dir, f"retry-{timestamp}.json")
-    with open(path, "w", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload, ensure_ascii=True, indent=2))
-        handle.write("\n")
-    return path
+    writer = get_log_writer(log_dir)
+    writer.write({"logged_at": datetime.now().isoformat(timespec="microseconds"), **payload})
+    return writer.path
+
+
+def _collect_output(
+    output: str | Iterable[str], stream_schema: type[BaseModel] | None
+) -> tuple[str, ValueError | None]:
+    if isinstance(output, str):
+        return output, None
+    if stream_schema is None:
+        return "".join(output), None
+    try:
+        return consume_stream(output, stream_schema), None
+    except StreamAbortedError as exc:
+        return exc.partial_text, exc
 
 
 def run_with_retries(
     *,
-    invoke: Callable[[dict[str, Any]], str],
+    invoke: Callable[[dict[str, Any]], str | Iterable[str]],
     inputs: dict[str, Any],
     validator: Callable[[str], Any],
     repair_invoke: Callable[[dict[str, Any]], str] | None = None,
     repair_context: dict[str, Any] | None = None,
     config: RetryConfig | None = None,
     log_context: dict[str, Any] | None = None,
+    stream_schema: type[BaseModel] | None = None,
 ) -> Any:
     chosen_config = config or RetryConfig()
+    invoke = _guarded(invoke, chosen_config)
+    if repair_invoke is not None:
+        repair_invoke = _guarded(repair_invoke, chosen_config)
     errors: list[str] = []
-    raw_output = invoke(inputs)
+    raw_output, stream_error = _collect_output(invoke(inputs), stream_schema)
 
     for attempt in range(chosen_config.max_retries + 1):
         try:
+            if stream_error is not None:
+                error, stream_error = stream_error, None
+                raise error
             validated = validator(raw_output)
             _write_log(
                 {
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+import types
+from typing import Any, Iterable, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+
+from .validate import ModelT, validate_json
+
+_ANY_START = frozenset('"-0123456789tfn[{')
+_NUMBER_START = frozenset("-0123456789")
+_WHITESPACE = frozenset(" \t\r\n")
+
+
+class StreamAbortedError(ValueError):
+    def __init__(self, message: str, partial_text: str) -> None:
+        super().__init__(message)
+        self.partial_text = partial_text
+
+
+def _allowed_starts(annotation: Any) -> frozenset[str]:
+    if annotation is Any:
+        return _ANY_START
+    if annotation is None or annotation is type(None):
+        return frozenset("n")
+    origin = get_origin(annotation)
+    if origin is Literal:
+        starts: set[str] = set()
+        for value in get_args(annotation):
+            starts |= _allowed_starts(type(value))
+        return frozenset(starts)
+    if origin is Union or origin is types.UnionType:
+        starts = set()
+        for arg in get_args(annotation):
+            starts |= _allowed_starts(arg)
+        return frozenset(starts)
+    target = origin or annotation
+    if target is str:
+        return frozenset('"')
+    if target is bool:
+        return frozenset("tf")
+    if target in (int, float):
+        return _NUMBER_START
+    if target in (list, tuple, set, frozenset):
+        return frozenset("[")
+    if target is dict or (isinstance(target, type) and issubclass(target, BaseModel)):
+        return frozenset("{")
+    return _ANY_START
+
+
+def _literal_values(annotation: Any) -> set[Any] | None:
+    origin = get_origin(annotation)
+    if origin is Literal:
+        return set(get_args(annotation))
+    if origin is Union or origin is types.UnionType:
+        values: set[Any] = set()
+        for arg in get_args(annotation):
+            if get_origin(arg) is not Literal:
+                return None
+            values |= set(get_args(arg))
+        return values
+    return None
+
+
+class IncrementalJSONValidator:
+    def __init__(self, model: type[ModelT]) -> None:
+        self.model = model
+        self._fields = model.model_fields
+        self._chunks: list[str] = []
+        self._stack: list[str] = []
+        self._started = False
+        self._finished = False
+        self._in_string = False
+        self._escape = False
+        self._string_buffer: list[str] | None = None
+        self._expect = "key"
+        self._current_key: str | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def _fail(self, message: str) -> None:
+        raise StreamAbortedError(f"Streamed output is off-schema: {message}", self.text)
+
+    def feed(self, chunk: str) -> None:
+        self._chunks.append(chunk)
+        for char in chunk:
+            self._consume(char)
+
+    def _consume(self, char: str) -> None:
+        if self._in_string:
+            if self._string_buffer is not None:
+                self._string_buffer.append(char)
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                self._close_string()
+            return
+        if char in _WHITESPACE:
+            return
+        if self._finished:
+            self._fail("unexpected data after the JSON object")
+        if not self._started:
+            if char != "{":
+                self._fail(f"expected a JSON object, got {char!r}")
+            self._started = True
+            self._stack.append("{")
+            self._expect = "key"
+            return
+        depth = len(self._stack)
+        if depth == 1 and self._expect == "key" and char not in '"}':
+            self._fail(f"expected a key, got {char!r}")
+        if depth == 1 and self._expect == "colon" and char != ":":
+            self._fail(f"expected ':' after '{self._current_key}', got {char!r}")
+        if depth == 1 and self._expect == "value":
+            field = self._fields[self._current_key]
+            if char not in _allowed_starts(field.annotation):
+                self._fail(f"unexpected value for '{self._current_key}'")
+            self._expect = "after_value"
+        if char == '"':
+            self._in_string = True
+            if depth == 1:
+                self._string_buffer = ['"']
+            return
+        if char in "{[":
+            self._stack.append(char)
+            return
+        if char in "}]":
+            self._stack.pop()
+            if not self._stack:
+                self._finished = True
+            return
+        if depth == 1 and char == ",":
+            self._expect = "key"
+            self._current_key = None
+        elif depth == 1 and char == ":":
+            if self._expect != "colon" or self._current_key is None:
+                self._fail("unexpected ':' without a key")
+            self._expect = "value"
+
+    def _close_string(self) -> None:
+        if self._string_buffer is None:
+            return
+        raw = "".join(self._string_buffer)
+        self._string_buffer = None
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            self._fail("invalid string literal")
+        if self._expect == "key":
+            if value not in self._fields:
+                self._fail(f"unknown key '{value}'")
+            self._current_key = value
+            self._expect = "colon"
+            return
+        if self._expect == "after_value" and self._current_key is not None:
+            allowed = _literal_values(self._fields[self._current_key].annotation)
+            if allowed is not None:
+                if value not in allowed:
+                    self._fail(f"'{value}' is not an allowed value for '{self._current_key}'")
+                return
+            # Field validators (e.g. registered tool names) can reject a value as soon as it is complete.
+            try:
+                self.model.__pydantic_validator__.validate_assignment(
+                    self.model.model_construct(), self._current_key, value
+                )
+            except ValidationError:
+                self._fail(f"'{value}' is not an allowed value for '{self._current_key}'")
+
+    def finish(self) -> ModelT:
+        return validate_json(self.text, self.model)
+
+
+def consume_stream(chunks: Iterable[str], model: type[BaseModel]) -> str:
+    validator = IncrementalJSONValidator(model)
+    try:
+        for chunk in chunks:
+            validator.feed(chunk)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    return validator.text
@@ -2,7 +2,16 @@ from __future__ import annotations
 
 from typing import Any, Literal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+def _known_tool(name: str) -> str:
+    # Plugins add tools at runtime, so names are checked against the registry instead of a Literal.
+    from src.tools.registry import get_tool_registry
+
+    if name != "none" and name not in get_tool_registry():
+        raise ValueError(f"Unknown tool: {name}")
+    return name
 
 
 class Citation(BaseModel):
@@ -12,17 +21,30 @@ class Citation(BaseModel):
     snippet: str
 
 
+class StructuredAnswer(BaseModel):
+    model_config = ConfigDict(extra="forbid", strict=True)
+
+    summary: str
+    key_points: list[str]
+    risks: list[str]
+    confidence: Literal["low", "medium", "high"]
+
+
 class ToolRoute(BaseModel):
     model_config = ConfigDict(extra="forbid", strict=True)
 
-    tool: Literal["calculator", "search", "none"]
+    tool: str
     tool_input: str
 
+    _check_tool = field_validator("tool")(_known_tool)
+
 
 class ToolAnswer(BaseModel):
     model_config = ConfigDict(extra="forbid", strict=True)
 
     answer: str
-    tool_used: Literal["calculator", "search", "none"]
+    tool_used: str
     tool_results: dict[str, Any] | None
     citations: list[Citation]
+
+    _check_tool_used = field_validator("tool_used")(_known_tool)
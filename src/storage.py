@@ -0,0 +1,471 @@
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Iterable, Iterator, Protocol
+
+from src.jobs import terminate_last_line
+
+STORE_ENV_VAR = "PROMPT_PLAYGROUND_STORE"
+DEFAULT_STORE = "results/output/results.sqlite"
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+_COLUMNS = ("id", "created_at", "prompt_id", "model", "prompt", "output", "metadata")
+_SEGMENT_NAME = re.compile(r"segment-(\d{6})\.jsonl(\.gz)?")
+
+
+def new_record(
+    prompt: str,
+    output: str,
+    *,
+    prompt_id: str | None = None,
+    model: str | None = None,
+    metadata: dict[str, Any] | None = None,
+    clock: Callable[[], float] = time.time,
+) -> dict[str, Any]:
+    return {
+        "id": uuid.uuid4().hex,
+        "created_at": clock(),
+        "prompt_id": prompt_id,
+        "model": model,
+        "prompt": prompt,
+        "output": output,
+        "metadata": metadata or {},
+    }
+
+
+def _matches(
+    record: dict[str, Any],
+    prompt_id: str | None,
+    model: str | None,
+    since: float | None,
+    until: float | None,
+) -> bool:
+    if prompt_id is not None and record["prompt_id"] != prompt_id:
+        return False
+    if model is not None and record["model"] != model:
+        return False
+    if since is not None and record["created_at"] < since:
+        return False
+    if until is not None and record["created_at"] >= until:
+        return False
+    return True
+
+
+def _lock_file(handle: Any) -> None:
+    # Imported here so runner.py, which imports this module eagerly, still loads on Windows.
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        return
+    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _segment_number(name: str) -> int:
+    return int(name[len("segment-") :][:6])
+
+
+def _segment_entry(name: str, records: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    records = list(records)
+    created = [record["created_at"] for record in records]
+    return {
+        "name": name,
+        "count": len(records),
+        "first_created_at": min(created, default=None),
+        "last_created_at": max(created, default=None),
+        "prompt_ids": sorted({str(record["prompt_id"]) for record in records}),
+        "models": sorted({str(record["model"]) for record in records}),
+    }
+
+
+class ResultStore(Protocol):
+    location: str
+
+    def add(self, record: dict[str, Any]) -> str: ...
+
+    def add_many(self, records: Iterable[dict[str, Any]]) -> list[str]: ...
+
+    def get(self, record_id: str) -> dict[str, Any] | None: ...
+
+    def query(
+        self,
+        *,
+        prompt_id: str | None = None,
+        model: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]: ...
+
+    def close(self) -> None: ...
+
+
+class SQLiteResultStore:
+    def __init__(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.location = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outputs ("
+            "id TEXT PRIMARY KEY, created_at REAL NOT NULL, prompt_id TEXT, model TEXT, "
+            "prompt TEXT NOT NULL, output TEXT NOT NULL, metadata TEXT NOT NULL)"
+        )
+        for column in ("prompt_id", "model", "created_at"):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS outputs_{column} ON outputs ({column}, created_at)"
+            )
+        self._conn.commit()
+
+    def add(self, record: dict[str, Any]) -> str:
+        return self.add_many([record])[0]
+
+    def add_many(self, records: Iterable[dict[str, Any]]) -> list[str]:
+        rows = [
+            (*(record[column] for column in _COLUMNS[:-1]), json.dumps(record["metadata"], ensure_ascii=True))
+            for record in records
+        ]
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO outputs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                rows,
+            )
+            self._conn.commit()
+        return [row[0] for row in rows]
+
+    def _decode(self, row: tuple[Any, ...]) -> dict[str, Any]:
+        record = dict(zip(_COLUMNS, row))
+        record["metadata"] = json.loads(record["metadata"])
+        return record
+
+    def get(self, record_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM outputs WHERE id = ?", (record_id,)
+            ).fetchone()
+        return self._decode(row) if row is not None else None
+
+    def query(
+        self,
+        *,
+        prompt_id: str | None = None,
+        model: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        for clause, value in (
+            ("prompt_id = ?", prompt_id),
+            ("model = ?", model),
+            ("created_at >= ?", since),
+            ("created_at < ?", until),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM outputs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JSONLSegmentStore:
+    def __init__(
+        self,
+        directory: str,
+        *,
+        max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        compress: bool = True,
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.location = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.compress = compress
+        self._lock = threading.Lock()
+        self._lockfile = open(os.path.join(directory, ".lock"), "a+")
+        try:
+            _lock_file(self._lockfile)
+        except OSError:
+            self._lockfile.close()
+            raise RuntimeError(f"Result store {directory} is already open in another process") from None
+        self._manifest_path = os.path.join(directory, "manifest.json")
+        self._sealed: list[dict[str, Any]] = []
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                self._sealed = json.load(f)["segments"]
+        self._active_name = self._recover()
+        self._ids: dict[str, str] | None = None
+        active_path = os.path.join(directory, self._active_name)
+        terminate_last_line(active_path)
+        self._active = open(active_path, "a", encoding="utf-8")
+
+    def _recover(self) -> str:
+        # Reconcile the directory with the manifest after a crash mid-seal; returns the active segment.
+        listed = {segment["name"] for segment in self._sealed}
+        names = set(os.listdir(self.location))
+        orphans = []
+        for name in sorted(names):
+            match = _SEGMENT_NAME.fullmatch(name)
+            if match is None or name in listed:
+                continue
+            path = os.path.join(self.location, name)
+            if name + ".gz" in listed or (match.group(2) and name.removesuffix(".gz") in names):
+                # The other copy is either already sealed or the uncompressed source; this one is redundant.
+                os.remove(path)
+                if os.path.exists(path + ".ids"):
+                    os.remove(path + ".ids")
+                continue
+            orphans.append(name)
+        active = None
+        last_sealed = max((_segment_number(name) for name in listed), default=0)
+        if orphans and not orphans[-1].endswith(".gz") and _segment_number(orphans[-1]) > last_sealed:
+            active = orphans.pop()
+        if orphans:
+            for name in orphans:
+                self._sealed.append(_segment_entry(name, self._read(os.path.join(self.location, name))))
+            self._sealed.sort(key=lambda segment: _segment_number(segment["name"]))
+            self._write_manifest()
+        return active or self._next_name()
+
+    def _next_name(self) -> str:
+        number = max((_segment_number(segment["name"]) for segment in self._sealed), default=0) + 1
+        return f"segment-{number:06d}.jsonl"
+
+    def _write_manifest(self) -> None:
+        tmp_path = self._manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"segments": self._sealed}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._manifest_path)
+
+    def add(self, record: dict[str, Any]) -> str:
+        return self.add_many([record])[0]
+
+    def add_many(self, records: Iterable[dict[str, Any]]) -> list[str]:
+        records = list(records)
+        data = "".join(json.dumps(record, ensure_ascii=True) + "\n" for record in records)
+        with self._lock:
+            if self._active.tell() and self._active.tell() + len(data) > self.max_segment_bytes:
+                self._seal()
+            self._active.write(data)
+            self._active.flush()
+            if self._ids is not None:
+                self._ids.update((record["id"], self._active_name) for record in records)
+        return [record["id"] for record in records]
+
+    def _seal(self) -> None:
+        self._active.close()
+        path = os.path.join(self.location, self._active_name)
+        name = self._active_name
+        if self.compress:
+            name += ".gz"
+            with open(path, "rb") as source, gzip.open(os.path.join(self.location, name), "wb") as target:
+                shutil.copyfileobj(source, target)
+        records = list(self._read(path))
+        ids = [record["id"] for record in records]
+        self._write_ids(name, ids)
+        self._sealed.append(_segment_entry(name, records))
+        # List the sealed copy before removing the source, so a crash in between loses nothing.
+        self._write_manifest()
+        if self._ids is not None:
+            self._ids.update((record_id, name) for record_id in ids)
+        if self.compress:
+            os.remove(path)
+        self._active_name = self._next_name()
+        self._active = open(os.path.join(self.location, self._active_name), "a", encoding="utf-8")
+
+    def _write_ids(self, name: str, ids: list[str]) -> None:
+        path = os.path.join(self.location, name + ".ids")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write("".join(record_id + "\n" for record_id in ids))
+        os.replace(path + ".tmp", path)
+
+    def _segment_ids(self, name: str) -> list[str]:
+        path = os.path.join(self.location, name + ".ids")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read().split()
+        # Stores written before the sidecars existed, and adopted orphans, get theirs built once.
+        ids = [record["id"] for record in self._read(os.path.join(self.location, name))]
+        self._write_ids(name, ids)
+        return ids
+
+    def _id_index(self) -> dict[str, str]:
+        # Built on first lookup, so processes that only add records never pay for it.
+        if self._ids is None:
+            ids: dict[str, str] = {}
+            for segment in self._sealed:
+                ids.update((record_id, segment["name"]) for record_id in self._segment_ids(segment["name"]))
+            active_path = os.path.join(self.location, self._active_name)
+            ids.update((record["id"], self._active_name) for record in self._read(active_path))
+            self._ids = ids
+        return self._ids
+
+    def _read(self, path: str) -> Iterator[dict[str, Any]]:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def _candidates(
+        self, prompt_id: str | None, model: str | None, since: float | None, until: float | None
+    ) -> list[str]:
+        names = []
+        for segment in self._sealed:
+            if not segment["count"]:
+                continue
+            if prompt_id is not None and prompt_id not in segment["prompt_ids"]:
+                continue
+            if model is not None and model not in segment["models"]:
+                continue
+            if since is not None and segment["last_created_at"] < since:
+                continue
+            if until is not None and segment["first_created_at"] >= until:
+                continue
+            names.append(segment["name"])
+        names.append(self._active_name)
+        return [os.path.join(self.location, name) for name in names]
+
+    def _scan(
+        self,
+        prompt_id: str | None = None,
+        model: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        with self._lock:
+            self._active.flush()
+            paths = self._candidates(prompt_id, model, since, until)
+        for path in paths:
+            yield from self._read(path)
+
+    def get(self, record_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            self._active.flush()
+            name = self._id_index().get(record_id)
+        if name is None:
+            return None
+        for record in self._read(os.path.join(self.location, name)):
+            if record["id"] == record_id:
+                return record
+        return None
+
+    def query(
+        self,
+        *,
+        prompt_id: str | None = None,
+        model: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        matched = [
+            record
+            for record in self._scan(prompt_id, model, since, until)
+            if _matches(record, prompt_id, model, since, until)
+        ]
+        matched.sort(key=lambda record: record["created_at"])
+        return matched[:limit] if limit is not None else matched
+
+    def close(self) -> None:
+        with self._lock:
+            self._active.close()
+            self._lockfile.close()
+
+
+def open_result_store(location: str) -> ResultStore:
+    if location.startswith("sqlite:"):
+        return SQLiteResultStore(location.removeprefix("sqlite:"))
+    if location.startswith("jsonl:"):
+        return JSONLSegmentStore(location.removeprefix("jsonl:"))
+    if location.endswith((".sqlite", ".sqlite3", ".db")):
+        return SQLiteResultStore(location)
+    return JSONLSegmentStore(location)
+
+
+def import_output_files(directory: str, store: ResultStore, *, batch_size: int = 500) -> int:
+    imported = 0
+    batch: list[dict[str, Any]] = []
+    for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+        if not (entry.is_file() and entry.name.startswith("output-") and entry.name.endswith(".txt")):
+            continue
+        with open(entry.path, "r", encoding="utf-8") as f:
+            content = f.read()
+        if not content.startswith("PROMPT\n") or "\n\nOUTPUT\n" not in content:
+            continue
+        prompt, output = content.removeprefix("PROMPT\n").split("\n\nOUTPUT\n", 1)
+        record = new_record(
+            prompt,
+            output.removesuffix("\n"),
+            metadata={"source": entry.name},
+            clock=lambda: entry.stat().st_mtime,
+        )
+        batch.append(record)
+        if len(batch) >= batch_size:
+            imported += len(store.add_many(batch))
+            batch = []
+    if batch:
+        imported += len(store.add_many(batch))
+    return imported
+
+
+_STORE: ResultStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = open_result_store(os.getenv(STORE_ENV_VAR, DEFAULT_STORE))
+        return _STORE
+
+
+def set_result_store(store: ResultStore | None) -> ResultStore | None:
+    global _STORE
+    with _STORE_LOCK:
+        previous = _STORE
+        _STORE = store
+        return previous
+
+
+def close_result_store() -> None:
+    store = set_result_store(None)
+    if store is not None:
+        store.close()
+
+
+atexit.register(close_result_store)
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import atexit
+import bisect
+import contextvars
+import math
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+TELEMETRY_ENV_VAR = "PROMPT_PLAYGROUND_TELEMETRY"
+SPAN_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_FIELDS = {
+    "prompt_token_count": "prompt_tokens",
+    "candidates_token_count": "completion_tokens",
+    "total_token_count": "total_tokens",
+}
+
+_CURRENT_SPAN: contextvars.ContextVar[str | None] = contextvars.ContextVar("span", default=None)
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    name: str
+    started_at: float
+    duration_seconds: float
+    parent: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_seconds": self.duration_seconds,
+            "parent": self.parent,
+            **self.attributes,
+        }
+
+
+class Exporter(Protocol):
+    def export(self, record: SpanRecord) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class InMemoryExporter:
+    def __init__(self) -> None:
+        self.records: list[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def export(self, record: SpanRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return [record.name for record in self.records]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+
+    def close(self) -> None:
+        pass
+
+
+class JSONLExporter:
+    def __init__(self, log_dir: str, *, filename: str = "telemetry.jsonl") -> None:
+        from src.reliability.log_writer import RetryLogWriter
+
+        self._writer = RetryLogWriter(log_dir, filename=filename)
+        self.path = self._writer.path
+
+    def export(self, record: SpanRecord) -> None:
+        self._writer.write(record.to_dict())
+
+    def flush(self) -> None:
+        self._writer.flush()
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class PrometheusExporter:
+    def __init__(self, namespace: str = "prompt_playground") -> None:
+        self.namespace = namespace
+        self._spans: dict[str, list[float]] = {}
+        self._tokens: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def export(self, record: SpanRecord) -> None:
+        with self._lock:
+            series = self._spans.get(record.name)
+            if series is None:
+                # bucket counts, then +Inf, sum, count
+                series = self._spans[record.name] = [0.0] * (len(SPAN_BUCKETS) + 3)
+            series[bisect.bisect_left(SPAN_BUCKETS, record.duration_seconds)] += 1
+            series[-2] += record.duration_seconds
+            series[-1] += 1
+            model = str(record.attributes.get("model", ""))
+            for kind in TOKEN_FIELDS.values():
+                count = record.attributes.get(kind)
+                if isinstance(count, int):
+                    key = (model, kind.removesuffix("_tokens"))
+                    self._tokens[key] = self._tokens.get(key, 0) + count
+
+    def render(self) -> str:
+        span_metric = f"{self.namespace}_span_duration_seconds"
+        token_metric = f"{self.namespace}_tokens_total"
+        lines = [
+            f"# HELP {span_metric} Time spent in each instrumented stage.",
+            f"# TYPE {span_metric} histogram",
+        ]
+        with self._lock:
+            for name, series in sorted(self._spans.items()):
+                cumulative = 0.0
+                for bound, count in zip((*SPAN_BUCKETS, "+Inf"), series[: len(SPAN_BUCKETS) + 1]):
+                    cumulative += count
+                    le = bound if isinstance(bound, str) else f"{bound:g}"
+                    lines.append(f'{span_metric}_bucket{{span="{name}",le="{le}"}} {cumulative:g}')
+                lines.append(f'{span_metric}_sum{{span="{name}"}} {series[-2]:.6f}')
+                lines.append(f'{span_metric}_count{{span="{name}"}} {series[-1]:g}')
+            lines.append(f"# HELP {token_metric} Tokens reported by model usage metadata.")
+            lines.append(f"# TYPE {token_metric} counter")
+            for (model, kind), count in sorted(self._tokens.items()):
+                lines.append(f'{token_metric}{{model="{model}",kind="{kind}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(self.render())
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        pass
+
+
+class Telemetry:
+    def __init__(self, exporters: Iterable[Exporter]) -> None:
+        self.exporters = list(exporters)
+
+    def emit(self, record: SpanRecord) -> None:
+        for exporter in self.exporters:
+            exporter.export(record)
+
+    def close(self) -> None:
+        for exporter in self.exporters:
+            exporter.close()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("telemetry", "name", "attributes", "_parent", "_start", "_started_at", "_token")
+
+    def __init__(self, telemetry: Telemetry, name: str, attributes: dict[str, Any]) -> None:
+        self.telemetry = telemetry
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> Span:
+        self._parent = _CURRENT_SPAN.get()
+        self._token = _CURRENT_SPAN.set(self.name)
+        self._started_at = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        duration = time.perf_counter() - self._start
+        _CURRENT_SPAN.reset(self._token)
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.telemetry.emit(
+            SpanRecord(self.name, self._started_at, duration, self._parent, self.attributes)
+        )
+        return False
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+_TELEMETRY: Telemetry | None = None
+_TELEMETRY_LOCK = threading.Lock()
+
+
+def enabled() -> bool:
+    return _TELEMETRY is not None
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    telemetry = _TELEMETRY
+    if telemetry is None:
+        return _NOOP_SPAN
+    return Span(telemetry, name, attributes)
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    # Nearest-rank percentile, shared by the eval report and the benchmarks.
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+def usage_tokens(response: Any) -> dict[str, int]:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return {}
+    tokens = {}
+    for source, target in TOKEN_FIELDS.items():
+        value = getattr(usage, source, None)
+        if isinstance(value, int):
+            tokens[target] = value
+    return tokens
+
+
+def instrument_stream(chunks: Iterable[Any], name: str, **attributes: Any) -> Iterator[Any]:
+    telemetry = _TELEMETRY
+    if telemetry is None:
+        yield from chunks
+        return
+    started_at = time.time()
+    start = time.perf_counter()
+    count = 0
+    last = None
+    try:
+        for chunk in chunks:
+            if count == 0:
+                attributes["first_chunk_seconds"] = time.perf_counter() - start
+            count += 1
+            last = chunk
+            yield chunk
+    finally:
+        attributes.update(chunks=count, **usage_tokens(last))
+        telemetry.emit(
+            SpanRecord(name, started_at, time.perf_counter() - start, _CURRENT_SPAN.get(), attributes)
+        )
+
+
+async def ainstrument_stream(
+    chunks: AsyncIterator[Any], name: str, **attributes: Any
+) -> AsyncIterator[Any]:
+    telemetry = _TELEMETRY
+    if telemetry is None:
+        async for chunk in chunks:
+            yield chunk
+        return
+    started_at = time.time()
+    start = time.perf_counter()
+    count = 0
+    last = None
+    try:
+        async for chunk in chunks:
+            if count == 0:
+                attributes["first_chunk_seconds"] = time.perf_counter() - start
+            count += 1
+            last = chunk
+            yield chunk
+    finally:
+        attributes.update(chunks=count, **usage_tokens(last))
+        telemetry.emit(
+            SpanRecord(name, started_at, time.perf_counter() - start, _CURRENT_SPAN.get(), attributes)
+        )
+
+
+def configure_telemetry(*exporters: Exporter) -> Telemetry:
+    global _TELEMETRY
+    telemetry = Telemetry(exporters)
+    with _TELEMETRY_LOCK:
+        previous, _TELEMETRY = _TELEMETRY, telemetry
+    if previous is not None:
+        previous.close()
+    return telemetry
+
+
+def disable_telemetry() -> None:
+    global _TELEMETRY
+    with _TELEMETRY_LOCK:
+        previous, _TELEMETRY = _TELEMETRY, None
+    if previous is not None:
+        previous.close()
+
+
+def configure_from_env() -> Telemetry | None:
+    log_dir = os.getenv(TELEMETRY_ENV_VAR)
+    if not log_dir:
+        return None
+    return configure_telemetry(JSONLExporter(log_dir))
+
+
+atexit.register(disable_telemetry)
@@ -1,5 +1,44 @@
 """Deterministic tools and tool registry."""
 
-from .registry import get_tool, get_tools, tool_specs
+from __future__ import annotations
 
-__all__ = ["get_tool", "get_tools", "tool_specs"]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .registry import (
+        ToolRegistry,
+        get_batch_tool,
+        get_tool,
+        get_tool_registry,
+        get_tools,
+        register_tool,
+        tool_specs,
+        tool_stats,
+    )
+
+_LAZY_ATTRS: dict[str, str] = {
+    "ToolRegistry": ".registry",
+    "get_batch_tool": ".registry",
+    "get_tool": ".registry",
+    "get_tool_registry": ".registry",
+    "get_tools": ".registry",
+    "register_tool": ".registry",
+    "tool_specs": ".registry",
+    "tool_stats": ".registry",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import ast
+import math
 import operator
 import re
+from functools import lru_cache
 from typing import Any
 
 NAME = "calculator"
@@ -18,12 +20,33 @@ OUTPUT_SCHEMA = {
     "required": ["result"],
 }
 
+MAX_EXPRESSION_LENGTH = 512
+MAX_NODES = 256
+MAX_EXPONENT = 1024.0
+CACHE_SIZE = 4096
+
+_PERCENT_OF_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%\s*of\s*")
+_PERCENT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+
+_CONST = "const"
+_UNARY = "unary"
+_BINARY = "binary"
+
+Program = tuple[tuple[str, Any], ...]
+
+
+def _safe_pow(base: float, exponent: float) -> float:
+    if abs(exponent) > MAX_EXPONENT:
+        raise ValueError(f"Exponent too large: {exponent}")
+    return operator.pow(base, exponent)
+
+
 _OPERATORS: dict[type[ast.AST], Any] = {
     ast.Add: operator.add,
     ast.Sub: operator.sub,
     ast.Mult: operator.mul,
     ast.Div: operator.truediv,
-    ast.Pow: operator.pow,
+    ast.Pow: _safe_pow,
     ast.USub: operator.neg,
     ast.UAdd: operator.pos,
 }
@@ -31,35 +54,74 @@ _OPERATORS: dict[type[ast.AST], Any] = {
 
 def _normalize_expression(expression: str) -> str:
     normalized = expression.strip().lower()
-    normalized = re.sub(
-        r"(\d+(?:\.\d+)?)\s*%\s*of\s*",
-        r"(\1/100) * ",
-        normalized,
-    )
-    normalized = re.sub(
-        r"(\d+(?:\.\d+)?)\s*%",
-        r"(\1/100)",
-        normalized,
-    )
+    normalized = _PERCENT_OF_RE.sub(r"(\1/100) * ", normalized)
+    normalized = _PERCENT_RE.sub(r"(\1/100)", normalized)
     return normalized
 
 
-def _eval_node(node: ast.AST) -> float:
-    if isinstance(node, ast.Expression):
-        return _eval_node(node.body)
-    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-        return float(node.value)
-    if isinstance(node, ast.BinOp):
-        operator_fn = _OPERATORS.get(type(node.op))
-        if operator_fn is None:
-            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
-        return operator_fn(_eval_node(node.left), _eval_node(node.right))
-    if isinstance(node, ast.UnaryOp):
-        operator_fn = _OPERATORS.get(type(node.op))
-        if operator_fn is None:
-            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
-        return operator_fn(_eval_node(node.operand))
-    raise ValueError(f"Unsupported expression node: {type(node).__name__}")
+def _operator_for(node: ast.AST) -> Any:
+    operator_fn = _OPERATORS.get(type(node))
+    if operator_fn is None:
+        raise ValueError(f"Unsupported operator: {type(node).__name__}")
+    return operator_fn
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile(normalized: str) -> Program:
+    if len(normalized) > MAX_EXPRESSION_LENGTH:
+        raise ValueError("Expression is too long.")
+    tree = ast.parse(normalized, mode="eval")
+    program: list[tuple[str, Any]] = []
+    pending: list[tuple[ast.AST, bool]] = [(tree.body, False)]
+    nodes = 0
+    while pending:
+        node, expanded = pending.pop()
+        if expanded:
+            if isinstance(node, ast.BinOp):
+                program.append((_BINARY, _operator_for(node.op)))
+            else:
+                program.append((_UNARY, _operator_for(node.op)))
+            continue
+        nodes += 1
+        if nodes > MAX_NODES:
+            raise ValueError("Expression is too complex.")
+        if (
+            isinstance(node, ast.Constant)
+            and isinstance(node.value, (int, float))
+            and not isinstance(node.value, bool)
+        ):
+            program.append((_CONST, float(node.value)))
+        elif isinstance(node, ast.BinOp):
+            pending.append((node, True))
+            pending.append((node.right, False))
+            pending.append((node.left, False))
+        elif isinstance(node, ast.UnaryOp):
+            pending.append((node, True))
+            pending.append((node.operand, False))
+        else:
+            raise ValueError(f"Unsupported expression node: {type(node).__name__}")
+    return tuple(program)
+
+
+def _run(program: Program) -> float:
+    stack: list[Any] = []
+    for opcode, arg in program:
+        if opcode is _CONST:
+            stack.append(arg)
+        elif opcode is _UNARY:
+            stack.append(arg(stack.pop()))
+        else:
+            right = stack.pop()
+            stack.append(arg(stack.pop(), right))
+    result = stack.pop()
+    if not isinstance(result, float) or not math.isfinite(result):
+        raise ValueError(f"Result is not a finite real number: {result}")
+    return result
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _evaluate(normalized: str) -> float:
+    return _run(_compile(normalized))
 
 
 def calculate(expression: str) -> float:
@@ -67,7 +129,94 @@ def calculate(expression: str) -> float:
         raise ValueError("Expression cannot be empty.")
     normalized = _normalize_expression(expression)
     try:
-        parsed = ast.parse(normalized, mode="eval")
-        return _eval_node(parsed)
-    except (SyntaxError, ValueError, TypeError) as exc:
+        return _evaluate(normalized)
+    except (SyntaxError, ValueError, TypeError, ArithmeticError, RecursionError, MemoryError) as exc:
         raise ValueError(f"Invalid expression: {expression}") from exc
+
+
+def _shape(program: Program) -> Program:
+    return tuple((opcode, None if opcode is _CONST else arg) for opcode, arg in program)
+
+
+def _run_vectorized(program: Program, constants: list[list[float]]) -> tuple[Any, Any]:
+    import numpy as np
+
+    columns = iter(np.array(constants, dtype=np.float64).T)
+    size = len(constants)
+    invalid = np.zeros(size, dtype=bool)
+    stack: list[Any] = []
+    # Any divide/overflow/invalid step raises, and the caller reruns that group on the scalar path.
+    with np.errstate(divide="raise", over="raise", invalid="raise"):
+        for opcode, arg in program:
+            if opcode is _CONST:
+                stack.append(next(columns))
+            elif opcode is _UNARY:
+                stack.append(np.negative(stack.pop()) if arg is operator.neg else stack.pop())
+            else:
+                right = stack.pop()
+                left = stack.pop()
+                if arg is _safe_pow:
+                    too_large = np.abs(right) > MAX_EXPONENT
+                    invalid |= too_large
+                    stack.append(np.power(left, np.where(too_large, 0.0, right)))
+                else:
+                    stack.append(arg(left, right))
+    result = stack.pop()
+    return result, invalid | ~np.isfinite(result)
+
+
+def _numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def calculate_many(expressions: list[str], *, vectorize: bool = True) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = [{} for _ in expressions]
+    positions: dict[str, list[int]] = {}
+    for index, expression in enumerate(expressions):
+        if not expression or not expression.strip():
+            results[index] = {"error": "Expression cannot be empty."}
+            continue
+        positions.setdefault(_normalize_expression(expression), []).append(index)
+
+    def fail(normalized: str) -> None:
+        for index in positions[normalized]:
+            results[index] = {"error": f"Invalid expression: {expressions[index]}"}
+
+    def succeed(normalized: str, value: float) -> None:
+        for index in positions[normalized]:
+            results[index] = {"result": value}
+
+    groups: dict[Program, list[tuple[str, Program]]] = {}
+    for normalized in positions:
+        try:
+            program = _compile(normalized)
+        except (SyntaxError, ValueError, TypeError, RecursionError, MemoryError):
+            fail(normalized)
+            continue
+        groups.setdefault(_shape(program), []).append((normalized, program))
+
+    use_numpy = vectorize and _numpy_available()
+    for shape, members in groups.items():
+        if use_numpy and len(members) > 1:
+            constants = [[arg for opcode, arg in program if opcode is _CONST] for _, program in members]
+            try:
+                values, invalid = _run_vectorized(shape, constants)
+            except FloatingPointError:
+                pass
+            else:
+                for (normalized, _), value, bad in zip(members, values.tolist(), invalid.tolist()):
+                    if bad:
+                        fail(normalized)
+                    else:
+                        succeed(normalized, value)
+                continue
+        for normalized, _ in members:
+            try:
+                succeed(normalized, _evaluate(normalized))
+            except (ValueError, TypeError, ArithmeticError):
+                fail(normalized)
+    return results
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Iterable
+
+MAGIC = b"PPCORP1\x00"
+_HEADER = struct.Struct("<8sQ")
+_OFFSET = struct.Struct("<Q")
+_OFFSET_PAIR = struct.Struct("<QQQ")
+
+
+def write_corpus(documents: Iterable[dict[str, Any]], path: str | Path) -> int:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    offsets = array("Q", [0])
+    with tempfile.TemporaryFile(dir=path.parent) as data:
+        position = 0
+        for document in documents:
+            for field in ("snippet", "source"):
+                encoded = str(document[field]).encode("utf-8")
+                data.write(encoded)
+                position += len(encoded)
+                offsets.append(position)
+        count = (len(offsets) - 1) // 2
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as handle:
+            handle.write(_HEADER.pack(MAGIC, count))
+            handle.write(offsets.tobytes())
+            data.seek(0)
+            shutil.copyfileobj(data, handle)
+        os.replace(tmp_path, path)
+    return count
+
+
+class MappedCorpus:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._handle = open(self.path, "rb")
+        self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a packed corpus file: {self.path}")
+        self._count = count
+        self._offsets_start = _HEADER.size
+        self._data_start = self._offsets_start + (2 * count + 1) * _OFFSET.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> dict[str, str]:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        start, middle, end = _OFFSET_PAIR.unpack_from(
+            self._map, self._offsets_start + 2 * index * _OFFSET.size
+        )
+        base = self._data_start
+        return {
+            "snippet": self._map[base + start:base + middle].decode("utf-8"),
+            "source": self._map[base + middle:base + end].decode("utf-8"),
+        }
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+        self._handle.close()
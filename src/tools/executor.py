@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any
+
+from .registry import ToolRegistry, ToolRunner, error_payload, get_tool_registry
+
+DEFAULT_TIMEOUT = 10.0
+
+
+def none_payload() -> dict[str, Any]:
+    return {"tool_used": "none", "tool_results": None, "citations": []}
+
+
+def merge_payloads(payloads: list[dict[str, Any]]) -> dict[str, Any]:
+    used = [payload for payload in payloads if payload["tool_used"] != "none"]
+    if not used:
+        return none_payload()
+    if len(used) == 1:
+        return used[0]
+    tool_results: dict[str, Any] = {}
+    citations: list[dict[str, str]] = []
+    seen_sources: set[tuple[str, str]] = set()
+    for payload in used:
+        name = payload["tool_used"]
+        key = name
+        suffix = 2
+        while key in tool_results:
+            key = f"{name}_{suffix}"
+            suffix += 1
+        tool_results[key] = payload["tool_results"]
+        for citation in payload["citations"]:
+            marker = (citation["source"], citation["snippet"])
+            if marker not in seen_sources:
+                seen_sources.add(marker)
+                citations.append(citation)
+    return {"tool_used": used[0]["tool_used"], "tool_results": tool_results, "citations": citations}
+
+
+class ToolExecutor:
+    def __init__(
+        self,
+        runners: dict[str, ToolRunner] | None = None,
+        *,
+        registry: ToolRegistry | None = None,
+        max_workers: int = 8,
+        timeouts: dict[str, float] | None = None,
+        default_timeout: float = DEFAULT_TIMEOUT,
+        cache_size: int = 1024,
+    ) -> None:
+        self.runners = dict(runners or {})
+        self.registry = registry
+        self.timeouts = dict(timeouts or {})
+        self.default_timeout = default_timeout
+        self.cache_size = cache_size
+        self.max_workers = max_workers
+        self._pool = self._new_pool()
+        self._cache: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _new_pool(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool")
+
+    def _retire_pool(self, pool: ThreadPoolExecutor) -> None:
+        # A timed-out tool keeps its worker thread; move later calls to a fresh pool
+        # so a few hung tools cannot starve everything else.
+        with self._lock:
+            if self._pool is not pool:
+                return
+            self._pool = self._new_pool()
+        pool.shutdown(wait=False)
+
+    def _cached(self, key: tuple[str, str]) -> dict[str, Any] | None:
+        with self._lock:
+            payload = self._cache.get(key)
+            if payload is None:
+                return None
+            self._cache.move_to_end(key)
+        return copy.deepcopy(payload)
+
+    def _store(self, key: tuple[str, str], payload: dict[str, Any]) -> None:
+        if self.cache_size <= 0:
+            return
+        payload = copy.deepcopy(payload)
+        with self._lock:
+            self._cache[key] = payload
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _spawn(self, runner: ToolRunner, tool_input: str) -> tuple[Future, ThreadPoolExecutor]:
+        while True:
+            with self._lock:
+                pool = self._pool
+            try:
+                return pool.submit(runner, tool_input), pool
+            except RuntimeError:
+                # Retired by another caller between the read and the submit.
+                if pool is self._pool:
+                    raise
+
+    def _submit(
+        self, route: dict[str, str]
+    ) -> tuple[tuple[str, str], dict[str, Any] | tuple[Future, ThreadPoolExecutor]]:
+        key = (route["tool"], route["tool_input"])
+        if route["tool"] == "none":
+            return key, none_payload()
+        runner = self.runners.get(route["tool"])
+        if runner is None:
+            runner = (self.registry or get_tool_registry()).runner(route["tool"])
+        if runner is None:
+            return key, error_payload(route["tool"], f"Unknown tool: {route['tool']}")
+        cached = self._cached(key)
+        if cached is not None:
+            return key, cached
+        return key, self._spawn(runner, route["tool_input"])
+
+    def run_many(self, routes: list[dict[str, str]]) -> list[dict[str, Any]]:
+        started = time.monotonic()
+        submitted = [self._submit(route) for route in routes]
+        payloads: list[dict[str, Any]] = []
+        for (tool, tool_input), pending in submitted:
+            if isinstance(pending, dict):
+                payloads.append(pending)
+                continue
+            pending, pool = pending
+            timeout = self.timeouts.get(tool, self.default_timeout)
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+            try:
+                payload = pending.result(timeout=remaining)
+            except FutureTimeoutError:
+                if not pending.cancel():
+                    self._retire_pool(pool)
+                payloads.append(error_payload(tool, f"Tool '{tool}' timed out after {timeout:g}s"))
+                continue
+            except Exception as exc:
+                payloads.append(error_payload(tool, f"Tool '{tool}' failed: {exc}"))
+                continue
+            self._store((tool, tool_input), payload)
+            payloads.append(payload)
+        return payloads
+
+    def run(self, routes: list[dict[str, str]]) -> dict[str, Any]:
+        return merge_payloads(self.run_many(routes))
+
+    def shutdown(self, *, cancel_pending: bool = True) -> None:
+        with self._lock:
+            pool = self._pool
+        pool.shutdown(wait=False, cancel_futures=cancel_pending)
+
+
+_EXECUTOR: ToolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_tool_executor() -> ToolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ToolExecutor()
+        return _EXECUTOR
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from src.schemas import ToolRoute
+
+from . import calculator
+
+DEFAULT_THRESHOLD = 0.8
+
+_QUESTION_PREFIX_RE = re.compile(
+    r"^(?:please\s+)?(?:what\s+is|what's|whats|calculate|compute|evaluate|solve|how\s+much\s+is)\s+",
+    re.IGNORECASE,
+)
+_TRAILING_RE = re.compile(r"[\s?=.!]+$")
+_WORD_OPERATORS = (
+    (re.compile(r"\bdivided\s+by\b", re.IGNORECASE), "/"),
+    (re.compile(r"\bmultiplied\s+by\b", re.IGNORECASE), "*"),
+    (re.compile(r"\btimes\b", re.IGNORECASE), "*"),
+    (re.compile(r"\bplus\b", re.IGNORECASE), "+"),
+    (re.compile(r"\bminus\b", re.IGNORECASE), "-"),
+    (re.compile("×"), "*"),
+    (re.compile("÷"), "/"),
+)
+_MATH_SPAN_RE = re.compile(r"[\d(][\d\s.+\-*/()%]*(?:\bof\s+[\d.]+)?")
+_HAS_OPERATOR_RE = re.compile(r"\d\s*%|[+\-*/]|\bof\b")
+_SEARCH_RE = re.compile(
+    r"\b(?:latest|recent(?:ly)?|news|current(?:ly)?|today|this\s+year|statistics?|stats|"
+    r"figures?|according\s+to|sources?|cite|citations?)\b",
+    re.IGNORECASE,
+)
+_SMALL_TALK_RE = re.compile(
+    r"^(?:hi|hello|hey|thanks|thank\s+you|good\s+(?:morning|afternoon|evening)|bye)\b[\s!.,]*$",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class FastRoute:
+    route: ToolRoute
+    confidence: float
+    rule: str
+
+
+def _expression_candidate(text: str) -> str:
+    candidate = _QUESTION_PREFIX_RE.sub("", text.strip())
+    for pattern, symbol in _WORD_OPERATORS:
+        candidate = pattern.sub(symbol, candidate)
+    return _TRAILING_RE.sub("", candidate).strip()
+
+
+def _parses(expression: str) -> bool:
+    if not _HAS_OPERATOR_RE.search(expression):
+        return False
+    try:
+        calculator._compile(calculator._normalize_expression(expression))
+    except (SyntaxError, ValueError, TypeError, RecursionError, MemoryError):
+        return False
+    return True
+
+
+def _math_span(text: str) -> str | None:
+    spans = [span.strip() for span in _MATH_SPAN_RE.findall(text)]
+    for span in sorted(spans, key=len, reverse=True):
+        if _parses(span):
+            return span
+    return None
+
+
+def _route(tool: str, tool_input: str, confidence: float, rule: str) -> FastRoute:
+    return FastRoute(ToolRoute(tool=tool, tool_input=tool_input), confidence, rule)
+
+
+def classify(question: str) -> FastRoute | None:
+    text = question.strip()
+    if not text:
+        return None
+    if _SMALL_TALK_RE.match(text):
+        return _route("none", "", 0.9, "small_talk")
+    expression = _expression_candidate(text)
+    if _parses(expression):
+        return _route("calculator", expression, 0.95, "expression")
+    # One keyword is weak evidence ("Explain the sources of inflation"), so it stays below the default
+    # threshold; two distinct ones ("latest statistics") are enough to skip the LLM router.
+    keywords = {" ".join(match.lower().split()) for match in _SEARCH_RE.findall(text)}
+    if len(keywords) >= 2:
+        return _route("search", text, 0.85, "search_keywords")
+    span = _math_span(expression)
+    if span is not None:
+        return _route("calculator", span, 0.6, "embedded_expression")
+    if keywords:
+        return _route("search", text, 0.5, "search_keyword")
+    return None
+
+
+class FastRouter:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD) -> None:
+        self.threshold = threshold
+        self._calls = 0
+        self._hits: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def route(self, question: str) -> ToolRoute | None:
+        match = classify(question)
+        confident = match is not None and match.confidence >= self.threshold
+        with self._lock:
+            self._calls += 1
+            if confident:
+                self._hits[match.rule] = self._hits.get(match.rule, 0) + 1
+        return match.route if confident else None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            hits = sum(self._hits.values())
+            return {
+                "threshold": self.threshold,
+                "calls": self._calls,
+                "hits": hits,
+                "fallbacks": self._calls - hits,
+                "hit_rate": hits / self._calls if self._calls else 0.0,
+                "hits_by_rule": dict(self._hits),
+            }
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import os
+import threading
 from typing import Any
 
+from .search_index import SearchIndex
+
 NAME = "search"
-DESCRIPTION = "Deterministic stub search over a small local dataset."
+DESCRIPTION = "Deterministic BM25 search over a local corpus."
+INDEX_ENV_VAR = "MINI_SEARCH_INDEX"
+DEFAULT_TOP_K = 5
 INPUT_SCHEMA = {
     "type": "object",
     "properties": {"query": {"type": "string"}},
@@ -46,15 +52,38 @@ _DATASET: list[dict[str, Any]] = [
 ]
 
 
-def mini_search(query: str) -> list[dict[str, str]]:
+_INDEX: SearchIndex | None = None
+_INDEX_LOCK = threading.Lock()
+
+
+def _load_default_index() -> SearchIndex:
+    index_path = os.getenv(INDEX_ENV_VAR)
+    if index_path:
+        return SearchIndex.load(index_path)
+    index = SearchIndex()
+    index.add_documents(_DATASET)
+    return index
+
+
+def get_search_index() -> SearchIndex:
+    global _INDEX
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                _INDEX = _load_default_index()
+    return _INDEX
+
+
+def set_search_index(index: SearchIndex | None) -> None:
+    global _INDEX
+    with _INDEX_LOCK:
+        _INDEX = index
+
+
+def mini_search(query: str, k: int = DEFAULT_TOP_K) -> list[dict[str, str]]:
     if not query or not query.strip():
         return []
-    tokens = query.lower()
-    results: list[dict[str, str]] = []
-    for entry in _DATASET:
-        keywords = entry["keywords"]
-        if all(keyword in tokens for keyword in keywords):
-            results.append(
-                {"snippet": entry["snippet"], "source": entry["source"]}
-            )
-    return results
+    return [
+        {"snippet": hit["snippet"], "source": hit["source"]}
+        for hit in get_search_index().search(query, k)
+    ]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+MAGIC = b"PPPOST1\x00"
+_HEADER = struct.Struct("<8sQQQ")
+_OFFSET = struct.Struct("<Q")
+_OFFSET_PAIR = struct.Struct("<QQ")
+_LENGTH = struct.Struct("<I")
+
+
+def _pad(handle: object, position: int) -> int:
+    padding = -position % 8
+    handle.write(b"\x00" * padding)
+    return position + padding
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+# Layout: header, doc lengths, term and postings offset tables, sorted UTF-8 terms, then
+# (doc_id, tf) uint32 pairs. Lookups binary-search the mmapped terms, so opening parses nothing.
+def write_postings(
+    terms: Iterable[tuple[str, array]],
+    doc_lengths: Iterable[int],
+    path: str | Path,
+) -> int:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lengths = array("I", doc_lengths)
+    term_offsets = array("Q", [0])
+    posting_offsets = array("Q", [0])
+    with tempfile.TemporaryFile(dir=path.parent) as names, tempfile.TemporaryFile(dir=path.parent) as data:
+        for term, pairs in terms:
+            encoded = term.encode("utf-8")
+            names.write(encoded)
+            term_offsets.append(term_offsets[-1] + len(encoded))
+            data.write(_little_endian(pairs))
+            posting_offsets.append(posting_offsets[-1] + len(pairs) * 4)
+        count = len(term_offsets) - 1
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as handle:
+            handle.write(_HEADER.pack(MAGIC, count, len(lengths), sum(lengths)))
+            position = _pad(handle, _HEADER.size + handle.write(_little_endian(lengths)))
+            handle.write(_little_endian(term_offsets))
+            handle.write(_little_endian(posting_offsets))
+            names.seek(0)
+            shutil.copyfileobj(names, handle)
+            position += 2 * (count + 1) * _OFFSET.size + term_offsets[-1]
+            _pad(handle, position)
+            data.seek(0)
+            shutil.copyfileobj(data, handle)
+        os.replace(tmp_path, path)
+    return count
+
+
+class MappedPostings:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._handle = open(self.path, "rb")
+        self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, doc_count, total_length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a postings file: {self.path}")
+        self.term_count = count
+        self.doc_count = doc_count
+        self.total_length = total_length
+        self._lengths_start = _HEADER.size
+        lengths_end = self._lengths_start + doc_count * _LENGTH.size
+        self._term_offsets_start = lengths_end + (-lengths_end % 8)
+        self._posting_offsets_start = self._term_offsets_start + (count + 1) * _OFFSET.size
+        self._names_start = self._posting_offsets_start + (count + 1) * _OFFSET.size
+        (names_size,) = _OFFSET.unpack_from(self._map, self._term_offsets_start + count * _OFFSET.size)
+        names_end = self._names_start + names_size
+        self._data_start = names_end + (-names_end % 8)
+
+    def doc_length(self, doc_id: int) -> int:
+        return _LENGTH.unpack_from(self._map, self._lengths_start + doc_id * _LENGTH.size)[0]
+
+    def iter_doc_lengths(self) -> Iterator[int]:
+        for doc_id in range(self.doc_count):
+            yield self.doc_length(doc_id)
+
+    def _term(self, position: int) -> bytes:
+        start, end = _OFFSET_PAIR.unpack_from(self._map, self._term_offsets_start + position * _OFFSET.size)
+        return self._map[self._names_start + start:self._names_start + end]
+
+    def _postings(self, position: int) -> array:
+        start, end = _OFFSET_PAIR.unpack_from(
+            self._map, self._posting_offsets_start + position * _OFFSET.size
+        )
+        pairs = array("I", self._map[self._data_start + start:self._data_start + end])
+        if sys.byteorder != "little":
+            pairs.byteswap()
+        return pairs
+
+    def get(self, term: str) -> array | None:
+        target = term.encode("utf-8")
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.term_count and self._term(low) == target:
+            return self._postings(low)
+        return None
+
+    def items(self) -> Iterator[tuple[str, array]]:
+        for position in range(self.term_count):
+            yield self._term(position).decode("utf-8"), self._postings(position)
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+        self._handle.close()
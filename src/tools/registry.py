@@ -1,12 +1,23 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
-
-from langchain_core.tools import Tool
+import bisect
+import threading
+import time
+import warnings
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
 
 from . import calculator, mini_search
 
+if TYPE_CHECKING:
+    from langchain_core.tools import Tool
+
+ENTRY_POINT_GROUP = "prompt_playground.tools"
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+ToolRunner = Callable[[str], dict[str, Any]]
+BatchFunc = Callable[[list[str]], list[dict[str, Any]]]
+
 
 @dataclass(frozen=True)
 class ToolSpec:
@@ -16,43 +27,277 @@ class ToolSpec:
     output_schema: dict[str, Any]
 
 
-_TOOL_SPECS = [
-    ToolSpec(
-        name=calculator.NAME,
-        description=calculator.DESCRIPTION,
-        input_schema=calculator.INPUT_SCHEMA,
-        output_schema=calculator.OUTPUT_SCHEMA,
-    ),
-    ToolSpec(
-        name=mini_search.NAME,
-        description=mini_search.DESCRIPTION,
-        input_schema=mini_search.INPUT_SCHEMA,
-        output_schema=mini_search.OUTPUT_SCHEMA,
-    ),
-]
+@dataclass(frozen=True)
+class RegisteredTool:
+    spec: ToolSpec
+    func: Callable[[str], Any]
+    runner: ToolRunner
+    batch: BatchFunc | None = None
 
 
-def tool_specs() -> list[ToolSpec]:
-    return list(_TOOL_SPECS)
+@dataclass
+class ToolStats:
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
 
+    def observe(self, seconds: float, *, error: bool) -> None:
+        self.calls += 1
+        self.errors += int(error)
+        self.total_seconds += seconds
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
 
-def get_tools() -> list[Tool]:
-    return [
-        Tool(
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"le_{bound:g}" for bound in LATENCY_BUCKETS] + ["le_inf"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_seconds": self.total_seconds / self.calls if self.calls else 0.0,
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+def error_payload(tool: str, message: str) -> dict[str, Any]:
+    return {"tool_used": tool, "tool_results": {"error": message}, "citations": []}
+
+
+def result_runner(name: str, func: Callable[[str], Any]) -> ToolRunner:
+    def run(tool_input: str) -> dict[str, Any]:
+        try:
+            result = func(tool_input)
+        except ValueError as exc:
+            return error_payload(name, str(exc))
+        return {"tool_used": name, "tool_results": {"result": result}, "citations": []}
+
+    return run
+
+
+def run_search(tool_input: str) -> dict[str, Any]:
+    results = mini_search.mini_search(tool_input)
+    citations = [
+        {"source": item["source"], "snippet": item["snippet"]}
+        for item in results
+    ]
+    return {
+        "tool_used": mini_search.NAME,
+        "tool_results": {"results": results},
+        "citations": citations,
+    }
+
+
+class ToolRegistry:
+    def __init__(self) -> None:
+        self._entries: dict[str, RegisteredTool] = {}
+        self._tools: dict[str, Tool] = {}
+        self._stats: dict[str, ToolStats] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def register(
+        self,
+        spec: ToolSpec,
+        func: Callable[[str], Any],
+        *,
+        runner: ToolRunner | None = None,
+        batch: BatchFunc | None = None,
+        replace: bool = False,
+    ) -> RegisteredTool:
+        if spec.name == "none":
+            raise ValueError("'none' is reserved for routes without a tool")
+        entry = RegisteredTool(
+            spec=spec,
+            func=func,
+            runner=runner or result_runner(spec.name, func),
+            batch=batch,
+        )
+        with self._lock:
+            if spec.name in self._entries and not replace:
+                raise ValueError(f"Tool already registered: {spec.name}")
+            self._entries[spec.name] = entry
+            self._tools.pop(spec.name, None)
+            self._stats.setdefault(spec.name, ToolStats())
+        return entry
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._entries.pop(name, None)
+            self._tools.pop(name, None)
+            self._stats.pop(name, None)
+
+    def load_plugins(self, group: str = ENTRY_POINT_GROUP) -> list[str]:
+        from importlib import metadata
+
+        loaded = []
+        for entry_point in metadata.entry_points(group=group):
+            try:
+                target = entry_point.load()
+                if isinstance(target, RegisteredTool):
+                    self.register(target.spec, target.func, runner=target.runner, batch=target.batch)
+                elif callable(target):
+                    target(self)
+            except Exception as exc:
+                warnings.warn(
+                    f"Skipping tool plugin {entry_point.name!r}: {type(exc).__name__}: {exc}",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+                continue
+            loaded.append(entry_point.name)
+        return loaded
+
+    def names(self) -> list[str]:
+        return list(self._entries)
+
+    def get(self, name: str) -> RegisteredTool | None:
+        return self._entries.get(name)
+
+    def specs(self) -> list[ToolSpec]:
+        return [entry.spec for entry in self._entries.values()]
+
+    def tool(self, name: str) -> Tool | None:
+        tool = self._tools.get(name)
+        if tool is not None:
+            return tool
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        from langchain_core.tools import Tool
+
+        with self._lock:
+            tool = self._tools.get(name)
+            if tool is None:
+                tool = Tool(name=name, description=entry.spec.description, func=entry.func)
+                self._tools[name] = tool
+        return tool
+
+    def tools(self) -> list[Tool]:
+        return [self.tool(name) for name in self.names()]
+
+    def runner(self, name: str) -> ToolRunner | None:
+        if name not in self._entries:
+            return None
+        return lambda tool_input: self.invoke(name, tool_input)
+
+    def invoke(self, name: str, tool_input: str) -> dict[str, Any]:
+        entry = self._entries.get(name)
+        if entry is None:
+            return error_payload(name, f"Unknown tool: {name}")
+        start = time.perf_counter()
+        failed = True
+        try:
+            payload = entry.runner(tool_input)
+            results = payload.get("tool_results")
+            failed = isinstance(results, dict) and "error" in results
+            return payload
+        finally:
+            self.observe(name, time.perf_counter() - start, error=failed)
+
+    def observe(self, name: str, seconds: float, *, error: bool = False) -> None:
+        with self._lock:
+            self._stats.setdefault(name, ToolStats()).observe(seconds, error=error)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {name: ToolStats() for name in self._entries}
+
+
+def _register_builtins(registry: ToolRegistry) -> None:
+    registry.register(
+        ToolSpec(
             name=calculator.NAME,
             description=calculator.DESCRIPTION,
-            func=calculator.calculate,
+            input_schema=calculator.INPUT_SCHEMA,
+            output_schema=calculator.OUTPUT_SCHEMA,
         ),
-        Tool(
+        calculator.calculate,
+        batch=calculator.calculate_many,
+    )
+    registry.register(
+        ToolSpec(
             name=mini_search.NAME,
             description=mini_search.DESCRIPTION,
-            func=mini_search.mini_search,
+            input_schema=mini_search.INPUT_SCHEMA,
+            output_schema=mini_search.OUTPUT_SCHEMA,
         ),
-    ]
+        mini_search.mini_search,
+        runner=run_search,
+    )
+
+
+_REGISTRY: ToolRegistry | None = None
+_LOADING: ToolRegistry | None = None
+_REGISTRY_LOCK = threading.RLock()
+
+
+def get_tool_registry() -> ToolRegistry:
+    global _REGISTRY, _LOADING
+    if _REGISTRY is not None:
+        return _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is not None:
+            return _REGISTRY
+        if _LOADING is not None:
+            # A plugin registering itself (e.g. via @register_tool) while we load it.
+            return _LOADING
+        registry = ToolRegistry()
+        _register_builtins(registry)
+        _LOADING = registry
+        try:
+            registry.load_plugins()
+        finally:
+            _LOADING = None
+        # Published only once plugins are in, so the lock-free path never sees a partial registry.
+        _REGISTRY = registry
+        return registry
+
+
+def register_tool(
+    name: str,
+    description: str,
+    *,
+    input_schema: dict[str, Any] | None = None,
+    output_schema: dict[str, Any] | None = None,
+    runner: ToolRunner | None = None,
+    batch: BatchFunc | None = None,
+    registry: ToolRegistry | None = None,
+) -> Callable[[Callable[[str], Any]], Callable[[str], Any]]:
+    spec = ToolSpec(
+        name=name,
+        description=description,
+        input_schema=input_schema or {"type": "object", "properties": {"input": {"type": "string"}}},
+        output_schema=output_schema or {"type": "object"},
+    )
+
+    def decorator(func: Callable[[str], Any]) -> Callable[[str], Any]:
+        (registry or get_tool_registry()).register(spec, func, runner=runner, batch=batch)
+        return func
+
+    return decorator
+
+
+def tool_specs() -> list[ToolSpec]:
+    return get_tool_registry().specs()
+
+
+def get_tools() -> list[Tool]:
+    return get_tool_registry().tools()
 
 
 def get_tool(name: str) -> Tool | None:
-    for tool in get_tools():
-        if tool.name == name:
-            return tool
-    return None
+    return get_tool_registry().tool(name)
+
+
+def get_batch_tool(name: str) -> BatchFunc | None:
+    entry = get_tool_registry().get(name)
+    return entry.batch if entry is not None else None
+
+
+def tool_stats() -> dict[str, dict[str, Any]]:
+    return get_tool_registry().stats()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import re
+from array import array
+from itertools import chain
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+from .corpus import MappedCorpus, write_corpus
+from .postings import MappedPostings, write_postings
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    {
+        "a", "about", "an", "and", "are", "as", "at", "be", "by", "do", "does",
+        "for", "from", "how", "in", "is", "it", "its", "of", "on", "or", "that",
+        "the", "this", "to", "was", "were", "what", "which", "who", "with",
+    }
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _document_text(document: dict[str, Any]) -> str:
+    keywords = document.get("keywords") or []
+    return " ".join([*keywords, document.get("snippet", "")])
+
+
+class SearchIndex:
+    def __init__(self, *, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._store: Sequence[dict[str, str]] = []
+        self._disk: MappedPostings | None = None
+        self._added: list[dict[str, str]] = []
+        self._postings: dict[str, dict[int, int]] = {}
+        self._doc_lengths: list[int] = []
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return self._disk_docs + len(self._doc_lengths)
+
+    @property
+    def _disk_docs(self) -> int:
+        return self._disk.doc_count if self._disk is not None else 0
+
+    def _index_tokens(self, doc_id: int, tokens: list[str]) -> None:
+        counts: dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            self._postings.setdefault(token, {})[doc_id] = count
+        self._doc_lengths.append(len(tokens))
+        self._total_length += len(tokens)
+
+    def add_document(self, document: dict[str, Any]) -> int:
+        doc_id = len(self)
+        self._added.append({"snippet": document["snippet"], "source": document["source"]})
+        self._index_tokens(doc_id, tokenize(_document_text(document)))
+        return doc_id
+
+    def add_documents(self, documents: Iterable[dict[str, Any]]) -> int:
+        count = 0
+        for document in documents:
+            self.add_document(document)
+            count += 1
+        return count
+
+    def document(self, doc_id: int) -> dict[str, str]:
+        stored = len(self._store)
+        if doc_id < stored:
+            return self._store[doc_id]
+        return self._added[doc_id - stored]
+
+    def iter_documents(self) -> Iterator[dict[str, str]]:
+        for doc_id in range(len(self)):
+            yield self.document(doc_id)
+
+    def _doc_length(self, doc_id: int) -> int:
+        if self._disk is not None and doc_id < self._disk.doc_count:
+            return self._disk.doc_length(doc_id)
+        return self._doc_lengths[doc_id - self._disk_docs]
+
+    def _term_postings(self, term: str) -> list[tuple[int, int]]:
+        postings: list[tuple[int, int]] = []
+        if self._disk is not None:
+            pairs = self._disk.get(term)
+            if pairs is not None:
+                postings.extend(zip(pairs[::2], pairs[1::2]))
+        postings.extend(self._postings.get(term, {}).items())
+        return postings
+
+    def search(self, query: str, k: int = 5) -> list[dict[str, Any]]:
+        terms = set(tokenize(query))
+        total_docs = len(self)
+        if not terms or not total_docs:
+            return []
+        total_length = self._total_length + (self._disk.total_length if self._disk is not None else 0)
+        avg_length = total_length / total_docs or 1.0
+        scores: dict[int, float] = {}
+        for term in terms:
+            postings = self._term_postings(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._doc_length(doc_id) / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        top = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [
+            {**self.document(doc_id), "score": round(score, 6)}
+            for doc_id, score in top
+        ]
+
+    def _merged_postings(self) -> Iterator[tuple[str, array]]:
+        disk = self._disk.items() if self._disk is not None else iter(())
+        added = iter(sorted(self._postings.items()))
+        disk_item, added_item = next(disk, None), next(added, None)
+        while disk_item is not None or added_item is not None:
+            if added_item is None or (disk_item is not None and disk_item[0] < added_item[0]):
+                yield disk_item
+                disk_item = next(disk, None)
+                continue
+            term, postings = added_item
+            pairs = array("I")
+            if disk_item is not None and disk_item[0] == term:
+                pairs = disk_item[1]
+                disk_item = next(disk, None)
+            for doc_id, tf in postings.items():
+                pairs.extend((doc_id, tf))
+            yield term, pairs
+            added_item = next(added, None)
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        corpus_path = path.with_name(path.name + ".corpus")
+        postings_path = path.with_name(path.name + ".postings")
+        write_corpus(self.iter_documents(), corpus_path)
+        disk_lengths = self._disk.iter_doc_lengths() if self._disk is not None else iter(())
+        write_postings(self._merged_postings(), chain(disk_lengths, self._doc_lengths), postings_path)
+        payload = {"k1": self.k1, "b": self.b, "corpus": corpus_path.name, "postings": postings_path.name}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=True, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        self.close()
+        self._store = MappedCorpus(corpus_path)
+        self._disk = MappedPostings(postings_path)
+        self._added = []
+        self._postings = {}
+        self._doc_lengths = []
+        self._total_length = 0
+
+    @classmethod
+    def load(cls, path: str | Path) -> SearchIndex:
+        path = Path(path)
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        index = cls(k1=payload["k1"], b=payload["b"])
+        index._store = MappedCorpus(path.with_name(payload["corpus"]))
+        if isinstance(payload["postings"], str):
+            index._disk = MappedPostings(path.with_name(payload["postings"]))
+            return index
+        # Indexes saved before the postings file existed inline everything; the next save converts them.
+        index._doc_lengths = payload["doc_lengths"]
+        index._total_length = sum(index._doc_lengths)
+        index._postings = {
+            term: {doc_id: tf for doc_id, tf in postings}
+            for term, postings in payload["postings"].items()
+        }
+        return index
+
+    def close(self) -> None:
+        if isinstance(self._store, MappedCorpus):
+            self._store.close()
+        if self._disk is not None:
+            self._disk.close()
+
+
+def iter_corpus(path: str | Path) -> Iterator[dict[str, Any]]:
+    path = Path(path)
+    if path.is_dir():
+        for child in sorted(path.iterdir()):
+            if child.suffix == ".jsonl":
+                yield from iter_corpus(child)
+            elif child.suffix == ".txt":
+                yield {
+                    "snippet": child.read_text(encoding="utf-8").strip(),
+                    "source": f"file:{child.name}",
+                }
+        return
+    with open(path, "r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if "snippet" not in row or "source" not in row:
+                raise ValueError(f"{path}:{line_number}: corpus rows need 'snippet' and 'source'")
+            yield row
+
+
+def build_index(path: str | Path) -> SearchIndex:
+    index = SearchIndex()
+    index.add_documents(iter_corpus(path))
+    return index
@@ -0,0 +1,36 @@
+import unittest
+
+from benchmarks.chains import compare, percentile, run_suite
+
+
+class TestChainBenchmarks(unittest.TestCase):
+    def test_suite_covers_every_chain(self) -> None:
+        report = run_suite(requests=4, concurrency=(1, 2))
+        scenarios = {row["scenario"] for row in report["results"]}
+        self.assertEqual(
+            scenarios,
+            {
+                "simple_chain",
+                "with_history_chain",
+                "planner_executor_chain",
+                "rag_ready_chain",
+                "tool_aware_chain",
+                "retry_logging",
+            },
+        )
+        row = report["results"][0]
+        self.assertLessEqual(row["p50_ms"], row["p99_ms"])
+        self.assertGreater(row["throughput_rps"], 0)
+        self.assertTrue(all(row["alloc_peak_kb"] >= 0 for row in report["results"]))
+
+    def test_compare_flags_regressions(self) -> None:
+        baseline = {"results": [{"scenario": "s", "concurrency": 1, "p95_ms": 1.0, "throughput_rps": 100.0}]}
+        slower = {"results": [{"scenario": "s", "concurrency": 1, "p95_ms": 2.0, "throughput_rps": 50.0}]}
+        self.assertEqual(len(compare(slower, baseline)), 2)
+        self.assertEqual(compare(baseline, baseline), [])
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 50), 2.0)
+        self.assertEqual(percentile([float(n) for n in range(100)], 95), 94.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from langchain_core.runnables import RunnableLambda
+
+from langchain.lc_prompts import gemini_llm, simple_chain
+from langchain.lc_prompts.caching import cached_llm, llm_model_name, llm_temperature
+from src.llm import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend, cache_key
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_key_depends_on_prompt_version(self) -> None:
+        first = cache_key("m", "prompt", temperature=0.0, prompt_version="v1")
+        second = cache_key("m", "prompt", temperature=0.0, prompt_version="v2")
+        self.assertNotEqual(first, second)
+        self.assertEqual(first, cache_key("m", "prompt", temperature=0.0, prompt_version="v1"))
+
+    def test_memory_backend_evicts_lru_and_expired(self) -> None:
+        clock = _Clock()
+        backend = MemoryCacheBackend(max_entries=2, ttl_seconds=10, clock=clock)
+        backend.set("a", "1")
+        backend.set("b", "2")
+        backend.get("a")
+        backend.set("c", "3")
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), "1")
+        clock.now = 11
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.evictions, 2)
+
+    def test_sqlite_backend_persists(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "cache.sqlite")
+            backend = SQLiteCacheBackend(path, max_entries=1)
+            backend.set("a", "1")
+            backend.set("b", "2")
+            backend.close()
+
+            reopened = SQLiteCacheBackend(path)
+            self.assertIsNone(reopened.get("a"))
+            self.assertEqual(reopened.get("b"), "2")
+            reopened.close()
+
+    def test_sqlite_hits_defer_access_time_writes(self) -> None:
+        clock = _Clock()
+        with TemporaryDirectory() as tmp_dir:
+            backend = SQLiteCacheBackend(os.path.join(tmp_dir, "cache.sqlite"), max_entries=2, clock=clock)
+            backend.set("a", "1")
+            clock.now = 1
+            backend.set("b", "2")
+            clock.now = 2
+            changes = backend._conn.total_changes
+            self.assertEqual(backend.get("a"), "1")
+            self.assertEqual(backend._conn.total_changes, changes)
+            clock.now = 3
+            backend.set("c", "3")
+            self.assertIsNone(backend.get("b"))
+            self.assertEqual(backend.get("a"), "1")
+            backend.close()
+
+    def test_chain_cache_skips_repeat_llm_calls(self) -> None:
+        calls = {"count": 0}
+
+        def fake_llm(_: object) -> str:
+            calls["count"] += 1
+            return "ok"
+
+        cache = ResponseCache()
+        llm = RunnableLambda(fake_llm)
+        with self.assertRaises(ValueError):
+            simple_chain("zero_shot", llm, cache=cache)
+
+        llm.model = "model-a"
+        chain = simple_chain("zero_shot", llm, cache=cache)
+        self.assertEqual(chain.invoke({"input": "Question"}), "ok")
+        self.assertEqual(chain.invoke({"input": "Question"}), "ok")
+        self.assertEqual(calls["count"], 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+        other = cached_llm(llm, cache, model="model-b", prompt_version="v1")
+        self.assertEqual(other.invoke("Question"), "ok")
+        self.assertEqual(calls["count"], 2)
+
+    def test_cached_llm_only_stores_accepted_outputs(self) -> None:
+        replies = iter(["bad", "good", "unused"])
+        llm = RunnableLambda(lambda _: next(replies))
+        cache = ResponseCache()
+        cached = cached_llm(llm, cache, model="m", accept=lambda output: output == "good")
+        self.assertEqual(cached.invoke("Question"), "bad")
+        self.assertEqual(len(cache.backend), 0)
+        self.assertEqual(cached.invoke("Question"), "good")
+        self.assertEqual(cached.invoke("Question"), "good")
+
+    def test_gemini_llm_reports_model_and_temperature(self) -> None:
+        llm = gemini_llm(model="models/test-model", temperature=0.2)
+        self.assertEqual(llm_model_name(llm), "models/test-model")
+        self.assertEqual(llm_temperature(llm), 0.2)
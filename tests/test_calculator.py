@@ -0,0 +1,68 @@
+import unittest
+
+from src.tools import calculator, get_batch_tool
+
+
+class TestCalculator(unittest.TestCase):
+    def test_evaluates_percentages_and_precedence(self) -> None:
+        self.assertEqual(calculator.calculate("15% of 240"), 36.0)
+        self.assertEqual(calculator.calculate("-(3)**2 + 10/4"), -6.5)
+
+    def test_repeated_expressions_hit_cache(self) -> None:
+        calculator.calculate("12 * 12")
+        before = calculator._evaluate.cache_info().hits
+        calculator.calculate("  12 * 12 ")
+        self.assertEqual(calculator._evaluate.cache_info().hits, before + 1)
+
+    def test_rejects_pathological_inputs(self) -> None:
+        for expression in (
+            "9**9**9",
+            "1/0",
+            "10 ** 400",
+            "(-8) ** (1/3)",
+            "-" * 300 + "1",
+            "+".join(["1"] * 300),
+            "__import__('os')",
+        ):
+            with self.subTest(expression=expression[:20]):
+                with self.assertRaises(ValueError):
+                    calculator.calculate(expression)
+
+    def test_calculate_many_matches_scalar_results(self) -> None:
+        expressions = ["1 + 2", "3 + 4", "10% of 50", "1/0", "", "5 ** 2000", "1 + 2"]
+        expected = [
+            {"result": 3.0},
+            {"result": 7.0},
+            {"result": 5.0},
+            {"error": "Invalid expression: 1/0"},
+            {"error": "Expression cannot be empty."},
+            {"error": "Invalid expression: 5 ** 2000"},
+            {"result": 3.0},
+        ]
+        self.assertEqual(calculator.calculate_many(expressions), expected)
+        self.assertEqual(calculator.calculate_many(expressions, vectorize=False), expected)
+
+    def test_vectorized_path_agrees_on_intermediate_overflow(self) -> None:
+        expressions = [
+            "1/(1/0)",
+            "2/(2/0)",
+            "1/(10**400)",
+            "2/(10**400)",
+            "(-8)**0.5",
+            "(-2)**0.5",
+            "1/(1e308*10)",
+            "2/(1e308*10)",
+            "6/3",
+            "8/4",
+        ]
+        vectorized = calculator.calculate_many(expressions)
+        self.assertEqual(vectorized, calculator.calculate_many(expressions, vectorize=False))
+        self.assertEqual(vectorized[0], {"error": "Invalid expression: 1/(1/0)"})
+        self.assertEqual(vectorized[2], {"error": "Invalid expression: 1/(10**400)"})
+        self.assertEqual(vectorized[-1], {"result": 2.0})
+
+    def test_registry_exposes_batch_calculator(self) -> None:
+        batch = get_batch_tool("calculator")
+        self.assertIsNotNone(batch)
+        self.assertEqual(batch(["2 * 3"]), [{"result": 6.0}])
+        self.assertIsNone(get_batch_tool("search"))
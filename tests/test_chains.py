@@ -1,8 +1,17 @@
+import asyncio
+import time
 import unittest
 
 from langchain_core.runnables import RunnableLambda
 
-from langchain.lc_prompts import json_output_parser, planner_executor_chain, simple_chain, with_history_chain
+from langchain.lc_prompts import (
+    json_output_parser,
+    planner_executor_chain,
+    simple_chain,
+    tool_aware_chain,
+    with_history_chain,
+)
+from src.tools.fast_router import FastRouter
 
 
 class TestChains(unittest.TestCase):
@@ -33,3 +42,58 @@ class TestChains(unittest.TestCase):
         chain = simple_chain("structured_output", llm, parser=json_output_parser())
         output = chain.invoke({"input": "Question"})
         self.assertEqual(output["confidence"], "low")
+
+    def test_tool_aware_chain_routes_to_calculator(self) -> None:
+        def fake_llm(prompt: object) -> str:
+            text = prompt.to_string()
+            if text.startswith("PROMPT TITLE: Tool router"):
+                return '{"tool":"calculator","tool_input":"2+2"}'
+            return '{"answer":"4","tool_used":"calculator","tool_results":{"result":4.0},"citations":[]}'
+
+        chain = tool_aware_chain("router", "tool_answer", RunnableLambda(fake_llm))
+        output = chain.invoke({"input": "What is 2+2?"})
+        self.assertEqual(output["answer"], "4")
+
+    def test_tool_aware_chain_uses_separate_router_llm(self) -> None:
+        router_llm = RunnableLambda(lambda _: '{"tool":"none","tool_input":""}')
+        answer_llm = RunnableLambda(
+            lambda _: '{"answer":"ok","tool_used":"none","tool_results":null,"citations":[]}'
+        )
+        chain = tool_aware_chain("router", "tool_answer", answer_llm, router_llm=router_llm)
+        self.assertEqual(chain.invoke({"input": "Why?"})["tool_used"], "none")
+
+    def test_tool_aware_chain_pre_router_skips_router_llm(self) -> None:
+        prompts: list[str] = []
+
+        def fake_llm(prompt: object) -> str:
+            prompts.append(prompt.to_string())
+            return '{"answer":"36","tool_used":"calculator","tool_results":{"result":36.0},"citations":[]}'
+
+        chain = tool_aware_chain(
+            "router", "tool_answer", RunnableLambda(fake_llm), pre_router=FastRouter()
+        )
+        output = chain.invoke({"input": "What is 15% of 240?"})
+        self.assertEqual(output["answer"], "36")
+        self.assertEqual(len(prompts), 1)
+        self.assertIn('"result": 36.0', prompts[0])
+
+    def test_tool_aware_chain_abatch_runs_concurrently(self) -> None:
+        def respond(prompt: object) -> str:
+            if prompt.to_string().startswith("PROMPT TITLE: Tool router"):
+                return '{"tool":"none","tool_input":""}'
+            return '{"answer":"ok","tool_used":"none","tool_results":null,"citations":[]}'
+
+        async def arespond(prompt: object) -> str:
+            await asyncio.sleep(0.05)
+            return respond(prompt)
+
+        llm = RunnableLambda(respond, afunc=arespond)
+        chain = tool_aware_chain("router", "tool_answer", llm, max_concurrency=10)
+        inputs = [{"input": f"Question {idx}"} for idx in range(10)]
+
+        start = time.perf_counter()
+        outputs = asyncio.run(chain.abatch(inputs, config={"max_concurrency": 10}))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([item["answer"] for item in outputs], ["ok"] * 10)
+        self.assertLess(elapsed, 0.5)
@@ -0,0 +1,84 @@
+import unittest
+from types import SimpleNamespace
+from typing import Any
+
+import runner
+from src.llm import ClientProvider, ResponseCache, set_client_provider
+from src.reliability.policy import RetryPolicy, TokenBucket
+
+
+class _FakeModels:
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+
+    def generate_content(self, **kwargs: Any) -> Any:
+        self.calls.append(kwargs)
+        return SimpleNamespace(text=f"echo: {kwargs['contents']}")
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.models = _FakeModels()
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestClientProvider(unittest.TestCase):
+    def setUp(self) -> None:
+        self.built: list[_FakeClient] = []
+
+        def factory(_: str) -> _FakeClient:
+            client = _FakeClient()
+            self.built.append(client)
+            return client
+
+        self.provider = ClientProvider(
+            factory=factory,
+            config_factory=lambda **options: dict(options),
+            api_key="test-key",
+        )
+        self.previous = set_client_provider(self.provider)
+
+    def tearDown(self) -> None:
+        set_client_provider(self.previous)
+
+    def test_call_model_reuses_one_client(self) -> None:
+        self.assertEqual(runner.call_model("a"), "echo: a")
+        self.assertEqual(runner.call_model("b"), "echo: b")
+        self.assertEqual(len(self.built), 1)
+        self.assertEqual(len(self.built[0].models.calls), 2)
+
+    def test_config_is_cached_per_model(self) -> None:
+        self.provider.generate("a", model="m1", temperature=0.0)
+        self.provider.generate("b", model="m1", temperature=0.0)
+        calls = self.built[0].models.calls
+        self.assertIs(calls[0]["config"], calls[1]["config"])
+        self.assertEqual(calls[0]["model"], "m1")
+
+    def test_close_shuts_down_client(self) -> None:
+        self.provider.generate("a")
+        self.provider.close()
+        self.assertTrue(self.built[0].closed)
+        self.provider.generate("b")
+        self.assertEqual(len(self.built), 2)
+
+    def test_call_model_cache_hit_skips_client(self) -> None:
+        cache = ResponseCache()
+        runner.call_model("a", cache=cache)
+        runner.call_model("a", cache=cache)
+        self.assertEqual(len(self.built[0].models.calls), 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_policy_applies_to_cache_misses_only(self) -> None:
+        waits: list[float] = []
+        limiter = TokenBucket(rate=0.5, capacity=1.0, clock=lambda: 0.0, sleep=waits.append)
+        policy = RetryPolicy(max_attempts=1, call_timeout=2.5)
+        cache = ResponseCache()
+        for _ in range(3):
+            runner.call_model("a", cache=cache, policy=policy, rate_limiter=limiter)
+        self.assertEqual(waits, [])
+        [call] = self.built[0].models.calls
+        self.assertEqual(call["config"], {"http_options": {"timeout": 2500}})
+
@@ -0,0 +1,80 @@
+import asyncio
+import socket
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.daemon import PlaygroundDaemon, send_request
+
+
+class TestPlaygroundDaemon(unittest.TestCase):
+    def test_round_trip_over_unix_socket(self) -> None:
+        daemon = PlaygroundDaemon(lambda prompt_id, text: f"{prompt_id}:{text}")
+
+        async def scenario() -> tuple[dict, dict, dict]:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = str(Path(tmp) / "daemon.sock")
+                server = await daemon.start(socket_path=path)
+                async with server:
+                    ok = await asyncio.to_thread(
+                        send_request, {"id": 1, "prompt_id": "zero_shot", "input": "hi"}, socket_path=path
+                    )
+                    bad = await asyncio.to_thread(send_request, {"prompt_id": "x"}, socket_path=path)
+                    stats = await asyncio.to_thread(send_request, {"op": "stats"}, socket_path=path)
+                daemon.close()
+                return ok, bad, stats
+
+        ok, bad, stats = asyncio.run(scenario())
+        self.assertEqual(ok, {"id": 1, "output": "zero_shot:hi"})
+        self.assertIn("error", bad)
+        self.assertEqual(stats["stats"]["requests"], 1)
+
+    def test_refuses_live_socket_and_replaces_stale_one(self) -> None:
+        async def scenario() -> None:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = str(Path(tmp) / "daemon.sock")
+                stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                stale.bind(path)
+                stale.close()
+
+                first = PlaygroundDaemon(lambda prompt_id, text: text)
+                server = await first.start(socket_path=path)
+                async with server:
+                    second = PlaygroundDaemon(lambda prompt_id, text: text)
+                    with self.assertRaises(RuntimeError):
+                        await second.start(socket_path=path)
+                    second.close()
+                    pong = await asyncio.to_thread(send_request, {"op": "ping"}, socket_path=path)
+                    self.assertTrue(pong["ok"])
+                first.close()
+
+        asyncio.run(scenario())
+
+    def test_rejects_requests_beyond_queue_limit(self) -> None:
+        release = threading.Event()
+
+        def slow(prompt_id: str, text: str) -> str:
+            release.wait(2)
+            return text
+
+        daemon = PlaygroundDaemon(slow, max_concurrency=1, max_queue=1)
+
+        async def scenario() -> list[dict]:
+            requests = [
+                asyncio.create_task(daemon.handle_request({"prompt_id": "p", "input": str(idx)}))
+                for idx in range(3)
+            ]
+            await asyncio.sleep(0.05)
+            release.set()
+            return await asyncio.gather(*requests)
+
+        responses = asyncio.run(scenario())
+        daemon.close()
+        self.assertEqual([response.get("output") for response in responses[:2]], ["0", "1"])
+        self.assertIn("busy", responses[2]["error"])
+        self.assertEqual(daemon.stats()["rejected"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from langchain_core.runnables import RunnableLambda
+
+from langchain.lc_prompts import PROMPT_CATEGORIES, map_prompt
+from src.evals import render_report, run_evals, summarize
+
+ROWS = [{"id": "a", "input": "First question"}, {"id": "b", "input": "Second question"}]
+STRUCTURED = '{"summary":"s","key_points":[],"risks":[],"confidence":"low"}'
+
+
+class TestEvals(unittest.TestCase):
+    def test_matrix_retries_invalid_output_and_reports(self) -> None:
+        calls = {"structured": 0}
+
+        def respond(prompt: object) -> str:
+            if "Structured analytical response" in prompt.to_string():
+                calls["structured"] += 1
+                return "not json" if calls["structured"] == 1 else STRUCTURED
+            return "plain answer"
+
+        llm = RunnableLambda(respond)
+        with tempfile.TemporaryDirectory() as tmp:
+            results = run_evals(
+                ["zero_shot", "structured_output"],
+                ROWS,
+                lambda prompt_id, attempt: map_prompt(prompt_id, llm),
+                str(Path(tmp) / "results.jsonl"),
+                categories=PROMPT_CATEGORIES,
+                concurrency=1,
+            )
+        self.assertEqual(len(results), 4)
+        summary = summarize(results)
+        self.assertEqual(summary["zero_shot"]["validity_rate"], 1.0)
+        self.assertEqual(summary["structured_output"]["retries"], 1)
+        report = render_report(results)
+        self.assertIn("Prompt Pair: structured_output vs zero_shot", report)
+        self.assertIn("| zero_shot | 2 | 100% |", report)
+
+    def test_summary_uses_nearest_rank_p95(self) -> None:
+        results = [
+            {"prompt_id": "zero_shot", "valid": True, "retries": 0, "latency_seconds": float(n)}
+            for n in range(100)
+        ]
+        self.assertEqual(summarize(results)["zero_shot"]["p95_latency_seconds"], 94.0)
+
+    def test_resume_skips_completed_cells(self) -> None:
+        seen: list[str] = []
+
+        def respond(prompt: object) -> str:
+            seen.append(prompt.to_string())
+            return "ok"
+
+        llm = RunnableLambda(respond)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "results.jsonl")
+            run_evals(["zero_shot"], ROWS[:1], lambda p, a: map_prompt(p, llm), path, categories=PROMPT_CATEGORIES)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write('{"prompt_id": "zero_shot", "row_id": "b", "inp')
+            results = run_evals(["zero_shot"], ROWS, lambda p, a: map_prompt(p, llm), path, categories=PROMPT_CATEGORIES)
+            run_evals(["zero_shot"], ROWS, lambda p, a: map_prompt(p, llm), path, categories=PROMPT_CATEGORIES)
+        self.assertEqual(len(seen), 2)
+        self.assertEqual([result["row_id"] for result in results], ["a", "b"])
+
+    def test_resume_reruns_edited_inputs_and_prompt_versions(self) -> None:
+        seen: list[str] = []
+
+        def respond(prompt: object) -> str:
+            seen.append(prompt.to_string())
+            return "ok"
+
+        def chain_for(prompt_id: str, attempt: int):
+            return map_prompt(prompt_id, RunnableLambda(respond))
+
+        edited = [{"id": "a", "input": "Edited question"}]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "results.jsonl")
+            for rows, version in ((ROWS[:1], "1"), (edited, "1"), (edited, "2"), (edited, "2")):
+                results = run_evals(
+                    ["zero_shot"],
+                    rows,
+                    chain_for,
+                    path,
+                    categories=PROMPT_CATEGORIES,
+                    prompt_versions={"zero_shot": version},
+                )
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(results[0]["input"], "Edited question")
+        self.assertEqual(results[0]["prompt_version"], "2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import threading
+import time
+import unittest
+from typing import Any
+
+from langchain.lc_prompts.chains import _normalize_routes
+from src.tools.executor import ToolExecutor
+
+
+class TestToolExecutor(unittest.TestCase):
+    def test_runs_tools_concurrently_and_merges(self) -> None:
+        executor = ToolExecutor()
+        payload = executor.run(
+            [
+                {"tool": "calculator", "tool_input": "2+2"},
+                {"tool": "search", "tool_input": "llm healthcare"},
+            ]
+        )
+        self.assertEqual(payload["tool_used"], "calculator")
+        self.assertEqual(payload["tool_results"]["calculator"], {"result": 4.0})
+        self.assertTrue(payload["tool_results"]["search"]["results"])
+        self.assertEqual(payload["citations"][0]["source"], "local:healthcare-llm-001")
+        executor.shutdown()
+
+    def test_slow_tool_times_out_without_blocking_others(self) -> None:
+        release = threading.Event()
+
+        def slow(_: str) -> dict[str, Any]:
+            release.wait(2)
+            return {"tool_used": "search", "tool_results": {"results": []}, "citations": []}
+
+        executor = ToolExecutor(
+            {"search": slow}, timeouts={"search": 0.05}
+        )
+        start = time.perf_counter()
+        payloads = executor.run_many(
+            [
+                {"tool": "search", "tool_input": "slow"},
+                {"tool": "calculator", "tool_input": "3*3"},
+            ]
+        )
+        release.set()
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertIn("timed out", payloads[0]["tool_results"]["error"])
+        self.assertEqual(payloads[1]["tool_results"], {"result": 9.0})
+        executor.shutdown()
+
+    def test_hung_tool_does_not_starve_later_calls(self) -> None:
+        release = threading.Event()
+
+        def hung(_: str) -> dict[str, Any]:
+            release.wait(5)
+            return {"tool_used": "search", "tool_results": {"results": []}, "citations": []}
+
+        executor = ToolExecutor({"search": hung}, max_workers=1, timeouts={"search": 0.05})
+        try:
+            for _ in range(2):
+                executor.run_many([{"tool": "search", "tool_input": "stuck"}])
+            start = time.perf_counter()
+            [payload] = executor.run_many([{"tool": "calculator", "tool_input": "2*3"}])
+            self.assertLess(time.perf_counter() - start, 1.0)
+            self.assertEqual(payload["tool_results"], {"result": 6.0})
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_results_are_cached_per_tool_input(self) -> None:
+        calls = {"count": 0}
+
+        def counting(tool_input: str) -> dict[str, Any]:
+            calls["count"] += 1
+            return {"tool_used": "calculator", "tool_results": {"result": 1.0}, "citations": []}
+
+        executor = ToolExecutor({"calculator": counting})
+        route = {"tool": "calculator", "tool_input": "1"}
+        executor.run([route])["tool_results"]["result"] = 99.0
+        self.assertEqual(executor.run([route])["tool_results"], {"result": 1.0})
+        self.assertEqual(calls["count"], 1)
+        executor.shutdown()
+
+    def test_normalize_routes_accepts_lists(self) -> None:
+        routes = _normalize_routes(
+            {"tools": [{"tool": "calculator", "tool_input": "1+1"}, {"tool": "none"}]}
+        )
+        self.assertEqual(routes, [{"tool": "calculator", "tool_input": "1+1"}])
+        self.assertEqual(_normalize_routes("garbage"), [{"tool": "none", "tool_input": ""}])
@@ -0,0 +1,47 @@
+import unittest
+
+from src.tools.fast_router import FastRouter, classify
+
+
+class TestFastRouter(unittest.TestCase):
+    def test_routes_arithmetic_to_calculator(self) -> None:
+        match = classify("What is 15% of 240?")
+        self.assertEqual(match.route.tool, "calculator")
+        self.assertEqual(match.route.tool_input, "15% of 240")
+        self.assertEqual(classify("compute 3 times 4").route.tool_input, "3 * 4")
+
+    def test_routes_search_keywords_and_small_talk(self) -> None:
+        self.assertEqual(classify("Latest statistics on LLM adoption").route.tool, "search")
+        self.assertEqual(classify("Thanks!").route.tool, "none")
+
+    def test_uncertain_questions_fall_back(self) -> None:
+        router = FastRouter()
+        self.assertIsNone(router.route("Explain how transformers work"))
+        self.assertIsNone(router.route("What is AI-driven drug discovery?"))
+        self.assertIsNotNone(router.route("2 + 2"))
+        stats = router.stats()
+        self.assertEqual((stats["calls"], stats["hits"], stats["fallbacks"]), (3, 1, 2))
+        self.assertEqual(stats["hits_by_rule"], {"expression": 1})
+
+    def test_single_search_keyword_falls_back_to_llm(self) -> None:
+        router = FastRouter()
+        for question in (
+            "Explain the sources of inflation",
+            "What are current best practices for prompt design?",
+            "How are figures of speech used in legal writing?",
+            "Cite three reasons transformers replaced RNNs",
+        ):
+            with self.subTest(question=question):
+                self.assertIsNone(router.route(question))
+        self.assertEqual(classify("Explain the sources of inflation").rule, "search_keyword")
+        self.assertEqual(router.route("Latest news on EU AI regulation").tool, "search")
+
+    def test_threshold_controls_embedded_expressions(self) -> None:
+        question = "My budget is 1200 and I spent 300+250, how much is left"
+        self.assertIsNone(FastRouter().route(question))
+        route = FastRouter(threshold=0.5).route(question)
+        self.assertEqual(route.tool_input, "300+250")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,8 @@ from pathlib import Path
 
 from langchain_core.prompts import PromptTemplate
 
-from langchain.lc_prompts import FORMAT_INSTRUCTIONS_VAR, get_prompt
+from langchain.lc_prompts import FORMAT_INSTRUCTIONS_VAR, compile_template, get_prompt
+from runner import build_prompt
 
 
 class TestGoldenPrompts(unittest.TestCase):
@@ -27,3 +28,21 @@ class TestGoldenPrompts(unittest.TestCase):
         ).rstrip("\n")
         expected = self._read_golden("structured_output").rstrip("\n")
         self.assertEqual(rendered, expected)
+
+    def test_compiled_template_matches_goldens(self) -> None:
+        compiled = compile_template(get_prompt("structured_output").text)
+        rendered = compiled.render_many(
+            [
+                {"input": "Test question", FORMAT_INSTRUCTIONS_VAR: ""},
+                {"input": "Other", FORMAT_INSTRUCTIONS_VAR: ""},
+            ]
+        )
+        expected = self._read_golden("structured_output").rstrip("\n")
+        self.assertEqual(rendered[0].rstrip("\n"), expected)
+        self.assertTrue(rendered[1].rstrip("\n").endswith("Other"))
+
+    def test_runner_build_prompt_matches_goldens(self) -> None:
+        for name in ("zero_shot", "structured_output"):
+            rendered = build_prompt(get_prompt(name).text, "Test question")
+            expected = self._read_golden(name).rstrip("\n")
+            self.assertEqual(rendered.rstrip("\n"), expected)
@@ -0,0 +1,51 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from src.jobs import Job, JobProgress, load_checkpoint
+
+
+class TestJob(unittest.TestCase):
+    def test_flushes_in_batches_and_skips_completed_on_restart(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, "results.jsonl")
+            job = Job(output_path, total=5, flush_every=2)
+            for key in ("a", "b", "c"):
+                job.record(key, {"id": key})
+            self.assertEqual(len(load_checkpoint(job.checkpoint_path)), 2)
+            job.close()
+
+            with open(output_path, "a", encoding="utf-8") as handle:
+                handle.write('{"id": "torn')
+            progress: list[JobProgress] = []
+            with Job(output_path, total=5, on_progress=progress.append) as resumed:
+                remaining = list(resumed.pending(["a", "b", "c", "d", "e"], key=lambda item: item))
+                self.assertEqual(remaining, ["d", "e"])
+                for key in remaining:
+                    resumed.record(key, {"id": key})
+            with open(output_path, "r", encoding="utf-8") as handle:
+                lines = handle.read().splitlines()
+        self.assertEqual(lines[-2:], ['{"id": "d"}', '{"id": "e"}'])
+        self.assertEqual((progress[-1].resumed, progress[-1].done, progress[-1].remaining), (3, 2, 0))
+
+    def test_failed_items_are_written_but_not_checkpointed(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, "results.jsonl")
+            with Job(output_path) as job:
+                job.record("a", {"id": "a"})
+                job.record("b", {"id": "b", "error": "boom"}, completed=False)
+                self.assertIn("1 failed", job.progress().format())
+            with Job(output_path) as resumed:
+                self.assertEqual(list(resumed.pending(["a", "b"], key=lambda item: item)), ["b"])
+            with open(output_path, "r", encoding="utf-8") as handle:
+                self.assertEqual(len(handle.read().splitlines()), 2)
+
+    def test_progress_eta(self) -> None:
+        progress = JobProgress(total=100, resumed=20, done=40, elapsed_seconds=20.0)
+        self.assertEqual(progress.rate, 2.0)
+        self.assertEqual(progress.eta_seconds, 20.0)
+        self.assertIn("60/100 done", progress.format())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = """
+import sys
+import runner
+import src.reliability
+import src.tools
+from langchain.lc_prompts import get_prompt
+get_prompt("zero_shot")
+src.tools.tool_specs()
+print(sorted({name.split(".")[0] for name in sys.modules if name.startswith(("langchain_core", "pydantic"))}))
+"""
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_cli_paths_do_not_import_langchain_core(self) -> None:
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(completed.stdout.strip(), "[]")
+
+    def test_lazy_attributes_resolve(self) -> None:
+        import langchain.lc_prompts as lc_prompts
+        import src.tools as tools
+
+        self.assertTrue(callable(lc_prompts.simple_chain))
+        self.assertIn("map_prompt", dir(lc_prompts))
+        self.assertTrue(callable(tools.get_tool_registry))
+        with self.assertRaises(AttributeError):
+            lc_prompts.not_a_name
+
+
+if __name__ == "__main__":
+    unittest.main()
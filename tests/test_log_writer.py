@@ -0,0 +1,58 @@
+import json
+import os
+import threading
+import unittest
+from tempfile import TemporaryDirectory
+
+from src.reliability.log_writer import LOG_FILENAME, RetryLogWriter
+
+
+def _read_lines(path: str) -> list[dict[str, object]]:
+    with open(path, "r", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+class TestRetryLogWriter(unittest.TestCase):
+    def test_concurrent_writes_are_not_lost(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            writer = RetryLogWriter(tmp_dir, max_queue=16)
+
+            def produce(worker: int) -> None:
+                for idx in range(50):
+                    writer.write({"worker": worker, "idx": idx})
+
+            threads = [threading.Thread(target=produce, args=(n,)) for n in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            writer.close()
+
+            records = _read_lines(os.path.join(tmp_dir, LOG_FILENAME))
+            self.assertEqual(len(records), 400)
+            self.assertEqual(len({(r["worker"], r["idx"]) for r in records}), 400)
+
+    def test_rotates_when_file_is_full(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            writer = RetryLogWriter(tmp_dir, max_bytes=200, backup_count=2, batch_size=1)
+            for idx in range(20):
+                writer.write({"idx": idx, "padding": "x" * 40})
+            writer.close()
+
+            files = sorted(os.listdir(tmp_dir))
+            self.assertEqual(files, [LOG_FILENAME, f"{LOG_FILENAME}.1", f"{LOG_FILENAME}.2"])
+            newest = _read_lines(os.path.join(tmp_dir, LOG_FILENAME))
+            self.assertEqual(newest[-1]["idx"], 19)
+
+    def test_unserializable_values_do_not_stop_the_writer(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            writer = RetryLogWriter(tmp_dir, max_queue=2, batch_size=1)
+            for idx in range(5):
+                writer.write({"idx": idx, "validated": {idx}})
+            writer.close()
+            with self.assertRaises(RuntimeError):
+                writer.write({"idx": 5})
+
+            records = _read_lines(os.path.join(tmp_dir, LOG_FILENAME))
+            self.assertEqual([r["idx"] for r in records], [0, 1, 2, 3, 4])
+            self.assertEqual(records[0]["validated"], "{0}")
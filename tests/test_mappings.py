@@ -0,0 +1,65 @@
+import os
+import shutil
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from langchain_core.runnables import RunnableLambda
+
+from langchain.lc_prompts import (
+    PROMPT_CATEGORIES,
+    clear_chain_cache,
+    get_registry,
+    map_prompt,
+    warm_chains,
+)
+from langchain.lc_prompts.output_parsers import pydantic_output_parser
+from src.schemas import ToolRoute
+
+
+class TestChainCache(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_chain_cache()
+        self.llm = RunnableLambda(lambda _: '{"tool":"none","tool_input":""}')
+
+    def tearDown(self) -> None:
+        clear_chain_cache()
+
+    def test_map_prompt_reuses_prebuilt_chain(self) -> None:
+        chain = map_prompt("zero_shot", self.llm)
+        self.assertIs(map_prompt("zero_shot", self.llm), chain)
+        self.assertIsNot(map_prompt("zero_shot", RunnableLambda(lambda _: "ok")), chain)
+        self.assertIsNot(map_prompt("zero_shot", self.llm, cached=False), chain)
+
+    def test_parser_type_is_part_of_the_key(self) -> None:
+        default = map_prompt("router", self.llm)
+        typed = map_prompt("router", self.llm, parser=pydantic_output_parser(ToolRoute))
+        self.assertIsNot(default, typed)
+        self.assertIsInstance(typed.invoke({"input": "hi"}), ToolRoute)
+
+    def test_edited_prompt_rebuilds_cached_chain(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "zero_shot.txt")
+            shutil.copy("prompts/zero_shot.txt", path)
+            chain = map_prompt("zero_shot", self.llm, prompts_dir=tmp_dir)
+            self.assertIs(map_prompt("zero_shot", self.llm, prompts_dir=tmp_dir), chain)
+
+            with open(path, "a", encoding="utf-8") as handle:
+                handle.write("\nEdited.\n")
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            edited = map_prompt("zero_shot", self.llm, prompts_dir=tmp_dir)
+            self.assertIsNot(edited, chain)
+            self.assertIs(map_prompt("zero_shot", self.llm, prompts_dir=tmp_dir), edited)
+
+    def test_warm_chains_builds_every_category_without_request_io(self) -> None:
+        chains = warm_chains(self.llm)
+        self.assertEqual(set(chains), set(PROMPT_CATEGORIES))
+        registry = get_registry()
+        with mock.patch.object(registry, "load", side_effect=AssertionError("file I/O")):
+            for prompt_id, chain in chains.items():
+                self.assertIs(map_prompt(prompt_id, self.llm), chain)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import time
+import unittest
+
+from src.reliability import (
+    CallTimeoutError,
+    DeadlineExceededError,
+    RetryPolicy,
+    TokenBucket,
+    call_with_policy,
+    is_retryable,
+)
+
+
+class _StatusError(Exception):
+    def __init__(self, code: int) -> None:
+        super().__init__(f"status {code}")
+        self.code = code
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_classifies_errors(self) -> None:
+        self.assertTrue(is_retryable(_StatusError(429)))
+        self.assertTrue(is_retryable(_StatusError(503)))
+        self.assertTrue(is_retryable(TimeoutError()))
+        self.assertFalse(is_retryable(_StatusError(400)))
+        self.assertFalse(is_retryable(ValueError("bad json")))
+
+    def test_retries_transient_errors_with_backoff(self) -> None:
+        clock = _FakeClock()
+        attempts = {"count": 0}
+
+        def flaky(value: int) -> int:
+            attempts["count"] += 1
+            if attempts["count"] < 3:
+                raise _StatusError(503)
+            return value * 2
+
+        policy = RetryPolicy(max_attempts=4, base_delay=1.0, jitter=0.0)
+        result = call_with_policy(flaky, 21, policy=policy, sleep=clock.sleep, clock=clock)
+        self.assertEqual(result, 42)
+        self.assertEqual(clock.now, 3.0)
+
+    def test_non_retryable_errors_raise_immediately(self) -> None:
+        attempts = {"count": 0}
+
+        def broken() -> None:
+            attempts["count"] += 1
+            raise _StatusError(400)
+
+        with self.assertRaises(_StatusError):
+            call_with_policy(broken, policy=RetryPolicy(), sleep=lambda _: None)
+        self.assertEqual(attempts["count"], 1)
+
+    def test_deadline_and_call_timeout(self) -> None:
+        clock = _FakeClock()
+
+        def always_503() -> None:
+            raise _StatusError(503)
+
+        policy = RetryPolicy(max_attempts=10, base_delay=1.0, jitter=0.0, deadline=2.5)
+        with self.assertRaises(DeadlineExceededError):
+            call_with_policy(always_503, policy=policy, sleep=clock.sleep, clock=clock)
+
+        seen: list[float | None] = []
+
+        def slow(*, timeout: float | None) -> None:
+            seen.append(timeout)
+            raise CallTimeoutError(f"Call exceeded {timeout}s")
+
+        with self.assertRaises(CallTimeoutError):
+            call_with_policy(
+                slow,
+                policy=RetryPolicy(max_attempts=2, call_timeout=0.05, jitter=0.0),
+                sleep=lambda _: None,
+                timeout_kwarg="timeout",
+            )
+        self.assertEqual(seen, [0.05, 0.05])
+        with self.assertRaises(ValueError):
+            call_with_policy(time.sleep, 0.5, policy=RetryPolicy(call_timeout=0.05))
+
+    def test_token_bucket_throttles(self) -> None:
+        clock = _FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2.0, clock=clock, sleep=clock.sleep)
+        for _ in range(4):
+            bucket.acquire()
+        self.assertAlmostEqual(clock.now, 1.0)
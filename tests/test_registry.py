@@ -1,6 +1,9 @@
+import os
 import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
 
-from langchain.lc_prompts import build_registry, get_prompt, list_prompt_ids
+from langchain.lc_prompts import build_registry, get_prompt, get_registry, list_prompt_ids
 
 
 class TestRegistry(unittest.TestCase):
@@ -17,3 +20,32 @@ class TestRegistry(unittest.TestCase):
         registry = build_registry()
         record = registry.get("zero_shot")
         self.assertEqual(record.id, "zero_shot")
+
+    def test_registry_caches_records_and_templates(self) -> None:
+        registry = get_registry()
+        self.assertIs(registry.get("zero_shot"), registry.get("zero_shot"))
+        self.assertIs(
+            registry.prompt_template("zero_shot"),
+            registry.prompt_template("zero_shot"),
+        )
+
+    def test_registry_reloads_changed_and_new_files(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "sample.txt"
+            path.write_text("PROMPT TITLE: First\n{input}\n", encoding="utf-8")
+            registry = get_registry(tmp_dir)
+            self.assertEqual(registry.get("sample").metadata.title, "First")
+
+            path.write_text("PROMPT TITLE: Second version\n{input}\n", encoding="utf-8")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(registry.get("sample").metadata.title, "Second version")
+
+            self.assertFalse(registry.validate_id("added"))
+            (Path(tmp_dir) / "added.txt").write_text("{input}", encoding="utf-8")
+            os.utime(tmp_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+            self.assertTrue(registry.validate_id("added"))
+
+    def test_get_prompt_unknown_id_raises(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            get_prompt("does_not_exist")
@@ -0,0 +1,112 @@
+import json
+import os
+import random
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from runner import iter_batch_results, run_batch
+from src.jobs import JobProgress
+
+
+def _fake_call(prompt: str, **_: Any) -> str:
+    time.sleep(random.uniform(0, 0.01))
+    return prompt.splitlines()[-1]
+
+
+class TestBatchRunner(unittest.TestCase):
+    def test_results_keep_input_order(self) -> None:
+        rows = [{"id": idx, "input": f"question {idx}"} for idx in range(20)]
+        results = list(
+            iter_batch_results(
+                rows,
+                default_prompt="prompts/zero_shot.txt",
+                concurrency=4,
+                call=_fake_call,
+            )
+        )
+        self.assertEqual([item["id"] for item in results], list(range(20)))
+        self.assertEqual(results[3]["output"], "question 3")
+
+    def test_failed_rows_are_recorded(self) -> None:
+        rows = [
+            {"id": "ok", "input": "fine", "prompt": "prompts/zero_shot.txt"},
+            {"id": "missing", "input": "fine", "prompt": "prompts/does_not_exist.txt"},
+        ]
+        results = list(iter_batch_results(rows, call=_fake_call))
+        self.assertEqual(results[0]["output"], "fine")
+        self.assertIn("FileNotFoundError", results[1]["error"])
+
+    def test_run_batch_resumes_from_checkpoint(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            input_path = os.path.join(tmp_dir, "requests.jsonl")
+            output_path = os.path.join(tmp_dir, "out", "results.jsonl")
+            with open(input_path, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps({"input": "first"}) + "\n\n")
+                handle.write(json.dumps({"input": "second"}) + "\n")
+
+            counts = [
+                run_batch(
+                    input_path,
+                    output_path,
+                    default_prompt="prompts/zero_shot.txt",
+                    call=_fake_call,
+                )
+                for _ in range(2)
+            ]
+            self.assertEqual(counts, [2, 0])
+
+            with open(output_path, "r", encoding="utf-8") as handle:
+                lines = [json.loads(line) for line in handle]
+            self.assertEqual(len(lines), 2)
+            self.assertEqual(lines[1]["id"], 2)
+            self.assertEqual(lines[1]["output"], "second")
+            with open(output_path + ".checkpoint", "r", encoding="utf-8") as handle:
+                keys = [json.loads(line) for line in handle]
+            self.assertEqual([key[0] for key in keys], [0, 2])
+
+    def test_run_batch_retries_failed_rows(self) -> None:
+        calls = {"fail": True}
+
+        def flaky_call(prompt: str, **kwargs: Any) -> str:
+            if calls["fail"]:
+                raise RuntimeError("429 quota exceeded")
+            return _fake_call(prompt, **kwargs)
+
+        with TemporaryDirectory() as tmp_dir:
+            input_path = os.path.join(tmp_dir, "requests.jsonl")
+            output_path = os.path.join(tmp_dir, "results.jsonl")
+            with open(input_path, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps({"input": "first"}) + "\n")
+            args = (input_path, output_path)
+            self.assertEqual(run_batch(*args, default_prompt="prompts/zero_shot.txt", call=flaky_call), 1)
+            calls["fail"] = False
+            self.assertEqual(run_batch(*args, default_prompt="prompts/zero_shot.txt", call=flaky_call), 1)
+            self.assertEqual(run_batch(*args, default_prompt="prompts/zero_shot.txt", call=flaky_call), 0)
+
+            with open(output_path, "r", encoding="utf-8") as handle:
+                lines = [json.loads(line) for line in handle]
+            self.assertIn("429", lines[0]["error"])
+            self.assertEqual(lines[1]["output"], "first")
+
+    def test_run_batch_does_not_skip_rows_from_another_input(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, "results.jsonl")
+            counts = []
+            progress: list[JobProgress] = []
+            for name, question in (("in1.jsonl", "first"), ("in2.jsonl", "other")):
+                input_path = os.path.join(tmp_dir, name)
+                with open(input_path, "w", encoding="utf-8") as handle:
+                    handle.write(json.dumps({"input": question}) + "\n")
+                counts.append(
+                    run_batch(
+                        input_path,
+                        output_path,
+                        default_prompt="prompts/zero_shot.txt",
+                        call=_fake_call,
+                        on_progress=progress.append,
+                    )
+                )
+            self.assertEqual(counts, [1, 1])
+            self.assertEqual((progress[-1].resumed, progress[-1].done, progress[-1].remaining), (0, 1, 0))
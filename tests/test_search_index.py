@@ -0,0 +1,99 @@
+import json
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from src.tools import mini_search
+from src.tools.corpus import MappedCorpus, write_corpus
+from src.tools.postings import MappedPostings
+from src.tools.search_index import SearchIndex, build_index, tokenize
+
+
+class TestSearchIndex(unittest.TestCase):
+    def test_tokenize_matches_whole_words(self) -> None:
+        self.assertEqual(tokenize("What is the focus, US?"), ["focus", "us"])
+        self.assertEqual(mini_search.mini_search("focus groups"), [])
+
+    def test_bm25_ranks_best_match_first(self) -> None:
+        index = SearchIndex()
+        index.add_documents(
+            [
+                {"snippet": "solar panels and wind turbines", "source": "a"},
+                {"snippet": "solar solar solar capacity", "source": "b"},
+                {"snippet": "inflation data", "source": "c"},
+            ]
+        )
+        hits = index.search("solar capacity", k=2)
+        self.assertEqual([hit["source"] for hit in hits], ["b", "a"])
+
+    def test_incremental_updates_and_round_trip(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            corpus = os.path.join(tmp_dir, "corpus.jsonl")
+            with open(corpus, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps({"snippet": "CPI rose", "source": "s1"}) + "\n")
+            index = build_index(corpus)
+            index.add_document({"snippet": "CPI fell in June", "source": "s2"})
+            path = os.path.join(tmp_dir, "index.json")
+            index.save(path)
+            index.close()
+
+            loaded = SearchIndex.load(path)
+            self.assertEqual(len(loaded), 2)
+            self.assertEqual(loaded.search("june cpi", k=1)[0]["source"], "s2")
+
+            loaded.add_document({"snippet": "CPI flat in July", "source": "s3"})
+            loaded.save(path)
+            loaded.close()
+            reloaded = SearchIndex.load(path)
+            self.assertEqual(reloaded._postings, {})
+            self.assertEqual(reloaded.search("july", k=1)[0]["source"], "s3")
+            self.assertEqual(reloaded.search("june", k=1)[0]["source"], "s2")
+            reloaded.close()
+
+            postings = MappedPostings(path + ".postings")
+            self.assertEqual((postings.term_count, postings.doc_count), (6, 3))
+            self.assertEqual(list(postings.get("cpi")), [0, 1, 1, 1, 2, 1])
+            self.assertIsNone(postings.get("august"))
+            self.assertEqual(list(postings.iter_doc_lengths()), [2, 3, 3])
+            postings.close()
+
+    def test_loads_and_converts_inline_json_postings(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "index.json")
+            write_corpus([{"snippet": "CPI rose", "source": "s1"}], path + ".corpus")
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump(
+                    {
+                        "k1": 1.5,
+                        "b": 0.75,
+                        "corpus": "index.json.corpus",
+                        "doc_lengths": [2],
+                        "postings": {"cpi": [[0, 1]], "rose": [[0, 1]]},
+                    },
+                    handle,
+                )
+            legacy = SearchIndex.load(path)
+            self.assertEqual(legacy.search("rose")[0]["source"], "s1")
+            legacy.save(path)
+            legacy.close()
+            converted = SearchIndex.load(path)
+            self.assertEqual(converted.search("rose")[0]["source"], "s1")
+            converted.close()
+
+    def test_mapped_corpus_reads_single_records(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "docs.corpus")
+            documents = [
+                {"snippet": "caf\u00e9 prices", "source": "s\u00e9"},
+                {"snippet": "", "source": "empty"},
+                {"snippet": "last", "source": "s3"},
+            ]
+            self.assertEqual(write_corpus(documents, path), 3)
+            corpus = MappedCorpus(path)
+            self.assertEqual(len(corpus), 3)
+            self.assertEqual(corpus[0], documents[0])
+            self.assertEqual(corpus[1], documents[1])
+            self.assertEqual(corpus[-1], documents[2])
+            with self.assertRaises(IndexError):
+                corpus[3]
+            corpus.close()
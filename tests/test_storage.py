@@ -0,0 +1,172 @@
+import gzip
+import json
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from src.storage import (
+    _SEGMENT_NAME,
+    JSONLSegmentStore,
+    SQLiteResultStore,
+    import_output_files,
+    new_record,
+    open_result_store,
+)
+
+
+def _records() -> list[dict]:
+    return [
+        new_record("p1", "a", prompt_id="zero_shot", model="m1", clock=lambda: 100.0),
+        new_record("p2", "b", prompt_id="few_shot", model="m1", clock=lambda: 200.0),
+        new_record("p3", "c", prompt_id="zero_shot", model="m2", clock=lambda: 300.0),
+    ]
+
+
+class TestResultStores(unittest.TestCase):
+    def _check_queries(self, store) -> None:
+        records = _records()
+        ids = store.add_many(records)
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(store.get(ids[1])["output"], "b")
+        self.assertIsNone(store.get("missing"))
+        self.assertEqual([r["output"] for r in store.query(prompt_id="zero_shot")], ["a", "c"])
+        self.assertEqual([r["output"] for r in store.query(model="m1")], ["a", "b"])
+        self.assertEqual([r["output"] for r in store.query(since=150.0, until=300.0)], ["b"])
+        self.assertEqual([r["output"] for r in store.query(limit=2)], ["a", "b"])
+        self.assertEqual(store.query(prompt_id="zero_shot", model="m2")[0]["prompt"], "p3")
+
+    def test_sqlite_store_queries(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "results.sqlite")
+            store = SQLiteResultStore(path)
+            self._check_queries(store)
+            store.close()
+            reopened = open_result_store(path)
+            self.assertIsInstance(reopened, SQLiteResultStore)
+            self.assertEqual(len(reopened.query()), 3)
+            reopened.close()
+
+    def test_segment_store_queries(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = JSONLSegmentStore(tmp_dir)
+            self._check_queries(store)
+            store.close()
+
+    def test_segment_store_rotates_and_prunes_by_manifest(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = JSONLSegmentStore(tmp_dir, max_segment_bytes=1)
+            for record in _records():
+                store.add(record)
+            store.close()
+            with open(os.path.join(tmp_dir, "manifest.json"), "r", encoding="utf-8") as handle:
+                segments = json.load(handle)["segments"]
+            self.assertEqual([s["count"] for s in segments], [1, 1])
+            self.assertTrue(segments[0]["name"].endswith(".jsonl.gz"))
+            with gzip.open(os.path.join(tmp_dir, segments[0]["name"]), "rt", encoding="utf-8") as handle:
+                self.assertEqual(json.loads(handle.read())["output"], "a")
+
+            reopened = JSONLSegmentStore(tmp_dir, max_segment_bytes=1)
+            self.assertEqual([r["output"] for r in reopened.query()], ["a", "b", "c"])
+            self.assertEqual(
+                reopened._candidates("few_shot", None, None, None),
+                [os.path.join(tmp_dir, segments[1]["name"]), os.path.join(tmp_dir, "segment-000003.jsonl")],
+            )
+            self.assertEqual([r["output"] for r in reopened.query(until=150.0)], ["a"])
+            reopened.close()
+
+    def test_segment_store_get_reads_only_the_owning_segment(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = JSONLSegmentStore(tmp_dir, max_segment_bytes=1)
+            ids = store.add_many(_records()[:1]) + store.add_many(_records()[1:2])
+            store.close()
+            os.remove(os.path.join(tmp_dir, "segment-000001.jsonl.gz.ids"))
+
+            reopened = JSONLSegmentStore(tmp_dir, max_segment_bytes=1)
+            read: list[str] = []
+            original = reopened._read
+            reopened._read = lambda path: (read.append(os.path.basename(path)), original(path))[1]
+            self.assertEqual(reopened.get(ids[1])["output"], "b")
+            # Building the index reads each segment once, then the lookup reads only the owner.
+            self.assertEqual(read, ["segment-000001.jsonl.gz"] + ["segment-000002.jsonl"] * 2)
+            read.clear()
+            self.assertEqual(reopened.get(ids[0])["output"], "a")
+            self.assertEqual(read, ["segment-000001.jsonl.gz"])
+            new_id = reopened.add(new_record("p", "c"))
+            self.assertEqual(reopened.get(new_id)["output"], "c")
+            self.assertIsNone(reopened.get("missing"))
+            reopened.close()
+
+    def test_segment_store_recovers_from_torn_line(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "segment-000001.jsonl"), "w", encoding="utf-8") as handle:
+                handle.write('{"id": "torn')
+            store = open_result_store(tmp_dir)
+            record_id = store.add(new_record("p", "kept"))
+            self.assertEqual([r["id"] for r in store.query()], [record_id])
+            store.close()
+
+    def test_segment_store_adopts_segments_missing_from_manifest(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = JSONLSegmentStore(tmp_dir, max_segment_bytes=1)
+            for record in _records():
+                store.add(record)
+            store.close()
+            # Simulate a crash after gzipping segment 2 but before its manifest entry was written.
+            manifest_path = os.path.join(tmp_dir, "manifest.json")
+            with open(manifest_path, "r", encoding="utf-8") as handle:
+                manifest = json.load(handle)
+            manifest["segments"].pop()
+            with open(manifest_path, "w", encoding="utf-8") as handle:
+                json.dump(manifest, handle)
+
+            reopened = JSONLSegmentStore(tmp_dir, max_segment_bytes=1)
+            self.assertEqual([r["output"] for r in reopened.query()], ["a", "b", "c"])
+            reopened.add(new_record("p4", "d", clock=lambda: 400.0))
+            reopened.close()
+            again = JSONLSegmentStore(tmp_dir)
+            self.assertEqual([r["output"] for r in again.query()], ["a", "b", "c", "d"])
+            again.close()
+            self.assertEqual(
+                sorted(name for name in os.listdir(tmp_dir) if _SEGMENT_NAME.fullmatch(name)),
+                [f"segment-00000{n}.jsonl.gz" for n in (1, 2, 3)] + ["segment-000004.jsonl"],
+            )
+
+    def test_segment_store_drops_gzip_copy_when_source_survives(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "segment-000001.jsonl")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps(_records()[0]) + "\n")
+            with gzip.open(path + ".gz", "wt", encoding="utf-8") as handle:
+                handle.write("")
+            store = JSONLSegmentStore(tmp_dir)
+            self.assertEqual([r["output"] for r in store.query()], ["a"])
+            self.assertFalse(os.path.exists(path + ".gz"))
+            store.close()
+
+    def test_segment_store_is_single_process(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            store = JSONLSegmentStore(tmp_dir)
+            with self.assertRaises(RuntimeError):
+                JSONLSegmentStore(tmp_dir)
+            store.close()
+            JSONLSegmentStore(tmp_dir).close()
+
+    def test_imports_legacy_output_files(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            legacy = os.path.join(tmp_dir, "output")
+            os.makedirs(legacy)
+            with open(os.path.join(legacy, "output-20240101-000000.txt"), "w", encoding="utf-8") as handle:
+                handle.write("PROMPT\nline one\nline two\n\nOUTPUT\nanswer\n")
+            with open(os.path.join(legacy, "notes.txt"), "w", encoding="utf-8") as handle:
+                handle.write("ignored")
+            store = SQLiteResultStore(os.path.join(tmp_dir, "results.sqlite"))
+            self.assertEqual(import_output_files(legacy, store), 1)
+            [record] = store.query()
+            store.close()
+        self.assertEqual(record["prompt"], "line one\nline two")
+        self.assertEqual(record["output"], "answer")
+        self.assertEqual(record["metadata"], {"source": "output-20240101-000000.txt"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from tempfile import TemporaryDirectory
+from typing import Iterator
+
+from src.reliability import IncrementalJSONValidator, RetryConfig, StreamAbortedError, run_with_retries
+from src.reliability.validate import validate_json
+from src.schemas import ToolAnswer, ToolRoute
+
+
+def _chunked(text: str, size: int = 3) -> list[str]:
+    return [text[idx:idx + size] for idx in range(0, len(text), size)]
+
+
+class TestIncrementalValidation(unittest.TestCase):
+    def test_valid_stream_finishes(self) -> None:
+        validator = IncrementalJSONValidator(ToolAnswer)
+        payload = (
+            '{"answer": "ok \\"quoted\\"", "tool_used": "search",'
+            ' "tool_results": {"results": [{"a": "{"}]}, "citations": []}'
+        )
+        for chunk in _chunked(payload):
+            validator.feed(chunk)
+        self.assertEqual(validator.finish().tool_used, "search")
+
+    def test_aborts_on_unknown_key_before_stream_ends(self) -> None:
+        validator = IncrementalJSONValidator(ToolRoute)
+        with self.assertRaises(StreamAbortedError):
+            for chunk in _chunked('{"tool": "search", "extra": "never finished'):
+                validator.feed(chunk)
+
+    def test_aborts_on_bad_literal_and_prose(self) -> None:
+        with self.assertRaises(StreamAbortedError):
+            IncrementalJSONValidator(ToolRoute).feed('{"tool": "web", ')
+        with self.assertRaises(StreamAbortedError):
+            IncrementalJSONValidator(ToolRoute).feed("Sure! Here is")
+
+    def test_aborts_on_value_without_key(self) -> None:
+        for payload in ('{:1}', '{"tool":"calculator",:1}', '{"tool" "calculator"}', '{"tool":"search"::'):
+            with self.subTest(payload=payload), self.assertRaises(StreamAbortedError):
+                validator = IncrementalJSONValidator(ToolRoute)
+                for chunk in _chunked(payload, 1):
+                    validator.feed(chunk)
+
+    def test_retry_stops_stream_early_and_repairs(self) -> None:
+        consumed: list[str] = []
+
+        def stream(_: dict[str, str]) -> Iterator[str]:
+            for chunk in ["Sure", "! Here", " is the JSON", " {...}"]:
+                consumed.append(chunk)
+                yield chunk
+
+        with TemporaryDirectory() as tmp_dir:
+            result = run_with_retries(
+                invoke=stream,
+                inputs={"input": "Question"},
+                validator=lambda text: validate_json(text, ToolRoute),
+                repair_invoke=lambda _: '{"tool":"none","tool_input":""}',
+                config=RetryConfig(max_retries=1, log_dir=tmp_dir),
+                stream_schema=ToolRoute,
+            )
+        self.assertEqual(result.tool, "none")
+        self.assertEqual(consumed, ["Sure"])
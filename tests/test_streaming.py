@@ -0,0 +1,108 @@
+import asyncio
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from typing import Any
+
+from langchain.lc_prompts import simple_chain, streaming_gemini_llm
+from runner import save_stream, stream_model
+from src.llm import ClientProvider, set_client_provider
+from src.storage import SQLiteResultStore, import_output_files
+
+_CHUNKS = ["Sum", "mary: ", "ok"]
+
+
+class _FakeAsyncModels:
+    async def generate_content_stream(self, **_: Any) -> Any:
+        async def chunks() -> Any:
+            for text in _CHUNKS:
+                yield SimpleNamespace(text=text)
+
+        return chunks()
+
+
+class _FakeModels:
+    def generate_content_stream(self, **_: Any) -> Any:
+        return iter(SimpleNamespace(text=text) for text in _CHUNKS)
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.models = _FakeModels()
+        self.aio = SimpleNamespace(models=_FakeAsyncModels())
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self) -> None:
+        provider = ClientProvider(factory=lambda _: _FakeClient(), api_key="test-key")
+        self.previous = set_client_provider(provider)
+
+    def tearDown(self) -> None:
+        set_client_provider(self.previous)
+
+    def test_simple_chain_streams_chunks(self) -> None:
+        chain = simple_chain("zero_shot", streaming_gemini_llm())
+        self.assertEqual(list(chain.stream({"input": "Question"})), _CHUNKS)
+
+    def test_simple_chain_astreams_chunks(self) -> None:
+        chain = simple_chain("zero_shot", streaming_gemini_llm())
+
+        async def collect() -> list[str]:
+            return [chunk async for chunk in chain.astream({"input": "Question"})]
+
+        self.assertEqual(asyncio.run(collect()), _CHUNKS)
+
+    def test_save_stream_stores_record(self) -> None:
+        seen: list[str] = []
+        with TemporaryDirectory() as tmp_dir:
+            store = SQLiteResultStore(os.path.join(tmp_dir, "results.sqlite"))
+            record_id, text, stats = save_stream(
+                "prompt", stream_model("prompt"), store, on_chunk=seen.append, prompt_id="zero_shot"
+            )
+            self.assertEqual(text, "Summary: ok")
+            self.assertEqual(seen, _CHUNKS)
+            self.assertEqual(stats.chunks, 3)
+            self.assertIsNotNone(stats.first_chunk_seconds)
+            self.assertLessEqual(stats.first_chunk_seconds, stats.total_seconds)
+            record = store.get(record_id)
+            store.close()
+        self.assertEqual(record["prompt"], "prompt")
+        self.assertEqual(record["output"], "Summary: ok")
+        self.assertEqual(record["prompt_id"], "zero_shot")
+        self.assertEqual(record["metadata"]["stream"]["chunks"], 3)
+        self.assertNotIn("incomplete", record["metadata"])
+
+    def test_save_stream_keeps_partial_output(self) -> None:
+        def broken() -> Any:
+            yield "partial"
+            raise ConnectionError("dropped")
+
+        with TemporaryDirectory() as tmp_dir:
+            store = SQLiteResultStore(os.path.join(tmp_dir, "results.sqlite"))
+            with self.assertRaises(ConnectionError):
+                save_stream("prompt", broken(), store)
+            [record] = store.query()
+            store.close()
+        self.assertEqual(record["output"], "partial")
+        self.assertTrue(record["metadata"]["incomplete"])
+
+    def test_save_stream_spools_chunks_until_stored(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            spool_dir = os.path.join(tmp_dir, "partial")
+            store = SQLiteResultStore(os.path.join(tmp_dir, "results.sqlite"))
+
+            def chunks() -> Any:
+                yield "first "
+                self.assertEqual(len(os.listdir(spool_dir)), 1)
+                # Simulate a SIGKILL here: the spool already holds what arrived and imports as a record.
+                recovered = SQLiteResultStore(os.path.join(tmp_dir, "recovered.sqlite"))
+                self.assertEqual(import_output_files(spool_dir, recovered), 1)
+                self.assertEqual(recovered.query()[0]["output"], "first ")
+                recovered.close()
+                yield "second"
+
+            _, text, _ = save_stream("prompt", chunks(), store, spool_dir=spool_dir)
+            store.close()
+            self.assertEqual(text, "first second")
+            self.assertEqual(os.listdir(spool_dir), [])
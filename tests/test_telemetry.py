@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from langchain_core.runnables import RunnableLambda
+
+from langchain.lc_prompts import tool_aware_chain
+from src import telemetry
+from src.llm.client import ClientProvider
+
+
+class _Models:
+    def generate_content(self, **kwargs):
+        usage = SimpleNamespace(prompt_token_count=7, candidates_token_count=3, total_token_count=10)
+        return SimpleNamespace(text="ok", usage_metadata=usage)
+
+
+class TestTelemetry(unittest.TestCase):
+    def tearDown(self) -> None:
+        telemetry.disable_telemetry()
+
+    def test_disabled_span_is_shared_noop(self) -> None:
+        self.assertFalse(telemetry.enabled())
+        self.assertIs(telemetry.span("a"), telemetry.span("b"))
+
+    def test_tool_aware_chain_records_each_stage(self) -> None:
+        exporter = telemetry.InMemoryExporter()
+        telemetry.configure_telemetry(exporter)
+
+        def fake_llm(prompt: object) -> str:
+            if prompt.to_string().startswith("PROMPT TITLE: Tool router"):
+                return '{"tool":"calculator","tool_input":"2+2"}'
+            return '{"answer":"4","tool_used":"calculator","tool_results":{"result":4.0},"citations":[]}'
+
+        tool_aware_chain("router", "tool_answer", RunnableLambda(fake_llm)).invoke({"input": "2+2?"})
+        names = exporter.names()
+        for stage in ("tool_aware.router", "tool_aware.normalize", "tool_aware.tools", "tool_aware.answer"):
+            self.assertIn(stage, names)
+        router = next(record for record in exporter.records if record.name == "tool_aware.router")
+        self.assertEqual(router.parent, "tool_aware_chain")
+
+    def test_generate_records_tokens_for_prometheus_and_jsonl(self) -> None:
+        prometheus = telemetry.PrometheusExporter()
+        with tempfile.TemporaryDirectory() as tmp:
+            jsonl = telemetry.JSONLExporter(tmp)
+            telemetry.configure_telemetry(prometheus, jsonl)
+            provider = ClientProvider(factory=lambda _: SimpleNamespace(models=_Models()), api_key="k")
+            provider.generate("hello", model="m")
+            jsonl.flush()
+            line = Path(jsonl.path).read_text(encoding="utf-8")
+        self.assertIn('"total_tokens":10', line)
+        text = prometheus.render()
+        self.assertIn('prompt_playground_tokens_total{model="m",kind="prompt"} 7', text)
+        self.assertIn('prompt_playground_span_duration_seconds_count{span="llm.generate"} 1', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
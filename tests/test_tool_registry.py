@@ -0,0 +1,97 @@
+import unittest
+from unittest import mock
+
+from pydantic import ValidationError
+
+from src.schemas import ToolRoute
+from src.tools.executor import ToolExecutor
+from src.tools.registry import (
+    RegisteredTool,
+    ToolRegistry,
+    ToolSpec,
+    get_tool,
+    get_tool_registry,
+    register_tool,
+)
+
+
+class TestToolRegistry(unittest.TestCase):
+    def test_builtin_tools_are_cached(self) -> None:
+        tool = get_tool("calculator")
+        self.assertIs(tool, get_tool("calculator"))
+        self.assertEqual(tool.func("2+3"), 5.0)
+        self.assertIsNone(get_tool("missing"))
+
+    def test_register_tool_decorator_dispatches_through_executor(self) -> None:
+        registry = ToolRegistry()
+
+        @register_tool("echo", "Echo the input.", registry=registry)
+        def echo(text: str) -> str:
+            return text.upper()
+
+        executor = ToolExecutor(registry=registry)
+        payload = executor.run([{"tool": "echo", "tool_input": "hi"}])
+        executor.shutdown()
+        self.assertEqual(payload["tool_results"], {"result": "HI"})
+        self.assertEqual(registry.stats()["echo"]["calls"], 1)
+        with self.assertRaises(ValueError):
+            registry.register(ToolSpec("echo", "", {}, {}), echo)
+
+    def test_stats_count_errors_and_latency(self) -> None:
+        def fail(_: str) -> float:
+            raise ValueError("bad")
+
+        registry = ToolRegistry()
+        registry.register(ToolSpec("fail", "", {}, {}), fail)
+        payload = registry.invoke("fail", "x")
+        stats = registry.stats()["fail"]
+        self.assertEqual(payload["tool_results"], {"error": "bad"})
+        self.assertEqual((stats["calls"], stats["errors"]), (1, 1))
+        self.assertEqual(sum(stats["histogram"].values()), 1)
+
+    def test_load_plugins_from_entry_points(self) -> None:
+        plugin = RegisteredTool(
+            spec=ToolSpec("plugin", "Plugin tool.", {}, {}),
+            func=len,
+            runner=lambda text: {"tool_used": "plugin", "tool_results": {"result": len(text)}, "citations": []},
+        )
+        entry_point = mock.Mock()
+        entry_point.name = "plugin"
+        entry_point.load.return_value = plugin
+        registry = ToolRegistry()
+        with mock.patch("importlib.metadata.entry_points", return_value=[entry_point]):
+            self.assertEqual(registry.load_plugins(), ["plugin"])
+        self.assertEqual(registry.invoke("plugin", "abc")["tool_results"], {"result": 3})
+
+    def test_broken_plugin_is_skipped_with_a_warning(self) -> None:
+        broken = mock.Mock()
+        broken.name = "broken"
+        broken.load.side_effect = ImportError("missing dependency")
+        good = mock.Mock()
+        good.name = "good"
+        good.load.return_value = lambda registry: registry.register(
+            ToolSpec("good", "Good tool.", {}, {}), str.upper
+        )
+        registry = ToolRegistry()
+        with mock.patch("importlib.metadata.entry_points", return_value=[broken, good]):
+            with self.assertWarns(RuntimeWarning):
+                self.assertEqual(registry.load_plugins(), ["good"])
+        self.assertIn("good", registry)
+
+    def test_route_schemas_accept_registered_plugin_names(self) -> None:
+        registry = get_tool_registry()
+        registry.register(ToolSpec("weather", "Weather lookup.", {}, {}), str.upper)
+        try:
+            self.assertEqual(ToolRoute(tool="weather", tool_input="Oslo").tool, "weather")
+        finally:
+            registry.unregister("weather")
+        with self.assertRaises(ValidationError):
+            ToolRoute(tool="weather", tool_input="Oslo")
+
+    def test_default_registry_is_singleton(self) -> None:
+        self.assertIs(get_tool_registry(), get_tool_registry())
+        self.assertEqual(get_tool_registry().names()[:2], ["calculator", "search"])
+
+
+if __name__ == "__main__":
+    unittest.main()